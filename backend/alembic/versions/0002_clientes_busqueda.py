@@ -0,0 +1,64 @@
+"""clientes search index"""
+
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        op.execute(
+            """
+            CREATE VIRTUAL TABLE clientes_fts USING fts5(
+                nombre, telefono, email,
+                content='clientes', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+            )
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER clientes_fts_ai AFTER INSERT ON clientes BEGIN
+                INSERT INTO clientes_fts(rowid, nombre, telefono, email)
+                VALUES (new.id, new.nombre, new.telefono, new.email);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER clientes_fts_ad AFTER DELETE ON clientes BEGIN
+                INSERT INTO clientes_fts(clientes_fts, rowid, nombre, telefono, email)
+                VALUES ('delete', old.id, old.nombre, old.telefono, old.email);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER clientes_fts_au AFTER UPDATE OF nombre, telefono, email ON clientes BEGIN
+                INSERT INTO clientes_fts(clientes_fts, rowid, nombre, telefono, email)
+                VALUES ('delete', old.id, old.nombre, old.telefono, old.email);
+                INSERT INTO clientes_fts(rowid, nombre, telefono, email)
+                VALUES (new.id, new.nombre, new.telefono, new.email);
+            END
+            """
+        )
+        op.execute("INSERT INTO clientes_fts(clientes_fts) VALUES ('rebuild')")
+    elif dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(
+            "CREATE INDEX ix_clientes_busqueda_trgm ON clientes USING gin "
+            "((lower(nombre || ' ' || coalesce(telefono, '') || ' ' || coalesce(email, ''))) gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for trigger in ("clientes_fts_ai", "clientes_fts_ad", "clientes_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS clientes_fts")
+    elif dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_clientes_busqueda_trgm")
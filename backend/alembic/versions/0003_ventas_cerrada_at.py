@@ -0,0 +1,19 @@
+"""ventas closing timestamp"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("ventas") as batch:
+        batch.add_column(sa.Column("cerrada_at", sa.DateTime(timezone=True)))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("ventas") as batch:
+        batch.drop_column("cerrada_at")
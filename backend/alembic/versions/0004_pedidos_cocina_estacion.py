@@ -0,0 +1,19 @@
+"""pedidos_cocina station"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("pedidos_cocina") as batch:
+        batch.add_column(sa.Column("estacion", sa.String(length=50)))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("pedidos_cocina") as batch:
+        batch.drop_column("estacion")
@@ -0,0 +1,28 @@
+"""stock snapshots"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "stock_snapshots",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("ingrediente_id", sa.Integer(), sa.ForeignKey("ingredientes.id"), nullable=False),
+        sa.Column("fecha", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("saldo", sa.Float(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.UniqueConstraint("ingrediente_id", "fecha", name="uq_stock_snapshots_ingrediente_fecha"),
+    )
+    op.create_index("ix_stock_movimientos_ingrediente_fecha", "stock_movimientos", ["ingrediente_id", "fecha"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_stock_movimientos_ingrediente_fecha", table_name="stock_movimientos")
+    op.drop_table("stock_snapshots")
@@ -0,0 +1,64 @@
+"""low stock set"""
+
+from alembic import op
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        op.execute(
+            """
+            CREATE TABLE ingredientes_bajo_stock (
+                ingrediente_id INTEGER PRIMARY KEY REFERENCES ingredientes(id)
+            )
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER ingredientes_bajo_stock_ai AFTER INSERT ON ingredientes
+            WHEN new.activo AND new.stock_actual < new.stock_minimo BEGIN
+                INSERT OR IGNORE INTO ingredientes_bajo_stock(ingrediente_id) VALUES (new.id);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER ingredientes_bajo_stock_au AFTER UPDATE OF stock_actual, stock_minimo, activo
+            ON ingredientes BEGIN
+                DELETE FROM ingredientes_bajo_stock
+                WHERE ingrediente_id = old.id AND NOT (new.activo AND new.stock_actual < new.stock_minimo);
+                INSERT OR IGNORE INTO ingredientes_bajo_stock(ingrediente_id)
+                SELECT new.id WHERE new.activo AND new.stock_actual < new.stock_minimo;
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER ingredientes_bajo_stock_ad AFTER DELETE ON ingredientes BEGIN
+                DELETE FROM ingredientes_bajo_stock WHERE ingrediente_id = old.id;
+            END
+            """
+        )
+        op.execute(
+            "INSERT INTO ingredientes_bajo_stock(ingrediente_id) "
+            "SELECT id FROM ingredientes WHERE activo AND stock_actual < stock_minimo"
+        )
+    elif dialect == "postgresql":
+        op.execute(
+            "CREATE INDEX ix_ingredientes_bajo_minimo ON ingredientes (id) WHERE activo AND stock_actual < stock_minimo"
+        )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for trigger in ("ingredientes_bajo_stock_ai", "ingredientes_bajo_stock_au", "ingredientes_bajo_stock_ad"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS ingredientes_bajo_stock")
+    elif dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_ingredientes_bajo_minimo")
@@ -0,0 +1,20 @@
+"""reportes_cache range index"""
+
+from alembic import op
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Las filas previas nunca se leyeron: se descartan para poder crear el índice único.
+    op.execute("DELETE FROM reportes_cache")
+    op.create_index(
+        "ix_reportes_cache_tipo_rango", "reportes_cache", ["tipo", "rango_desde", "rango_hasta"], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_reportes_cache_tipo_rango", table_name="reportes_cache")
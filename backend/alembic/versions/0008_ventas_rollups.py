@@ -0,0 +1,46 @@
+"""hourly sales rollups"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ventas_hora_producto",
+        sa.Column("hora", sa.DateTime(timezone=True), primary_key=True),
+        sa.Column("producto_id", sa.Integer(), sa.ForeignKey("productos.id"), primary_key=True),
+        sa.Column("cantidad", sa.Float(), nullable=False),
+        sa.Column("importe", sa.Numeric(14, 2), nullable=False),
+    )
+    op.create_table(
+        "ventas_hora_medio",
+        sa.Column("hora", sa.DateTime(timezone=True), primary_key=True),
+        sa.Column("medio", sa.String(length=20), primary_key=True),
+        sa.Column("pagos", sa.Integer(), nullable=False),
+        sa.Column("monto", sa.Numeric(14, 2), nullable=False),
+    )
+    op.create_table(
+        "ventas_hora_mozo",
+        sa.Column("hora", sa.DateTime(timezone=True), primary_key=True),
+        sa.Column("mozo_id", sa.Integer(), sa.ForeignKey("usuarios.id"), primary_key=True),
+        sa.Column("ventas", sa.Integer(), nullable=False),
+        sa.Column("total_neto", sa.Numeric(14, 2), nullable=False),
+        sa.Column("propina", sa.Numeric(14, 2), nullable=False),
+    )
+    op.create_table(
+        "ventas_hora_caja",
+        sa.Column("hora", sa.DateTime(timezone=True), primary_key=True),
+        sa.Column("caja_id", sa.Integer(), sa.ForeignKey("cajas.id"), primary_key=True),
+        sa.Column("ventas", sa.Integer(), nullable=False),
+        sa.Column("total_neto", sa.Numeric(14, 2), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    for table in ("ventas_hora_caja", "ventas_hora_mozo", "ventas_hora_medio", "ventas_hora_producto"):
+        op.drop_table(table)
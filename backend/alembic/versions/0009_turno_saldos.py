@@ -0,0 +1,45 @@
+"""running cash balance per shift"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "turno_saldos",
+        sa.Column("turno_id", sa.Integer(), sa.ForeignKey("turnos.id"), primary_key=True),
+        sa.Column("medio", sa.String(length=50), primary_key=True),
+        sa.Column("inicial", sa.Numeric(12, 2), server_default="0", nullable=False),
+        sa.Column("ingresos", sa.Numeric(12, 2), server_default="0", nullable=False),
+        sa.Column("egresos", sa.Numeric(12, 2), server_default="0", nullable=False),
+        sa.Column("declarado", sa.Numeric(12, 2)),
+    )
+    # Turnos abiertos al migrar: se arman sus saldos una única vez desde los movimientos y pagos.
+    op.execute(
+        """
+        INSERT INTO turno_saldos (turno_id, medio, inicial, ingresos, egresos)
+        SELECT turno_id, medio, SUM(inicial), SUM(ingresos), SUM(egresos) FROM (
+            SELECT id AS turno_id, 'efectivo' AS medio, saldo_inicial AS inicial, 0 AS ingresos, 0 AS egresos
+            FROM turnos WHERE cerrado_at IS NULL
+            UNION ALL
+            SELECT m.turno_id, LOWER(m.medio_pago), 0,
+                   CASE WHEN LOWER(CAST(m.tipo AS VARCHAR(20))) = 'ingreso' THEN m.monto ELSE 0 END,
+                   CASE WHEN LOWER(CAST(m.tipo AS VARCHAR(20))) = 'egreso' THEN m.monto ELSE 0 END
+            FROM movimientos_caja m JOIN turnos t ON t.id = m.turno_id WHERE t.cerrado_at IS NULL
+            UNION ALL
+            SELECT v.turno_id, LOWER(CAST(p.medio AS VARCHAR(20))), 0, p.monto, 0
+            FROM pagos p JOIN ventas v ON v.id = p.venta_id JOIN turnos t ON t.id = v.turno_id
+            WHERE t.cerrado_at IS NULL
+        ) AS s
+        GROUP BY turno_id, medio
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("turno_saldos")
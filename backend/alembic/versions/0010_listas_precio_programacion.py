@@ -0,0 +1,27 @@
+"""scheduled price lists"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "listas_precio_programacion",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("lista_id", sa.Integer(), sa.ForeignKey("listas_precio.id"), nullable=False),
+        sa.Column("dias", sa.String(length=7), nullable=False),
+        sa.Column("hora_desde", sa.Time(), nullable=False),
+        sa.Column("hora_hasta", sa.Time(), nullable=False),
+        sa.Column("activo", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("listas_precio_programacion")
@@ -0,0 +1,50 @@
+"""category closure table"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "categorias_productos_arbol",
+        sa.Column(
+            "ancestro_id",
+            sa.Integer(),
+            sa.ForeignKey("categorias_productos.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "descendiente_id",
+            sa.Integer(),
+            sa.ForeignKey("categorias_productos.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("profundidad", sa.Integer(), nullable=False),
+    )
+    op.create_index(
+        "ix_categorias_productos_arbol_descendiente",
+        "categorias_productos_arbol",
+        ["descendiente_id", "profundidad"],
+    )
+    op.execute(
+        """
+        WITH RECURSIVE caminos(ancestro_id, descendiente_id, profundidad) AS (
+            SELECT id, id, 0 FROM categorias_productos
+            UNION ALL
+            SELECT caminos.ancestro_id, hijo.id, caminos.profundidad + 1
+            FROM caminos JOIN categorias_productos hijo ON hijo.parent_id = caminos.descendiente_id
+        )
+        INSERT INTO categorias_productos_arbol (ancestro_id, descendiente_id, profundidad)
+        SELECT ancestro_id, descendiente_id, profundidad FROM caminos
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_categorias_productos_arbol_descendiente", table_name="categorias_productos_arbol")
+    op.drop_table("categorias_productos_arbol")
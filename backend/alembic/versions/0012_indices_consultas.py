@@ -0,0 +1,39 @@
+"""foreign key and filter indexes"""
+
+from alembic import op
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+INDICES = [
+    ("ix_turnos_caja_cerrado", "turnos", ["caja_id", "cerrado_at"]),
+    ("ix_movimientos_caja_turno", "movimientos_caja", ["turno_id"]),
+    ("ix_movimientos_caja_created_at", "movimientos_caja", ["created_at"]),
+    ("ix_productos_categoria", "productos", ["categoria_id"]),
+    ("ix_ingredientes_categoria", "ingredientes", ["categoria_id"]),
+    ("ix_receta_items_receta", "receta_items", ["receta_id"]),
+    ("ix_listas_precio_items_lista_producto", "listas_precio_items", ["lista_id", "producto_id"]),
+    ("ix_ventas_turno", "ventas", ["turno_id"]),
+    ("ix_ventas_mesa_estado", "ventas", ["mesa_id", "estado"]),
+    ("ix_ventas_estado_cerrada", "ventas", ["estado", "cerrada_at"]),
+    ("ix_ventas_items_venta", "ventas_items", ["venta_id"]),
+    ("ix_ventas_items_producto", "ventas_items", ["producto_id"]),
+    ("ix_pagos_venta", "pagos", ["venta_id"]),
+    ("ix_descuentos_venta", "descuentos", ["venta_id"]),
+    ("ix_gastos_fecha", "gastos", ["fecha"]),
+    ("ix_stock_movimientos_fecha", "stock_movimientos", ["fecha"]),
+    ("ix_pedidos_cocina_venta", "pedidos_cocina", ["venta_id"]),
+    ("ix_pedidos_cocina_estado_created", "pedidos_cocina", ["estado", "created_at"]),
+]
+
+
+def upgrade() -> None:
+    for nombre, tabla, columnas in INDICES:
+        op.create_index(nombre, tabla, columnas)
+
+
+def downgrade() -> None:
+    for nombre, tabla, _ in reversed(INDICES):
+        op.drop_index(nombre, table_name=tabla)
@@ -0,0 +1,32 @@
+"""catalog revision counter and change log"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0013"
+down_revision = "0012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    revisiones = op.create_table(
+        "catalogo_revision",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("revision", sa.Integer(), nullable=False),
+    )
+    op.bulk_insert(revisiones, [{"id": 1, "revision": 0}])
+    op.create_table(
+        "catalogo_cambios",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("revision", sa.Integer(), nullable=False),
+        sa.Column("producto_id", sa.Integer()),
+        sa.Column("categoria_id", sa.Integer()),
+    )
+    op.create_index("ix_catalogo_cambios_revision", "catalogo_cambios", ["revision"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_catalogo_cambios_revision", table_name="catalogo_cambios")
+    op.drop_table("catalogo_cambios")
+    op.drop_table("catalogo_revision")
@@ -1,11 +1,14 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
-from fastapi import Depends, HTTPException, Security, status
+from fastapi import Depends, HTTPException, Query, Security, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import decode_token
-from app.db.session import SessionLocal
-from app.models.models import RoleEnum, Usuario
+from app.db.session import AsyncSessionLocal, SessionLocal
+from app.models.models import RoleEnum
+from app.services.configuracion import ConfigStore, config_store
+from app.services.principal import Principal, load_principal, principal_cache
 
 security_scheme = HTTPBearer(auto_error=False)
 
@@ -18,26 +21,61 @@ def get_db() -> Generator:
         db.close()
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials | None = Security(security_scheme),
-    db=Depends(get_db),
-) -> Usuario:
-    if credentials is None:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="No autenticado")
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
 
-    payload = decode_token(credentials.credentials)
+async def get_config(db: AsyncSession = Depends(get_async_db)) -> ConfigStore:
+    """Configuración combinada; sólo consulta `config` si se invalidó o venció el intervalo de recarga."""
+    await config_store.refrescar(db)
+    return config_store
+
+
+async def principal_from_token(token: str) -> Principal:
+    try:
+        payload = decode_token(token)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido") from exc
     username_lower = payload.get("sub")
     if not username_lower:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido")
 
-    user: Usuario | None = db.query(Usuario).filter(Usuario.username_lower == username_lower).first()
-    if user is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuario no encontrado")
-    return user
+    principal = principal_cache.get(username_lower)
+    if principal is None:
+        # Sólo se abre sesión ante un fallo de caché; el resto de las verificaciones de rol no toca la base.
+        async with AsyncSessionLocal() as db:
+            principal = await load_principal(db, username_lower)
+        if principal is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuario no encontrado")
+        principal_cache.set(username_lower, principal)
+
+    if not principal.activo:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Usuario inactivo")
+    return principal
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials | None = Security(security_scheme),
+) -> Principal:
+    if credentials is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="No autenticado")
+    return await principal_from_token(credentials.credentials)
+
+
+async def get_stream_user(
+    credentials: HTTPAuthorizationCredentials | None = Security(security_scheme),
+    token: str | None = Query(None, description="Alternativa al header para EventSource"),
+) -> Principal:
+    if credentials is not None:
+        return await principal_from_token(credentials.credentials)
+    if token:
+        return await principal_from_token(token)
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="No autenticado")
 
 
 def require_roles(*roles: RoleEnum):
-    def checker(user: Usuario = Depends(get_current_user)) -> Usuario:
+    def checker(user: Principal = Depends(get_current_user)) -> Principal:
         if roles and user.rol not in roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,125 @@
+"""Paginación por offset (compatible) y por cursor (keyset) para los listados de la API."""
+import base64
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Generic, List, Optional, Sequence, TypeVar
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.services.configuracion import config_store
+
+T = TypeVar("T")
+
+# Totales aproximados por listado: evitan un COUNT(*) completo en cada página.
+count_cache: TTLCache[str, int] = TTLCache(ttl_seconds=settings.count_cache_ttl_seconds, max_size=256)
+
+
+@dataclass
+class PageParams:
+    page: int = Query(1, ge=1)
+    size: int = Query(50, ge=1, le=500)
+    cursor: Optional[str] = Query(None, description="Cursor opaco devuelto como `next_cursor`")
+    include_total: bool = Query(False, description="Calcular el total también en modo cursor")
+
+
+@dataclass
+class Page(Generic[T]):
+    rows: List[T]
+    total: Optional[int]
+    page: Optional[int]
+    next_cursor: Optional[str]
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _decode_value(column: InstrumentedAttribute, raw: Any) -> Any:
+    python_type = column.type.python_type
+    if raw is None or isinstance(raw, python_type):
+        return raw
+    if python_type is datetime:
+        return datetime.fromisoformat(raw)
+    if python_type is date:
+        return date.fromisoformat(raw)
+    return python_type(raw)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key_columns: Sequence[InstrumentedAttribute]) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(key_columns):
+            raise ValueError("cursor con claves inesperadas")
+        return [_decode_value(col, raw) for col, raw in zip(key_columns, values)]
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido") from exc
+
+
+async def cached_count(db: AsyncSession, stmt: Select, cache_key: str) -> int:
+    total = count_cache.get(cache_key)
+    if total is None:
+        total = await db.scalar(select(func.count()).select_from(stmt.order_by(None).subquery())) or 0
+        # La vigencia se puede ajustar en caliente desde `config`.
+        await config_store.refrescar(db)
+        count_cache.set(cache_key, total, ttl_seconds=config_store.get("count_cache_ttl_seconds"))
+    return total
+
+
+async def paginate(
+    db: AsyncSession,
+    stmt: Select,
+    params: PageParams,
+    *,
+    key_columns: Sequence[InstrumentedAttribute],
+    count_key: str,
+    descending: bool = False,
+) -> Page:
+    """Ejecuta `stmt` paginado.
+
+    Sin `cursor` se comporta como antes (offset + total). Con `cursor` filtra por la
+    tupla `key_columns` del último registro visto, que debe ser única y estar indexada,
+    de modo que cada página cuesta lo mismo sin importar su profundidad.
+    """
+    keys = tuple_(*key_columns) if len(key_columns) > 1 else key_columns[0]
+    ordered = stmt.order_by(*(col.desc() if descending else col.asc() for col in key_columns))
+
+    if params.cursor:
+        after = decode_cursor(params.cursor, key_columns)
+        bound = tuple_(*after) if len(after) > 1 else after[0]
+        ordered = ordered.where(keys < bound if descending else keys > bound)
+        page_number = None
+    else:
+        ordered = ordered.offset((params.page - 1) * params.size)
+        page_number = params.page
+
+    result = await db.execute(ordered.limit(params.size + 1))
+    rows = list(result.scalars().all())
+
+    next_cursor = None
+    if len(rows) > params.size:
+        rows = rows[: params.size]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, col.key) for col in key_columns])
+
+    total = None
+    if params.cursor is None or params.include_total:
+        total = await cached_count(db, stmt, count_key)
+
+    return Page(rows=rows, total=total, page=page_number, next_cursor=next_cursor)
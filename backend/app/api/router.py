@@ -1,9 +1,32 @@
 from fastapi import APIRouter
 
-from app.api.routes import auth, clientes, health, usuarios
+from app.api.routes import (
+    auth,
+    caja,
+    catalogo,
+    categorias,
+    clientes,
+    cocina,
+    configuracion,
+    health,
+    precios,
+    reportes,
+    stock,
+    usuarios,
+    ventas,
+)
 
 api_router = APIRouter()
 api_router.include_router(health.router, tags=["health"])
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(usuarios.router, prefix="/usuarios", tags=["usuarios"])
 api_router.include_router(clientes.router, prefix="/clientes", tags=["clientes"])
+api_router.include_router(ventas.router, prefix="/ventas", tags=["ventas"])
+api_router.include_router(cocina.router, prefix="/cocina", tags=["cocina"])
+api_router.include_router(stock.router, prefix="/stock", tags=["stock"])
+api_router.include_router(reportes.router, prefix="/reportes", tags=["reportes"])
+api_router.include_router(caja.router, prefix="/caja", tags=["caja"])
+api_router.include_router(precios.router, prefix="/precios", tags=["precios"])
+api_router.include_router(catalogo.router, prefix="/catalogo", tags=["catalogo"])
+api_router.include_router(configuracion.router, prefix="/configuracion", tags=["configuracion"])
+api_router.include_router(categorias.router, prefix="/categorias", tags=["categorias"])
@@ -1,36 +1,82 @@
 from datetime import timedelta
+from math import ceil
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user, get_db
+from app.api.deps import get_async_db, get_current_user
 from app.core.config import settings
-from app.core.security import create_token, decode_token, verify_password
+from app.core.security import (
+    create_token,
+    decode_token,
+    hash_ficticio,
+    intentos_ip,
+    intentos_usuario,
+    verify_password_async,
+)
 from app.models.models import Usuario
-from app.schemas.auth import CurrentUser, LoginRequest, RefreshRequest, Token
+from app.schemas.auth import CurrentUser, LoginRequest, PinLoginRequest, RefreshRequest, Token
+from app.services.principal import Principal
 
 router = APIRouter()
 
 
-@router.post("/login", response_model=Token)
-def login(data: LoginRequest, db=Depends(get_db)) -> Token:
-    username = data.username.lower()
-    user: Usuario | None = db.query(Usuario).filter(Usuario.username_lower == username).first()
-    if user is None or not verify_password(data.password, user.password_hash):
+async def _get_usuario(db: AsyncSession, username: str) -> Usuario | None:
+    return await db.scalar(select(Usuario).where(Usuario.username_lower == username.lower()))
+
+
+async def _autenticar(request: Request, db: AsyncSession, username: str, secreto: str, pin: bool) -> Usuario:
+    """Verifica la clave o el PIN contando los fallos por usuario y por IP."""
+    usuario_clave = username.lower()
+    ip = request.client.host if request.client else "desconocida"
+    espera = max(intentos_usuario.espera(usuario_clave), intentos_ip.espera(ip))
+    if espera:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Demasiados intentos fallidos; reintente más tarde",
+            headers={"Retry-After": str(ceil(espera))},
+        )
+
+    user = await _get_usuario(db, username)
+    hash_ = hash_ficticio() if user is None else user.pin_hash if pin else user.password_hash
+    # Sin usuario también se verifica, así el tiempo de respuesta no revela qué usuarios existen.
+    if not await verify_password_async(secreto, hash_) or user is None:
+        intentos_usuario.fallo(usuario_clave)
+        intentos_ip.fallo(ip)
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciales inválidas")
-    if not user.activo:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Usuario inactivo")
+    intentos_usuario.exito(usuario_clave)
+    return user
+
 
-    access_token = create_token(user.username_lower)
+def _issue_tokens(subject: str) -> Token:
+    access_token = create_token(subject)
     refresh_token = create_token(
-        user.username_lower,
+        subject,
         expires_delta=timedelta(minutes=settings.refresh_token_expire_minutes),
         token_type="refresh",
     )
     return Token(access_token=access_token, refresh_token=refresh_token)
 
 
+@router.post("/login", response_model=Token)
+async def login(request: Request, data: LoginRequest, db: AsyncSession = Depends(get_async_db)) -> Token:
+    user = await _autenticar(request, db, data.username, data.password, pin=False)
+    if not user.activo:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Usuario inactivo")
+    return _issue_tokens(user.username_lower)
+
+
+@router.post("/pin-login", response_model=Token, summary="Ingreso rápido con PIN en terminales compartidas")
+async def pin_login(request: Request, data: PinLoginRequest, db: AsyncSession = Depends(get_async_db)) -> Token:
+    user = await _autenticar(request, db, data.username, data.pin, pin=True)
+    if not user.activo:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Usuario inactivo")
+    return _issue_tokens(user.username_lower)
+
+
 @router.post("/refresh", response_model=Token)
-def refresh(data: RefreshRequest) -> Token:
+async def refresh(data: RefreshRequest) -> Token:
     try:
         payload = decode_token(data.refresh_token)
     except ValueError as exc:  # pragma: no cover - FastAPI maneja el error
@@ -43,17 +89,11 @@ def refresh(data: RefreshRequest) -> Token:
     if not username:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido")
 
-    access_token = create_token(username)
-    new_refresh = create_token(
-        username,
-        expires_delta=timedelta(minutes=settings.refresh_token_expire_minutes),
-        token_type="refresh",
-    )
-    return Token(access_token=access_token, refresh_token=new_refresh)
+    return _issue_tokens(username)
 
 
 @router.get("/me", response_model=CurrentUser)
-def read_me(current_user: Usuario = Depends(get_current_user)) -> CurrentUser:
+async def read_me(current_user: Principal = Depends(get_current_user)) -> CurrentUser:
     return CurrentUser(
         id=current_user.id,
         username=current_user.username_lower,
@@ -0,0 +1,78 @@
+from decimal import Decimal
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_async_db, require_roles
+from app.models.models import RoleEnum
+from app.schemas.caja import (
+    ArqueoResultado,
+    MovimientoCajaIn,
+    MovimientoCajaPublic,
+    SaldoMedio,
+    TurnoCierre,
+    TurnoCreate,
+    TurnoPublic,
+    TurnoSaldoPublic,
+)
+from app.services import caja as caja_service
+from app.services.principal import Principal
+
+cajero = require_roles(RoleEnum.ADMIN, RoleEnum.CAJA)
+
+router = APIRouter(dependencies=[Depends(cajero)])
+
+
+def _medios(saldos: List[caja_service.Saldo]) -> List[SaldoMedio]:
+    return [SaldoMedio.model_validate(s) for s in saldos]
+
+
+@router.post("/turnos", response_model=TurnoPublic, status_code=status.HTTP_201_CREATED)
+async def abrir_turno(
+    data: TurnoCreate, db: AsyncSession = Depends(get_async_db), user: Principal = Depends(cajero)
+) -> TurnoPublic:
+    turno = await caja_service.abrir_turno(db, data, usuario_id=user.id)
+    await db.commit()
+    return TurnoPublic.model_validate(turno)
+
+
+@router.post(
+    "/turnos/{turno_id}/movimientos", response_model=MovimientoCajaPublic, status_code=status.HTTP_201_CREATED
+)
+async def registrar_movimiento(
+    turno_id: int, data: MovimientoCajaIn, db: AsyncSession = Depends(get_async_db)
+) -> MovimientoCajaPublic:
+    turno = await caja_service.obtener_turno(db, turno_id, bloquear=True)
+    movimiento = await caja_service.registrar_movimiento(db, turno, data)
+    await db.commit()
+    return MovimientoCajaPublic.model_validate(movimiento)
+
+
+@router.get("/turnos/{turno_id}/saldo", response_model=TurnoSaldoPublic)
+async def saldo_turno(
+    turno_id: int, db: AsyncSession = Depends(get_async_db), user: Principal = Depends(cajero)
+) -> TurnoSaldoPublic:
+    turno = await caja_service.obtener_turno(db, turno_id)
+    abierto = turno.cerrado_at is None
+    if abierto and turno.arqueo_ciego and user.rol != RoleEnum.ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Turno con arqueo ciego")
+    saldos = await caja_service.saldos(db, turno_id)
+    return TurnoSaldoPublic(
+        turno_id=turno_id,
+        abierto=abierto,
+        medios=_medios(saldos),
+        esperado_total=sum((s.esperado for s in saldos), Decimal("0")),
+    )
+
+
+@router.post("/turnos/{turno_id}/cerrar", response_model=ArqueoResultado)
+async def cerrar_turno(turno_id: int, data: TurnoCierre, db: AsyncSession = Depends(get_async_db)) -> ArqueoResultado:
+    turno = await caja_service.obtener_turno(db, turno_id, bloquear=True)
+    saldos = await caja_service.cerrar_turno(db, turno, data)
+    await db.commit()
+    return ArqueoResultado(
+        turno=TurnoPublic.model_validate(turno),
+        medios=_medios(saldos),
+        diferencia_total=sum((s.diferencia or Decimal("0") for s in saldos), Decimal("0")),
+    )
@@ -0,0 +1,40 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_async_db, require_roles
+from app.services.catalogo import catalogo_cache
+
+router = APIRouter()
+
+
+def _coincide(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    etiquetas = {e.strip().removeprefix("W/") for e in if_none_match.split(",")}
+    return "*" in etiquetas or etag in etiquetas
+
+
+@router.get("/", dependencies=[Depends(require_roles())])
+async def catalogo(
+    since: Optional[str] = Query(default=None, description="Versión que ya tiene la tablet: devuelve sólo cambios"),
+    if_none_match: Optional[str] = Header(default=None),
+    accept_encoding: str = Header(default=""),
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    """Catálogo completo (comprimido y con ETag) o, con `since`, las filas cambiadas desde esa versión."""
+    if since is not None:
+        snapshot, delta = await catalogo_cache.delta(db, since)
+        if delta is not None:
+            return Response(content=delta, media_type="application/json", headers={"Cache-Control": "no-cache"})
+    else:
+        snapshot = await catalogo_cache.snapshot(db)
+
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if _coincide(if_none_match, snapshot.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if "gzip" in accept_encoding.lower():
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=snapshot.comprimido, media_type="application/json", headers=headers)
+    return Response(content=snapshot.cuerpo, media_type="application/json", headers=headers)
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_async_db, require_roles
+from app.models.models import RoleEnum
+from app.schemas.categorias import CategoriaCreate, CategoriaMover, CategoriaPublic, CategoriaSubarbol
+from app.services import categorias as categorias_service
+
+router = APIRouter()
+
+admin = require_roles(RoleEnum.ADMIN)
+
+
+@router.post(
+    "/", response_model=CategoriaPublic, status_code=status.HTTP_201_CREATED, dependencies=[Depends(admin)]
+)
+async def crear(data: CategoriaCreate, db: AsyncSession = Depends(get_async_db)) -> CategoriaPublic:
+    categoria = await categorias_service.crear_categoria(db, data.nombre, data.parent_id)
+    await db.commit()
+    return CategoriaPublic.model_validate(categoria)
+
+
+@router.get("/{categoria_id}/arbol", response_model=CategoriaSubarbol, dependencies=[Depends(require_roles())])
+async def arbol(categoria_id: int, db: AsyncSession = Depends(get_async_db)) -> CategoriaSubarbol:
+    return CategoriaSubarbol.model_validate(await categorias_service.subarbol(db, categoria_id))
+
+
+@router.put("/{categoria_id}/padre", response_model=CategoriaPublic, dependencies=[Depends(admin)])
+async def mover(categoria_id: int, data: CategoriaMover, db: AsyncSession = Depends(get_async_db)) -> CategoriaPublic:
+    categoria = await categorias_service.mover_categoria(db, categoria_id, data.parent_id)
+    await db.commit()
+    return CategoriaPublic.model_validate(categoria)
@@ -1,45 +1,73 @@
+import shutil
+import tempfile
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db, require_roles
+from app.api.deps import get_async_db, get_config, require_roles
+from app.api.pagination import PageParams, count_cache, paginate
 from app.models.models import Cliente, RoleEnum
-from app.schemas.clientes import ClienteCreate, ClientePublic, ClienteUpdate
+from app.schemas.clientes import ClienteCreate, ClientePublic, ClienteUpdate, ImportJobPublic
 from app.schemas.common import Paginated
+from app.services.busqueda import buscar_clientes
+from app.services.configuracion import ConfigStore
+from app.services.importacion import ImportFormato, crear_job, detectar_formato, importar_clientes, obtener_job
 
 router = APIRouter(dependencies=[Depends(require_roles(RoleEnum.ADMIN, RoleEnum.CAJA, RoleEnum.MOZO))])
 
 
+def _importar_e_invalidar(job_id: str, path: str, formato: ImportFormato, tamano_lote: int) -> None:
+    try:
+        importar_clientes(job_id, path, formato, tamano_lote)
+    finally:
+        # Aun si falló, los lotes anteriores ya quedaron confirmados.
+        count_cache.invalidate("clientes")
+
+
 @router.get("/", response_model=Paginated[ClientePublic])
-def list_clientes(db: Session = Depends(get_db), page: int = 1, size: int = 50):
-    query = db.query(Cliente)
-    total = query.count()
-    clientes = query.offset((page - 1) * size).limit(size).all()
-    items: List[ClientePublic] = [ClientePublic.model_validate(cliente) for cliente in clientes]
-    return Paginated[ClientePublic](items=items, total=total, page=page, size=size)
+async def list_clientes(db: AsyncSession = Depends(get_async_db), params: PageParams = Depends()):
+    result = await paginate(db, select(Cliente), params, key_columns=[Cliente.id], count_key="clientes")
+    items: List[ClientePublic] = [ClientePublic.model_validate(cliente) for cliente in result.rows]
+    return Paginated[ClientePublic](
+        items=items, total=result.total, page=result.page, size=params.size, next_cursor=result.next_cursor
+    )
 
 
 @router.post("/", response_model=ClientePublic, status_code=status.HTTP_201_CREATED)
-def create_cliente(data: ClienteCreate, db: Session = Depends(get_db)) -> ClientePublic:
+async def create_cliente(data: ClienteCreate, db: AsyncSession = Depends(get_async_db)) -> ClientePublic:
     cliente = Cliente(**data.model_dump())
     db.add(cliente)
-    db.commit()
-    db.refresh(cliente)
+    await db.commit()
+    count_cache.invalidate("clientes")
+    await db.refresh(cliente)
     return ClientePublic.model_validate(cliente)
 
 
+@router.get("/search", response_model=List[ClientePublic])
+async def search_clientes(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+) -> List[ClientePublic]:
+    return [ClientePublic.model_validate(cliente) for cliente in await buscar_clientes(db, q, limit)]
+
+
 @router.get("/{cliente_id}", response_model=ClientePublic)
-def get_cliente(cliente_id: int, db: Session = Depends(get_db)) -> ClientePublic:
-    cliente = db.get(Cliente, cliente_id)
+async def get_cliente(cliente_id: int, db: AsyncSession = Depends(get_async_db)) -> ClientePublic:
+    cliente = await db.get(Cliente, cliente_id)
     if cliente is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cliente no encontrado")
     return ClientePublic.model_validate(cliente)
 
 
 @router.put("/{cliente_id}", response_model=ClientePublic)
-def update_cliente(cliente_id: int, data: ClienteUpdate, db: Session = Depends(get_db)) -> ClientePublic:
-    cliente = db.get(Cliente, cliente_id)
+async def update_cliente(
+    cliente_id: int, data: ClienteUpdate, db: AsyncSession = Depends(get_async_db)
+) -> ClientePublic:
+    cliente = await db.get(Cliente, cliente_id)
     if cliente is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cliente no encontrado")
 
@@ -47,20 +75,46 @@ def update_cliente(cliente_id: int, data: ClienteUpdate, db: Session = Depends(g
         setattr(cliente, field, value)
 
     db.add(cliente)
-    db.commit()
-    db.refresh(cliente)
+    await db.commit()
+    await db.refresh(cliente)
     return ClientePublic.model_validate(cliente)
 
 
 @router.delete("/{cliente_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_cliente(cliente_id: int, db: Session = Depends(get_db)) -> None:
-    cliente = db.get(Cliente, cliente_id)
+async def delete_cliente(cliente_id: int, db: AsyncSession = Depends(get_async_db)) -> None:
+    cliente = await db.get(Cliente, cliente_id)
     if cliente is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cliente no encontrado")
-    db.delete(cliente)
-    db.commit()
-
-
-@router.post("/import", status_code=status.HTTP_202_ACCEPTED)
-def import_clientes() -> dict[str, str]:
-    return {"detail": "Importación asíncrona pendiente de implementación"}
+    await db.delete(cliente)
+    await db.commit()
+    count_cache.invalidate("clientes")
+
+
+@router.post(
+    "/import",
+    response_model=ImportJobPublic,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(require_roles(RoleEnum.ADMIN))],
+)
+async def import_clientes(
+    background_tasks: BackgroundTasks, archivo: UploadFile = File(...), config: ConfigStore = Depends(get_config)
+) -> ImportJobPublic:
+    formato = detectar_formato(archivo.filename or "")
+    if formato is None:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail="Formato no soportado (csv/xlsx)")
+
+    # Se copia a disco por bloques: ni la subida ni el procesamiento posterior cargan el archivo entero.
+    with tempfile.NamedTemporaryFile(suffix=f".{formato.value}", delete=False) as destino:
+        await run_in_threadpool(shutil.copyfileobj, archivo.file, destino, 1024 * 1024)
+
+    job = crear_job(archivo.filename or destino.name)
+    background_tasks.add_task(_importar_e_invalidar, job.id, destino.name, formato, config.get("import_batch_size"))
+    return ImportJobPublic.model_validate(job)
+
+
+@router.get("/import/{job_id}", response_model=ImportJobPublic, dependencies=[Depends(require_roles(RoleEnum.ADMIN))])
+async def import_status(job_id: str) -> ImportJobPublic:
+    job = obtener_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Importación no encontrada")
+    return ImportJobPublic.model_validate(job)
@@ -0,0 +1,98 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Query, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.exceptions import HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_async_db, get_stream_user, principal_from_token, require_roles
+from app.api.sse import sse_response
+from app.core.config import settings
+from app.models.models import RoleEnum
+from app.schemas.cocina import PedidoCocinaCreate, PedidoCocinaPublic, PedidoEstadoUpdate, TableroCocina
+from app.services import cocina as cocina_service
+from app.services.realtime import cocina_hub
+
+router = APIRouter()
+
+
+@router.get(
+    "/pedidos",
+    response_model=TableroCocina,
+    dependencies=[Depends(require_roles(RoleEnum.ADMIN, RoleEnum.COCINA, RoleEnum.MOZO, RoleEnum.CAJA))],
+)
+async def tablero(estacion: Optional[str] = None, db: AsyncSession = Depends(get_async_db)) -> TableroCocina:
+    # El id se toma antes de leer: los eventos posteriores llegan por el stream, aunque alguno se repita.
+    ultimo_evento_id = cocina_hub.ultimo_id
+    pedidos = await cocina_service.pedidos_activos(db, estacion)
+    return TableroCocina(
+        ultimo_evento_id=ultimo_evento_id,
+        pedidos=[PedidoCocinaPublic.model_validate(p) for p in pedidos],
+    )
+
+
+@router.post(
+    "/pedidos",
+    response_model=PedidoCocinaPublic,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_roles(RoleEnum.ADMIN, RoleEnum.MOZO, RoleEnum.CAJA))],
+)
+async def crear_pedido(data: PedidoCocinaCreate, db: AsyncSession = Depends(get_async_db)) -> PedidoCocinaPublic:
+    pedido = await cocina_service.crear_pedido(db, data)
+    await db.commit()
+    cocina_service.publicar("pedido_creado", pedido)
+    return PedidoCocinaPublic.model_validate(pedido)
+
+
+@router.patch(
+    "/pedidos/{pedido_id}/estado",
+    response_model=PedidoCocinaPublic,
+    dependencies=[Depends(require_roles(RoleEnum.ADMIN, RoleEnum.COCINA))],
+)
+async def cambiar_estado(
+    pedido_id: int, data: PedidoEstadoUpdate, db: AsyncSession = Depends(get_async_db)
+) -> PedidoCocinaPublic:
+    pedido = await cocina_service.cambiar_estado(db, pedido_id, data.estado)
+    await db.commit()
+    cocina_service.publicar("pedido_actualizado", pedido)
+    return PedidoCocinaPublic.model_validate(pedido)
+
+
+@router.get("/stream", dependencies=[Depends(get_stream_user)], summary="Eventos de cocina vía SSE")
+async def stream(
+    request: Request,
+    estacion: Optional[str] = None,
+    last_event_id: Optional[int] = Header(None, alias="Last-Event-ID"),
+    desde: Optional[int] = Query(None, description="Último id recibido, si no se envía Last-Event-ID"),
+) -> StreamingResponse:
+    sub = cocina_hub.subscribe(estacion, last_event_id if last_event_id is not None else desde)
+    return sse_response(request, cocina_hub, sub)
+
+
+@router.websocket("/ws")
+async def websocket_feed(
+    websocket: WebSocket,
+    token: str = Query(...),
+    estacion: Optional[str] = None,
+    desde: Optional[int] = None,
+) -> None:
+    try:
+        await principal_from_token(token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    sub = cocina_hub.subscribe(estacion, desde)
+    try:
+        async for evento in cocina_hub.eventos(sub, heartbeat=settings.realtime_heartbeat_seconds):
+            if evento is None:
+                await websocket.send_json({"tipo": "ping"})
+                continue
+            await websocket.send_json({"id": evento.id, "tipo": evento.tipo, "data": evento.data})
+        # Cola desbordada: se cierra para que el cliente reconecte con `desde`.
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        cocina_hub.unsubscribe(sub)
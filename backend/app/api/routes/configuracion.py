@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_async_db, get_config, require_roles
+from app.models.models import RoleEnum
+from app.schemas.common import StatusMessage
+from app.schemas.configuracion import ConfigPublic, ConfigUpdate, ConfigValores
+from app.services import configuracion as configuracion_service
+from app.services.configuracion import ConfigStore
+
+router = APIRouter(dependencies=[Depends(require_roles(RoleEnum.ADMIN))])
+
+
+@router.get("/", response_model=ConfigValores)
+async def listar(config: ConfigStore = Depends(get_config)) -> ConfigValores:
+    return ConfigValores(valores=config.valores())
+
+
+@router.put("/{clave}", response_model=ConfigPublic)
+async def guardar(clave: str, data: ConfigUpdate, db: AsyncSession = Depends(get_async_db)) -> ConfigPublic:
+    valor = await configuracion_service.guardar(db, clave, data.valor)
+    await db.commit()
+    return ConfigPublic(clave=clave, valor=valor)
+
+
+@router.delete("/{clave}", response_model=StatusMessage)
+async def borrar(clave: str, db: AsyncSession = Depends(get_async_db)) -> StatusMessage:
+    await configuracion_service.borrar(db, clave)
+    await db.commit()
+    return StatusMessage(detail="Clave eliminada")
@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_async_db, require_roles
+from app.models.models import ListaPrecio, ListaPrecioProgramacion, RoleEnum
+from app.schemas.common import StatusMessage
+from app.schemas.precios import PrecioResuelto, PreciosVigentes, ProgramacionCreate, ProgramacionPublic
+from app.services.errors import NotFoundError
+from app.services.precios import activar_lista, price_resolver
+
+router = APIRouter()
+
+admin = require_roles(RoleEnum.ADMIN)
+
+
+@router.get("/", response_model=PreciosVigentes, dependencies=[Depends(require_roles())])
+async def precios_vigentes(
+    producto_id: List[int] = Query(...),
+    momento: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> PreciosVigentes:
+    momento = momento or datetime.now(timezone.utc)
+    tabla = await price_resolver.tabla(db)
+    precios = tabla.resolver(producto_id, momento)
+    return PreciosVigentes(
+        momento=momento,
+        lista_id=tabla.lista_vigente(momento),
+        precios=[PrecioResuelto(producto_id=pid, precio=precio) for pid, precio in precios.items()],
+    )
+
+
+@router.post("/listas/{lista_id}/activar", response_model=StatusMessage, dependencies=[Depends(admin)])
+async def activar(lista_id: int, db: AsyncSession = Depends(get_async_db)) -> StatusMessage:
+    await activar_lista(db, lista_id)
+    await db.commit()
+    return StatusMessage(detail="Lista activada")
+
+
+@router.get("/programaciones", response_model=List[ProgramacionPublic], dependencies=[Depends(admin)])
+async def list_programaciones(db: AsyncSession = Depends(get_async_db)) -> List[ProgramacionPublic]:
+    rows = await db.scalars(select(ListaPrecioProgramacion).order_by(ListaPrecioProgramacion.id))
+    return [ProgramacionPublic.model_validate(p) for p in rows]
+
+
+@router.post(
+    "/programaciones",
+    response_model=ProgramacionPublic,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(admin)],
+)
+async def crear_programacion(data: ProgramacionCreate, db: AsyncSession = Depends(get_async_db)) -> ProgramacionPublic:
+    if await db.get(ListaPrecio, data.lista_id) is None:
+        raise NotFoundError("Lista de precios no encontrada")
+    programacion = ListaPrecioProgramacion(
+        lista_id=data.lista_id,
+        dias="".join(str(d) for d in data.dias),
+        hora_desde=data.hora_desde,
+        hora_hasta=data.hora_hasta,
+        activo=True,
+    )
+    db.add(programacion)
+    await db.commit()
+    return ProgramacionPublic.model_validate(programacion)
+
+
+@router.delete(
+    "/programaciones/{programacion_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(admin)]
+)
+async def borrar_programacion(programacion_id: int, db: AsyncSession = Depends(get_async_db)) -> None:
+    programacion = await db.get(ListaPrecioProgramacion, programacion_id)
+    if programacion is None:
+        raise NotFoundError("Programación no encontrada")
+    await db.delete(programacion)
+    await db.commit()
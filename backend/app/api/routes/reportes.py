@@ -0,0 +1,55 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_async_db, require_roles
+from app.models.models import RoleEnum
+from app.schemas.reportes import ReportePublic, RollupSerie
+from app.services.exportacion import MEDIA_TYPES, ExportFormato, exportar
+from app.services.reportes import ReporteTipo, obtener_reporte
+from app.services.rollups import Granularidad, serie
+
+router = APIRouter(dependencies=[Depends(require_roles(RoleEnum.ADMIN))])
+
+
+@router.get("/rollups/{dimension}", response_model=RollupSerie)
+async def rollup(
+    dimension: str,
+    desde: datetime,
+    hasta: datetime,
+    granularidad: Granularidad = Granularidad.DIA,
+    db: AsyncSession = Depends(get_async_db),
+) -> RollupSerie:
+    filas = await serie(db, dimension, desde, hasta, granularidad)
+    return RollupSerie(dimension=dimension, granularidad=granularidad.value, filas=filas)
+
+
+@router.get("/exportar/{tipo}", response_class=StreamingResponse)
+async def exportar_reporte(
+    tipo: ReporteTipo, desde: datetime, hasta: datetime, formato: ExportFormato = ExportFormato.CSV
+) -> StreamingResponse:
+    archivo = f"{tipo.value}_{desde:%Y%m%d}_{hasta:%Y%m%d}.{formato.value}"
+    return StreamingResponse(
+        exportar(tipo, desde, hasta, formato),
+        media_type=MEDIA_TYPES[formato],
+        headers={"Content-Disposition": f'attachment; filename="{archivo}"'},
+    )
+
+
+@router.get("/{tipo}", response_model=ReportePublic)
+async def reporte(
+    tipo: ReporteTipo, desde: datetime, hasta: datetime, db: AsyncSession = Depends(get_async_db)
+) -> ReportePublic:
+    reporte, cacheado = await obtener_reporte(db, tipo, desde, hasta)
+    if not cacheado:
+        await db.commit()
+    return ReportePublic(
+        tipo=reporte.tipo,
+        desde=reporte.rango_desde,
+        hasta=reporte.rango_hasta,
+        generado_at=reporte.generado_at,
+        cacheado=cacheado,
+        datos=reporte.payload_json,
+    )
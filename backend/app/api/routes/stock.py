@@ -0,0 +1,84 @@
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_async_db, get_stream_user, require_roles
+from app.api.sse import sse_response
+from app.models.models import RoleEnum
+from app.schemas.stock import BajoMinimo, IngredienteStock, StockAFecha, StockDiscrepancia, StockSaldo
+from app.services import stock as stock_service
+from app.services.principal import Principal
+from app.services.realtime import stock_hub
+
+router = APIRouter()
+
+
+@router.get(
+    "/a-fecha",
+    response_model=StockAFecha,
+    dependencies=[Depends(require_roles(RoleEnum.ADMIN, RoleEnum.CAJA))],
+)
+async def stock_a_fecha(
+    momento: datetime,
+    ingrediente_id: Optional[List[int]] = Query(default=None),
+    db: AsyncSession = Depends(get_async_db),
+) -> StockAFecha:
+    saldos = await stock_service.stock_a_fecha(db, momento, ingrediente_id)
+    return StockAFecha(
+        momento=momento,
+        saldos=[StockSaldo(ingrediente_id=id_, stock=saldo) for id_, saldo in sorted(saldos.items())],
+    )
+
+
+@router.get(
+    "/reconciliacion",
+    response_model=List[StockDiscrepancia],
+    dependencies=[Depends(require_roles(RoleEnum.ADMIN))],
+)
+async def reconciliacion(db: AsyncSession = Depends(get_async_db)) -> List[StockDiscrepancia]:
+    return [StockDiscrepancia.model_validate(d) for d in await stock_service.discrepancias(db)]
+
+
+@router.post(
+    "/reconciliacion",
+    response_model=List[StockDiscrepancia],
+    dependencies=[Depends(require_roles(RoleEnum.ADMIN))],
+    summary="Corrige stock_actual al saldo del libro y publica los cruces de mínimo",
+)
+async def corregir_reconciliacion(db: AsyncSession = Depends(get_async_db)) -> List[StockDiscrepancia]:
+    encontradas = await db.run_sync(lambda session: stock_service.reconciliar(session, corregir=True))
+    await db.commit()
+    return [StockDiscrepancia.model_validate(d) for d in encontradas]
+
+
+@router.get(
+    "/bajo-minimo",
+    response_model=BajoMinimo,
+    dependencies=[Depends(require_roles(RoleEnum.ADMIN, RoleEnum.COCINA))],
+)
+async def bajo_minimo(db: AsyncSession = Depends(get_async_db)) -> BajoMinimo:
+    ultimo_evento_id = stock_hub.ultimo_id
+    ingredientes = await stock_service.bajo_minimo(db)
+    return BajoMinimo(
+        ultimo_evento_id=ultimo_evento_id,
+        ingredientes=[IngredienteStock.model_validate(i) for i in ingredientes],
+    )
+
+
+def _admin_stream(user: Principal = Depends(get_stream_user)) -> Principal:
+    if user.rol != RoleEnum.ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No tiene permisos para esta acción")
+    return user
+
+
+@router.get("/alertas/stream", dependencies=[Depends(_admin_stream)], summary="Cruces de stock mínimo vía SSE")
+async def alertas_stream(
+    request: Request,
+    last_event_id: Optional[int] = Header(None, alias="Last-Event-ID"),
+    desde: Optional[int] = Query(None, description="Último id recibido, si no se envía Last-Event-ID"),
+) -> StreamingResponse:
+    sub = stock_hub.subscribe(last_event_id=last_event_id if last_event_id is not None else desde)
+    return sse_response(request, stock_hub, sub)
@@ -1,13 +1,17 @@
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user, get_db, require_roles
-from app.core.security import get_password_hash
-from app.models.models import Caja, RoleEnum, Usuario
+from app.api.deps import get_async_db, get_current_user, require_roles
+from app.api.pagination import PageParams, count_cache, paginate
+from app.core.security import get_password_hash_async
+from app.models.models import RoleEnum, Usuario
 from app.schemas.common import Paginated
 from app.schemas.usuarios import UsuarioCreate, UsuarioPublic, UsuarioUpdate
+from app.services.principal import Principal, principal_cache
+from app.services.usuarios import asignar_cajas, cajas_por_usuario, to_public
 
 router = APIRouter()
 
@@ -17,23 +21,13 @@ router = APIRouter()
     response_model=Paginated[UsuarioPublic],
     dependencies=[Depends(require_roles(RoleEnum.ADMIN))],
 )
-def list_usuarios(db: Session = Depends(get_db), page: int = 1, size: int = 50):
-    query = db.query(Usuario)
-    total = query.count()
-    usuarios = query.offset((page - 1) * size).limit(size).all()
-    response_items: List[UsuarioPublic] = []
-    for user in usuarios:
-        response_items.append(
-            UsuarioPublic(
-                id=user.id,
-                username_lower=user.username_lower,
-                nombre=user.nombre,
-                rol=user.rol.value,
-                activo=user.activo,
-                cajas_asignadas=[c.id for c in user.cajas_asignadas],
-            )
-        )
-    return Paginated[UsuarioPublic](items=response_items, total=total, page=page, size=size)
+async def list_usuarios(db: AsyncSession = Depends(get_async_db), params: PageParams = Depends()):
+    result = await paginate(db, select(Usuario), params, key_columns=[Usuario.id], count_key="usuarios")
+    cajas = await cajas_por_usuario(db, (user.id for user in result.rows))
+    response_items: List[UsuarioPublic] = [to_public(user, cajas[user.id]) for user in result.rows]
+    return Paginated[UsuarioPublic](
+        items=response_items, total=result.total, page=result.page, size=params.size, next_cursor=result.next_cursor
+    )
 
 
 @router.post(
@@ -42,34 +36,24 @@ def list_usuarios(db: Session = Depends(get_db), page: int = 1, size: int = 50):
     status_code=status.HTTP_201_CREATED,
     dependencies=[Depends(require_roles(RoleEnum.ADMIN))],
 )
-def create_usuario(data: UsuarioCreate, db: Session = Depends(get_db)) -> UsuarioPublic:
+async def create_usuario(data: UsuarioCreate, db: AsyncSession = Depends(get_async_db)) -> UsuarioPublic:
     username_lower = data.username.lower()
-    if db.query(Usuario).filter(Usuario.username_lower == username_lower).first():
+    if await db.scalar(select(Usuario.id).where(Usuario.username_lower == username_lower)):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Usuario duplicado")
 
     usuario = Usuario(
         username_lower=username_lower,
         nombre=data.nombre,
         rol=RoleEnum(data.rol),
-        password_hash=get_password_hash(data.password),
-        pin_hash=get_password_hash(data.pin),
+        password_hash=await get_password_hash_async(data.password),
+        pin_hash=await get_password_hash_async(data.pin),
     )
-
-    if data.cajas_ids:
-        cajas = db.query(Caja).filter(Caja.id.in_(data.cajas_ids)).all()
-        usuario.cajas_asignadas = cajas
-
     db.add(usuario)
-    db.commit()
-    db.refresh(usuario)
-    return UsuarioPublic(
-        id=usuario.id,
-        username_lower=usuario.username_lower,
-        nombre=usuario.nombre,
-        rol=usuario.rol.value,
-        activo=usuario.activo,
-        cajas_asignadas=[c.id for c in usuario.cajas_asignadas],
-    )
+    await db.flush()
+    cajas_ids = await asignar_cajas(db, usuario.id, data.cajas_ids or [])
+    await db.commit()
+    count_cache.invalidate("usuarios")
+    return to_public(usuario, cajas_ids)
 
 
 @router.put(
@@ -77,8 +61,10 @@ def create_usuario(data: UsuarioCreate, db: Session = Depends(get_db)) -> Usuari
     response_model=UsuarioPublic,
     dependencies=[Depends(require_roles(RoleEnum.ADMIN))],
 )
-def update_usuario(usuario_id: int, data: UsuarioUpdate, db: Session = Depends(get_db)) -> UsuarioPublic:
-    usuario: Usuario | None = db.get(Usuario, usuario_id)
+async def update_usuario(
+    usuario_id: int, data: UsuarioUpdate, db: AsyncSession = Depends(get_async_db)
+) -> UsuarioPublic:
+    usuario: Usuario | None = await db.get(Usuario, usuario_id)
     if usuario is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuario no encontrado")
 
@@ -89,33 +75,23 @@ def update_usuario(usuario_id: int, data: UsuarioUpdate, db: Session = Depends(g
     if data.activo is not None:
         usuario.activo = data.activo
     if data.password:
-        usuario.password_hash = get_password_hash(data.password)
+        usuario.password_hash = await get_password_hash_async(data.password)
     if data.pin:
-        usuario.pin_hash = get_password_hash(data.pin)
-    if data.cajas_ids is not None:
-        cajas = db.query(Caja).filter(Caja.id.in_(data.cajas_ids)).all()
-        usuario.cajas_asignadas = cajas
+        usuario.pin_hash = await get_password_hash_async(data.pin)
 
     db.add(usuario)
-    db.commit()
-    db.refresh(usuario)
-    return UsuarioPublic(
-        id=usuario.id,
-        username_lower=usuario.username_lower,
-        nombre=usuario.nombre,
-        rol=usuario.rol.value,
-        activo=usuario.activo,
-        cajas_asignadas=[c.id for c in usuario.cajas_asignadas],
-    )
-
-
-@router.get("/me", response_model=UsuarioPublic, dependencies=[Depends(get_current_user)])
-def get_me(current_user: Usuario = Depends(get_current_user)) -> UsuarioPublic:
-    return UsuarioPublic(
-        id=current_user.id,
-        username_lower=current_user.username_lower,
-        nombre=current_user.nombre,
-        rol=current_user.rol.value,
-        activo=current_user.activo,
-        cajas_asignadas=[c.id for c in current_user.cajas_asignadas],
-    )
+    if data.cajas_ids is not None:
+        cajas_ids = await asignar_cajas(db, usuario.id, data.cajas_ids)
+    else:
+        cajas_ids = (await cajas_por_usuario(db, [usuario.id]))[usuario.id]
+    await db.commit()
+    principal_cache.invalidate(usuario.username_lower)
+    return to_public(usuario, cajas_ids)
+
+
+@router.get("/me", response_model=UsuarioPublic)
+async def get_me(
+    current_user: Principal = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)
+) -> UsuarioPublic:
+    cajas = await cajas_por_usuario(db, [current_user.id])
+    return to_public(current_user, cajas[current_user.id])
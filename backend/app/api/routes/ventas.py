@@ -0,0 +1,96 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_async_db, require_roles
+from app.models.models import RoleEnum
+from app.schemas.ventas import (
+    DescuentoIn,
+    DescuentoPublic,
+    PagoIn,
+    PagoPublic,
+    PagoResultado,
+    VentaCreate,
+    VentaDetalle,
+    VentaItemPublic,
+    VentaItemsCambio,
+    VentaItemsResultado,
+    VentaPublic,
+)
+from app.services import ventas as ventas_service
+from app.services.principal import Principal
+
+router = APIRouter()
+
+operador = require_roles(RoleEnum.ADMIN, RoleEnum.CAJA, RoleEnum.MOZO)
+# Sólo caja y administración pueden cobrar un ítem a otro precio que el vigente.
+PRECIO_MANUAL = (RoleEnum.ADMIN, RoleEnum.CAJA)
+
+
+@router.post("/", response_model=VentaPublic, status_code=status.HTTP_201_CREATED)
+async def abrir_venta(
+    data: VentaCreate, db: AsyncSession = Depends(get_async_db), user: Principal = Depends(operador)
+) -> VentaPublic:
+    venta = await ventas_service.abrir_venta(db, data, mozo_id=user.id)
+    await db.commit()
+    return VentaPublic.model_validate(venta)
+
+
+@router.get("/{venta_id}", response_model=VentaDetalle, dependencies=[Depends(operador)])
+async def get_venta(venta_id: int, db: AsyncSession = Depends(get_async_db)) -> VentaDetalle:
+    venta = await ventas_service.obtener_venta(db, venta_id, detalle=True)
+    return VentaDetalle.model_validate(venta)
+
+
+@router.post("/{venta_id}/items", response_model=VentaItemsResultado)
+async def cambiar_items(
+    venta_id: int,
+    data: VentaItemsCambio,
+    db: AsyncSession = Depends(get_async_db),
+    user: Principal = Depends(operador),
+) -> VentaItemsResultado:
+    if user.rol not in PRECIO_MANUAL and any(item.precio_unitario is not None for item in data.agregar):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No tiene permisos para fijar precios")
+    venta = await ventas_service.obtener_venta(db, venta_id)
+    agregados, quitados = await ventas_service.cambiar_items(db, venta, data.agregar, data.quitar)
+    await db.commit()
+    return VentaItemsResultado(
+        venta=VentaPublic.model_validate(venta),
+        agregados=[VentaItemPublic.model_validate(item) for item in agregados],
+        quitados=quitados,
+    )
+
+
+@router.post(
+    "/{venta_id}/descuentos",
+    response_model=DescuentoPublic,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_roles(RoleEnum.ADMIN, RoleEnum.CAJA))],
+)
+async def aplicar_descuento(
+    venta_id: int, data: DescuentoIn, db: AsyncSession = Depends(get_async_db)
+) -> DescuentoPublic:
+    venta = await ventas_service.obtener_venta(db, venta_id)
+    descuento = await ventas_service.aplicar_descuento(db, venta, data)
+    await db.commit()
+    return DescuentoPublic.model_validate(descuento)
+
+
+@router.post(
+    "/{venta_id}/pagos",
+    response_model=PagoResultado,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(operador)],
+)
+async def registrar_pago(venta_id: int, data: PagoIn, db: AsyncSession = Depends(get_async_db)) -> PagoResultado:
+    venta = await ventas_service.obtener_venta(db, venta_id)
+    pago, vuelto = await ventas_service.registrar_pago(db, venta, data)
+    await db.commit()
+    return PagoResultado(venta=VentaPublic.model_validate(venta), pago=PagoPublic.model_validate(pago), vuelto=vuelto)
+
+
+@router.post("/{venta_id}/cerrar", response_model=VentaPublic, dependencies=[Depends(operador)])
+async def cerrar_venta(venta_id: int, db: AsyncSession = Depends(get_async_db)) -> VentaPublic:
+    venta = await ventas_service.obtener_venta(db, venta_id)
+    await ventas_service.cerrar_venta(db, venta)
+    await db.commit()
+    return VentaPublic.model_validate(venta)
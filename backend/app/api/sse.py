@@ -0,0 +1,30 @@
+"""Respuesta Server-Sent Events sobre una suscripción a un `EventHub`."""
+import json
+from typing import AsyncIterator
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.services.realtime import EventHub, Suscripcion
+
+
+def sse_response(request: Request, hub: EventHub, sub: Suscripcion) -> StreamingResponse:
+    async def eventos() -> AsyncIterator[str]:
+        try:
+            yield "retry: 3000\n\n"
+            async for evento in hub.eventos(sub, heartbeat=settings.realtime_heartbeat_seconds):
+                if await request.is_disconnected():
+                    break
+                if evento is None:
+                    yield ": ping\n\n"
+                    continue
+                yield f"id: {evento.id}\nevent: {evento.tipo}\ndata: {json.dumps(evento.data)}\n\n"
+        finally:
+            hub.unsubscribe(sub)
+
+    return StreamingResponse(
+        eventos(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,8 @@
+"""Benchmarks del backend.
+
+- `python -m app.benchmarks.almuerzo`: escenario HTTP de hora pico contra `create_app()` en proceso.
+- `python -m app.benchmarks.micro`: micro benchmarks de funciones calientes.
+
+Ambos guardan un JSON por corrida en `benchmarks/` (con el commit actual) y, con
+`--comparar`, contrastan contra la corrida anterior del mismo escenario.
+"""
@@ -0,0 +1,263 @@
+"""Escenario de hora pico: mozos cargando ventas, pantallas de cocina y un cajero.
+
+Corre en proceso contra `create_app()` con `httpx.ASGITransport`, así mide la pila
+completa (validación, dependencias, servicios y base) sin red de por medio. Cada mozo
+abre ventas, agrega ítems, manda el pedido a cocina, cobra y cierra; las cocinas leen el
+tablero y avanzan los pedidos; el cajero consulta el saldo del turno y lo cierra al
+final. Se informa p50/p95/p99 y pedidos por segundo por endpoint.
+
+Por defecto usa una base SQLite temporal; con `--database-url` apunta a otra (el esquema
+ya tiene que estar migrado).
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+from app.benchmarks.metricas import RESULTADOS, Registro, anterior, guardar, imprimir, regresiones
+
+ESCENARIO = "almuerzo"
+# Una pantalla por estación, como en el local: dos cocinas no compiten por el mismo pedido.
+ESTACIONES = ("cocina", "barra", "parrilla", "postres")
+
+
+@dataclass
+class Parametros:
+    mozos: int = 10
+    ventas_por_mozo: int = 5
+    items_por_venta: int = 3
+    cocinas: int = 2
+    productos: int = 40
+    semilla: int = 1
+
+
+@dataclass
+class Datos:
+    tokens: Dict[str, str]
+    caja_id: int
+    productos: List[int]
+
+
+def preparar(parametros: Parametros) -> Datos:
+    """Usuarios, caja y carta del escenario, en una transacción."""
+    from sqlalchemy import insert, select
+
+    from app.core.security import create_token, get_password_hash
+    from app.db.session import session_scope
+    from app.models.models import Caja, CategoriaProducto, Producto, RoleEnum, Usuario
+
+    usuarios = {"cajero": RoleEnum.CAJA, **{f"cocina{i}": RoleEnum.COCINA for i in range(parametros.cocinas)}}
+    usuarios.update({f"mozo{i}": RoleEnum.MOZO for i in range(parametros.mozos)})
+    # Un solo hash para todos: el escenario no mide bcrypt.
+    hash_ = get_password_hash("bench")
+    # Único por corrida para poder repetirla sobre una base persistente; la semilla sólo fija la carga.
+    prefijo = f"bench{uuid.uuid4().hex[:8]}_"
+    with session_scope() as session:
+        session.execute(
+            insert(Usuario),
+            [
+                {"username_lower": prefijo + u, "nombre": u, "rol": rol, "password_hash": hash_, "pin_hash": hash_}
+                for u, rol in usuarios.items()
+            ],
+        )
+        caja = Caja(nombre=f"{prefijo}caja")
+        categoria = CategoriaProducto(nombre=f"{prefijo}carta")
+        session.add_all([caja, categoria])
+        session.flush()
+        session.execute(
+            insert(Producto),
+            [
+                {
+                    "nombre": f"Producto {i}",
+                    "sku": f"{prefijo}{i}",
+                    "categoria_id": categoria.id,
+                    "precio_lista": 500 + i,
+                }
+                for i in range(parametros.productos)
+            ],
+        )
+        productos = list(session.scalars(select(Producto.id).where(Producto.categoria_id == categoria.id)))
+        caja_id = caja.id
+    return Datos(tokens={u: create_token(prefijo + u) for u in usuarios}, caja_id=caja_id, productos=productos)
+
+
+class Cliente:
+    """Envuelve el cliente HTTP y registra la latencia de cada pedido bajo un nombre de ruta."""
+
+    def __init__(self, http, registro: Registro, token: str) -> None:
+        self.http = http
+        self.registro = registro
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+    async def __call__(self, metodo: str, ruta: str, url: str, **kwargs) -> Optional[Any]:
+        inicio = perf_counter()
+        try:
+            response = await self.http.request(metodo, url, headers=self.headers, **kwargs)
+        except Exception:  # noqa: BLE001 - un error de la app cuenta como fallo del pedido, no corta el escenario
+            self.registro.agregar(f"{metodo} {ruta}", perf_counter() - inicio, ok=False)
+            return None
+        ok = response.status_code < 400
+        self.registro.agregar(f"{metodo} {ruta}", perf_counter() - inicio, ok=ok)
+        return response.json() if ok and response.content else None
+
+
+async def _mozo(cliente: Cliente, datos: Datos, turno_id: int, parametros: Parametros, azar: random.Random) -> None:
+    for _ in range(parametros.ventas_por_mozo):
+        venta = await cliente(
+            "POST", "/ventas/", "/api/ventas/", json={"tipo": "mesa", "caja_id": datos.caja_id, "turno_id": turno_id}
+        )
+        if venta is None:
+            continue
+        url = f"/api/ventas/{venta['id']}"
+        estaciones = ESTACIONES[: max(1, min(parametros.cocinas, len(ESTACIONES)))]
+        agregar = [
+            {"producto_id": azar.choice(datos.productos), "cantidad": azar.randint(1, 3)}
+            for _ in range(parametros.items_por_venta)
+        ]
+        cambio = await cliente("POST", "/ventas/{id}/items", f"{url}/items", json={"agregar": agregar})
+        await cliente(
+            "POST",
+            "/cocina/pedidos",
+            "/api/cocina/pedidos",
+            json={"venta_id": venta["id"], "estacion": azar.choice(estaciones), "items": agregar},
+        )
+        await cliente("GET", "/ventas/{id}", url)
+        if cambio is not None:
+            medio = azar.choice(["efectivo", "debito", "mp_qr"])
+            monto = cambio["venta"]["total_neto"]
+            await cliente("POST", "/ventas/{id}/pagos", f"{url}/pagos", json={"medio": medio, "monto": monto})
+        await cliente("POST", "/ventas/{id}/cerrar", f"{url}/cerrar")
+
+
+async def _cocina(cliente: Cliente, estacion: str, fin: asyncio.Event) -> None:
+    siguiente = {"pendiente": "en_curso", "en_curso": "listo"}
+    while not fin.is_set():
+        tablero = await cliente("GET", "/cocina/pedidos", "/api/cocina/pedidos", params={"estacion": estacion})
+        for pedido in (tablero or {}).get("pedidos", [])[:5]:
+            await cliente(
+                "PATCH",
+                "/cocina/pedidos/{id}/estado",
+                f"/api/cocina/pedidos/{pedido['id']}/estado",
+                json={"estado": siguiente[pedido["estado"]]},
+            )
+        await asyncio.sleep(0.02)
+
+
+async def _cajero(cliente: Cliente, turno_id: int, fin: asyncio.Event) -> None:
+    while not fin.is_set():
+        await cliente("GET", "/caja/turnos/{id}/saldo", f"/api/caja/turnos/{turno_id}/saldo")
+        await asyncio.sleep(0.1)
+
+
+async def correr(parametros: Parametros) -> Dict[str, Any]:
+    import httpx
+
+    from app.main import create_app
+
+    datos = preparar(parametros)
+    registro = Registro()
+    azar = random.Random(parametros.semilla)
+    transporte = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transporte, base_url="http://almuerzo") as http:
+        cajero = Cliente(http, registro, datos.tokens["cajero"])
+        turno = await cajero("POST", "/caja/turnos", "/api/caja/turnos", json={"caja_id": datos.caja_id})
+        if turno is None:
+            raise RuntimeError("No se pudo abrir el turno del escenario")
+
+        fin = asyncio.Event()
+        inicio = perf_counter()
+        fondo = [asyncio.create_task(_cajero(cajero, turno["id"], fin))]
+        fondo += [
+            asyncio.create_task(
+                _cocina(Cliente(http, registro, datos.tokens[f"cocina{i}"]), ESTACIONES[i % len(ESTACIONES)], fin)
+            )
+            for i in range(parametros.cocinas)
+        ]
+        await asyncio.gather(
+            *(
+                _mozo(Cliente(http, registro, datos.tokens[f"mozo{i}"]), datos, turno["id"], parametros, azar)
+                for i in range(parametros.mozos)
+            )
+        )
+        fin.set()
+        await asyncio.gather(*fondo)
+        await cajero("POST", "/caja/turnos/{id}/cerrar", f"/api/caja/turnos/{turno['id']}/cerrar", json={})
+        duracion = perf_counter() - inicio
+
+    endpoints = registro.resumen(duracion)
+    total = sum(v["n"] for v in endpoints.values())
+    return {
+        "parametros": asdict(parametros),
+        "duracion_s": round(duracion, 3),
+        "pedidos": total,
+        "pedidos_por_segundo": round(total / duracion, 2) if duracion else 0.0,
+        "endpoints": endpoints,
+    }
+
+
+def _configurar_base(database_url: Optional[str]) -> bool:
+    """Fija la base antes de importar `app.db`; devuelve si hay que crear el esquema."""
+    if database_url:
+        os.environ["DATABASE_URL"] = database_url
+        os.environ["SYNC_DATABASE_URL"] = database_url.replace("+aiosqlite", "").replace("+asyncpg", "+psycopg2")
+        return False
+    ruta = os.path.join(tempfile.mkdtemp(prefix="cafeteria-bench-"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{ruta}"
+    os.environ["SYNC_DATABASE_URL"] = f"sqlite:///{ruta}"
+    return True
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mozos", type=int, default=Parametros.mozos)
+    parser.add_argument("--ventas", type=int, default=Parametros.ventas_por_mozo, help="Ventas por mozo")
+    parser.add_argument("--items", type=int, default=Parametros.items_por_venta, help="Ítems por venta")
+    parser.add_argument(
+        "--cocinas", type=int, default=Parametros.cocinas, help="Pantallas de cocina (una por estación)"
+    )
+    parser.add_argument("--semilla", type=int, default=Parametros.semilla)
+    parser.add_argument("--database-url", help="URL async de la base (por defecto, SQLite temporal)")
+    parser.add_argument("--resultados", type=str, default=str(RESULTADOS), help="Directorio de resultados JSON")
+    parser.add_argument("--comparar", action="store_true", help="Comparar p95 contra la corrida anterior")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="Empeoramiento admitido de p95 (fracción)")
+    args = parser.parse_args(argv)
+
+    if _configurar_base(args.database_url):
+        from app import models  # noqa: F401 - registra las tablas en la metadata
+        from app.db.base import Base
+        from app.db.session import engine
+
+        Base.metadata.create_all(engine)
+
+    parametros = Parametros(
+        mozos=args.mozos,
+        ventas_por_mozo=args.ventas,
+        items_por_venta=args.items,
+        cocinas=args.cocinas,
+        semilla=args.semilla,
+    )
+    resultado = asyncio.run(correr(parametros))
+    imprimir(resultado["endpoints"])
+    print(f"{resultado['pedidos']} pedidos en {resultado['duracion_s']} s ({resultado['pedidos_por_segundo']}/s)")
+
+    directorio = Path(args.resultados)
+    ruta = guardar(ESCENARIO, resultado, directorio)
+    print(f"Resultados en {ruta}")
+    if args.comparar:
+        previo = anterior(ESCENARIO, ruta, directorio, resultado["parametros"])
+        if previo is not None:
+            peores = regresiones(previo["endpoints"], resultado["endpoints"], "p95_ms", args.tolerancia)
+            for linea in peores:
+                print(f"REGRESIÓN {linea}")
+            return 1 if peores else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,92 @@
+"""Registro de latencias, resumen por percentiles y persistencia de resultados entre commits."""
+import json
+import math
+import subprocess
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+RESULTADOS = Path("benchmarks")
+
+
+def percentil(valores: List[float], p: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not valores:
+        return 0.0
+    return valores[max(0, math.ceil(p / 100 * len(valores)) - 1)]
+
+
+class Registro:
+    def __init__(self) -> None:
+        self.latencias: Dict[str, List[float]] = defaultdict(list)
+        self.errores: Dict[str, int] = defaultdict(int)
+
+    def agregar(self, nombre: str, segundos: float, ok: bool = True) -> None:
+        self.latencias[nombre].append(segundos)
+        if not ok:
+            self.errores[nombre] += 1
+
+    def resumen(self, duracion: float) -> Dict[str, Dict[str, float]]:
+        resultado = {}
+        for nombre in sorted(self.latencias):
+            valores = sorted(self.latencias[nombre])
+            resultado[nombre] = {
+                "n": len(valores),
+                "errores": self.errores[nombre],
+                "p50_ms": round(percentil(valores, 50) * 1000, 3),
+                "p95_ms": round(percentil(valores, 95) * 1000, 3),
+                "p99_ms": round(percentil(valores, 99) * 1000, 3),
+                "max_ms": round(valores[-1] * 1000, 3),
+                "por_segundo": round(len(valores) / duracion, 2) if duracion else 0.0,
+            }
+        return resultado
+
+
+def commit_actual() -> Optional[str]:
+    try:
+        salida = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return salida.stdout.strip() or None
+
+
+def guardar(escenario: str, datos: Dict[str, Any], directorio: Path = RESULTADOS) -> Path:
+    directorio.mkdir(parents=True, exist_ok=True)
+    ahora = datetime.now(timezone.utc)
+    commit = commit_actual()
+    contenido = {"escenario": escenario, "fecha": ahora.isoformat(), "commit": commit, **datos}
+    ruta = directorio / f"{escenario}-{ahora:%Y%m%dT%H%M%S}-{commit or 'sin-git'}.json"
+    ruta.write_text(json.dumps(contenido, indent=2, ensure_ascii=False))
+    return ruta
+
+
+def anterior(
+    escenario: str, actual: Path, directorio: Path = RESULTADOS, parametros: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    """Última corrida guardada del escenario; con `parametros`, sólo una de la misma carga."""
+    for ruta in sorted((p for p in directorio.glob(f"{escenario}-*.json") if p != actual), reverse=True):
+        datos = json.loads(ruta.read_text())
+        if parametros is None or datos.get("parametros") == parametros:
+            return datos
+    return None
+
+
+def regresiones(
+    previo: Dict[str, Dict[str, float]], actual: Dict[str, Dict[str, float]], metrica: str, tolerancia: float
+) -> List[str]:
+    """Entradas cuya `metrica` empeoró más que `tolerancia` (fracción) respecto de la corrida previa."""
+    lineas = []
+    for nombre, valores in actual.items():
+        base = previo.get(nombre, {}).get(metrica)
+        if base and valores[metrica] > base * (1 + tolerancia):
+            lineas.append(f"{nombre}: {metrica} {base} -> {valores[metrica]} (+{valores[metrica] / base - 1:.0%})")
+    return lineas
+
+
+def imprimir(resumen: Dict[str, Dict[str, float]]) -> None:
+    columnas = list(next(iter(resumen.values()), {}))
+    ancho = max((len(n) for n in resumen), default=10)
+    print(f"{'':<{ancho}}  " + "  ".join(f"{c:>11}" for c in columnas))
+    for nombre, valores in resumen.items():
+        print(f"{nombre:<{ancho}}  " + "  ".join(f"{valores.get(c, ''):>11}" for c in columnas))
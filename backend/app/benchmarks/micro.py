@@ -0,0 +1,135 @@
+"""Micro benchmarks de las funciones calientes que no tocan la base.
+
+Cada caso se repite en rondas y se informa la mediana y el p95 por llamada, al estilo de
+pytest-benchmark pero sin la dependencia: son funciones puras sobre datos sintéticos.
+"""
+import argparse
+import statistics
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from time import perf_counter
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+
+from app.benchmarks.metricas import RESULTADOS, anterior, guardar, imprimir, percentil, regresiones
+
+ESCENARIO = "micro"
+PRODUCTOS = 2000
+
+
+def _precios() -> Callable[[], object]:
+    from app.services.precios import TablaPrecios
+
+    base = {i: Decimal(500 + i) for i in range(PRODUCTOS)}
+    tabla = TablaPrecios(
+        base=base,
+        listas={1: {i: precio * Decimal("0.9") for i, precio in base.items() if i % 3 == 0}},
+        activa=1,
+        franjas=(),
+        cargada_at=0.0,
+    )
+    venta = list(range(0, PRODUCTOS, 97))
+    momento = datetime.now(timezone.utc)
+    return lambda: tabla.resolver(venta, momento)
+
+
+def _catalogo() -> Callable[[], object]:
+    from app.services.catalogo import _producto, _serializar
+    from app.services.precios import TablaPrecios
+
+    productos = [
+        SimpleNamespace(
+            id=i,
+            nombre=f"Producto {i}",
+            sku=f"SKU-{i}",
+            categoria_id=i % 20,
+            precio_lista=Decimal(500 + i),
+            favoritos=i % 10 == 0,
+            activo=True,
+        )
+        for i in range(PRODUCTOS)
+    ]
+    tabla = TablaPrecios(base={}, listas={}, activa=None, franjas=(), cargada_at=0.0)
+    return lambda: _serializar({"productos": [_producto(p, tabla, {}) for p in productos]})
+
+
+def _xlsx() -> Callable[[], object]:
+    from app.core.xlsx import _fila
+
+    fecha = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    filas = [(i, fecha, 3, None, Decimal("1520.50"), "Café con leche & medialuna") for i in range(1000)]
+    return lambda: b"".join(_fila(f) for f in filas)
+
+
+def _token() -> Callable[[], object]:
+    from app.core.security import create_token, decode_token
+
+    token = create_token("bench")
+    return lambda: decode_token(token)
+
+
+CASOS: Dict[str, Callable[[], Callable[[], object]]] = {
+    "precios.resolver": _precios,
+    "catalogo.serializar": _catalogo,
+    "xlsx.filas_1000": _xlsx,
+    "security.decode_token": _token,
+}
+
+
+def medir(funcion: Callable[[], object], rondas: int, minimo_s: float = 0.005) -> Dict[str, float]:
+    """Tiempo por llamada en cada ronda; las llamadas por ronda se ajustan para durar al menos `minimo_s`."""
+    funcion()
+    llamadas = 1
+    while True:
+        inicio = perf_counter()
+        for _ in range(llamadas):
+            funcion()
+        if perf_counter() - inicio >= minimo_s:
+            break
+        llamadas *= 2
+    tiempos: List[float] = []
+    for _ in range(rondas):
+        inicio = perf_counter()
+        for _ in range(llamadas):
+            funcion()
+        tiempos.append((perf_counter() - inicio) / llamadas)
+    tiempos.sort()
+    return {
+        "rondas": rondas,
+        "llamadas": llamadas,
+        "p50_ms": round(statistics.median(tiempos) * 1000, 4),
+        "p95_ms": round(percentil(tiempos, 95) * 1000, 4),
+        "min_ms": round(tiempos[0] * 1000, 4),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("casos", nargs="*", help=f"Casos a correr (por defecto, todos): {', '.join(CASOS)}")
+    parser.add_argument("--rondas", type=int, default=20)
+    parser.add_argument("--resultados", type=str, default=str(RESULTADOS), help="Directorio de resultados JSON")
+    parser.add_argument("--comparar", action="store_true", help="Comparar la mediana contra la corrida anterior")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="Empeoramiento admitido (fracción)")
+    args = parser.parse_args(argv)
+    desconocidos = set(args.casos) - set(CASOS)
+    if desconocidos:
+        parser.error(f"Casos desconocidos: {', '.join(sorted(desconocidos))}")
+
+    resultados = {nombre: medir(CASOS[nombre](), args.rondas) for nombre in args.casos or CASOS}
+    imprimir(resultados)
+    directorio = Path(args.resultados)
+    ruta = guardar(ESCENARIO, {"parametros": {"rondas": args.rondas}, "casos": resultados}, directorio)
+    print(f"Resultados en {ruta}")
+    if args.comparar:
+        previo = anterior(ESCENARIO, ruta, directorio, {"rondas": args.rondas})
+        if previo is not None:
+            peores = regresiones(previo["casos"], resultados, "p50_ms", args.tolerancia)
+            for linea in peores:
+                print(f"REGRESIÓN {linea}")
+            return 1 if peores else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,50 @@
+"""Caché en memoria con vencimiento y tamaño acotado, compartida por los servicios."""
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """LRU con TTL por entrada. Segura entre hilos del mismo proceso."""
+
+    def __init__(self, ttl_seconds: float, max_size: int = 1024) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._data: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: K, value: V, ttl_seconds: Optional[float] = None) -> None:
+        """Guarda `value`; `ttl_seconds` reemplaza la vigencia por defecto para esta entrada."""
+        vigencia = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._data[key] = (monotonic() + vigencia, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -1,16 +1,55 @@
 from functools import lru_cache
 from typing import List
 
-from pydantic import AnyHttpUrl, BaseSettings, Field
+from pydantic import AnyHttpUrl, Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     app_name: str = "Cafetería POS"
     environment: str = Field(default="development", description="Nombre del entorno")
+    debug: bool = Field(default=False, description="Agrega Server-Timing con las consultas SQL de cada request")
     secret_key: str = Field(default="changeme", description="Clave secreta JWT")
     access_token_expire_minutes: int = 30
     refresh_token_expire_minutes: int = 60 * 24 * 7
 
+    principal_cache_ttl_seconds: float = Field(default=60, description="Vigencia del usuario autenticado en memoria")
+    principal_cache_max_size: int = Field(default=1024, description="Máximo de usuarios cacheados por proceso")
+    count_cache_ttl_seconds: float = Field(
+        default=30, ge=0, description="Vigencia de los totales de listados paginados (0 = sin caché)"
+    )
+    hash_max_workers: int = Field(default=2, description="Verificaciones bcrypt concurrentes por proceso")
+    login_max_failures: int = Field(default=5, description="Ingresos fallidos por usuario antes de bloquearlo")
+    login_ip_max_failures: int = Field(
+        default=50, description="Ingresos fallidos desde una IP antes de bloquearla (terminales detrás de un NAT)"
+    )
+    login_lockout_seconds: float = Field(
+        default=60, description="Primer bloqueo tras agotar los intentos; se duplica en cada bloqueo (hasta 1 h)"
+    )
+
+    bom_cache_ttl_seconds: float = Field(default=300, description="Vigencia de las recetas aplanadas en memoria")
+    precios_cache_ttl_seconds: float = Field(
+        default=60, description="Vigencia de la tabla de precios en memoria (cambios hechos por otros procesos)"
+    )
+    catalogo_cache_ttl_seconds: float = Field(
+        default=60, description="Vigencia del snapshot del catálogo para las tablets (cambios de otros procesos)"
+    )
+    config_poll_seconds: float = Field(
+        default=5, description="Cada cuánto se recarga la tabla config para ver cambios de otros workers"
+    )
+    timezone: str = Field(default="America/Argentina/Buenos_Aires", description="Zona horaria del local")
+    import_batch_size: int = Field(default=1000, gt=0, description="Filas por INSERT en importaciones masivas")
+    export_batch_size: int = Field(default=1000, gt=0, description="Filas leídas por lote del cursor en exportaciones")
+
+    realtime_buffer_size: int = Field(default=1000, description="Eventos retenidos para reconexiones")
+    realtime_queue_size: int = Field(default=256, description="Eventos pendientes por cliente antes de desconectarlo")
+    realtime_heartbeat_seconds: float = 15
+    metrics_enabled: bool = Field(default=False, description="Mide cada request y expone /metrics para Prometheus")
+    metrics_token: str | None = Field(default=None, description="Bearer que exige /metrics (sin él queda abierto)")
+    sql_repeat_warning: int = Field(
+        default=10, description="Avisa en el log si un request repite la misma consulta más veces (0 desactiva)"
+    )
+
     database_url: str = Field(default="sqlite+aiosqlite:///./cafeteria.db")
     sync_database_url: str = Field(default="sqlite:///./cafeteria.db")
 
@@ -19,10 +58,7 @@ class Settings(BaseSettings):
     mercado_pago_access_token: str | None = None
     whatsapp_token: str | None = None
 
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", case_sensitive=False)
 
 
 @lru_cache
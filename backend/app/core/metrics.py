@@ -0,0 +1,323 @@
+"""Métricas de proceso en formato de exposición de texto de Prometheus.
+
+Contadores, medidores e histogramas mínimos, sin dependencias: registrar una observación
+es una búsqueda binaria y dos sumas bajo un lock sin contención, así el middleware no
+agrega costo apreciable al request. El pool de conexiones se lee recién al exportar.
+
+`MetricsMiddleware` es ASGI puro (no `BaseHTTPMiddleware`) para no envolver el cuerpo de
+las respuestas en streaming; etiqueta por plantilla de ruta (`/api/ventas/{venta_id}`),
+nunca por URL, para acotar la cardinalidad.
+"""
+import hmac
+import logging
+from bisect import bisect_left
+from threading import Lock
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.db.profiling import contar
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCIA_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+BCRYPT_BUCKETS = (0.001, 0.01, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0, 5.0)
+
+logger = logging.getLogger(__name__)
+
+Etiquetas = Tuple[str, ...]
+M = TypeVar("M", bound="Metrica")
+
+
+def _escapar(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _numero(valor: float) -> str:
+    if valor == float("inf"):
+        return "+Inf"
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class Metrica:
+    tipo = ""
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = ()) -> None:
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self._lock = Lock()
+
+    def _etiquetas(self, valores: Etiquetas, extra: str = "") -> str:
+        pares = [f'{k}="{_escapar(v)}"' for k, v in zip(self.etiquetas, valores)]
+        if extra:
+            pares.append(extra)
+        return "{" + ",".join(pares) + "}" if pares else ""
+
+    def muestras(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def exponer(self) -> List[str]:
+        return [f"# HELP {self.nombre} {self.ayuda}", f"# TYPE {self.nombre} {self.tipo}", *self.muestras()]
+
+
+class Contador(Metrica):
+    tipo = "counter"
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = ()) -> None:
+        super().__init__(nombre, ayuda, etiquetas)
+        self._valores: Dict[Etiquetas, float] = {}
+
+    def inc(self, *etiquetas: str, valor: float = 1) -> None:
+        with self._lock:
+            self._valores[etiquetas] = self._valores.get(etiquetas, 0) + valor
+
+    def valor(self, *etiquetas: str) -> float:
+        return self._valores.get(etiquetas, 0)
+
+    def muestras(self) -> Iterable[str]:
+        with self._lock:
+            valores = sorted(self._valores.items())
+        return [f"{self.nombre}{self._etiquetas(e)} {_numero(v)}" for e, v in valores]
+
+
+class Medidor(Metrica):
+    """Valor instantáneo; con `funcion` se calcula al exportar en lugar de mantenerse."""
+
+    tipo = "gauge"
+
+    def __init__(
+        self,
+        nombre: str,
+        ayuda: str,
+        etiquetas: Sequence[str] = (),
+        funcion: Optional[Callable[[], Dict[Etiquetas, float]]] = None,
+    ) -> None:
+        super().__init__(nombre, ayuda, etiquetas)
+        self._valores: Dict[Etiquetas, float] = {}
+        self._funcion = funcion
+
+    def inc(self, *etiquetas: str, valor: float = 1) -> None:
+        with self._lock:
+            self._valores[etiquetas] = self._valores.get(etiquetas, 0) + valor
+
+    def dec(self, *etiquetas: str, valor: float = 1) -> None:
+        self.inc(*etiquetas, valor=-valor)
+
+    def valor(self, *etiquetas: str) -> float:
+        return self._valores.get(etiquetas, 0)
+
+    def muestras(self) -> Iterable[str]:
+        if self._funcion is not None:
+            valores = sorted(self._funcion().items())
+        else:
+            with self._lock:
+                valores = sorted(self._valores.items())
+        return [f"{self.nombre}{self._etiquetas(e)} {_numero(v)}" for e, v in valores]
+
+
+class Histograma(Metrica):
+    tipo = "histogram"
+
+    def __init__(
+        self, nombre: str, ayuda: str, etiquetas: Sequence[str] = (), buckets: Sequence[float] = LATENCIA_BUCKETS
+    ) -> None:
+        super().__init__(nombre, ayuda, etiquetas)
+        self.buckets = tuple(sorted(buckets))
+        # Por etiquetas: conteo por bucket (no acumulado; el último es +Inf), suma y total.
+        self._series: Dict[Etiquetas, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, valor: float, *etiquetas: str) -> None:
+        indice = bisect_left(self.buckets, valor)
+        with self._lock:
+            serie = self._series.get(etiquetas)
+            if serie is None:
+                serie = self._series[etiquetas] = ([0] * (len(self.buckets) + 1), [0.0])
+            serie[0][indice] += 1
+            serie[1][0] += valor
+
+    def conteo(self, *etiquetas: str) -> int:
+        serie = self._series.get(etiquetas)
+        return sum(serie[0]) if serie else 0
+
+    def muestras(self) -> Iterable[str]:
+        with self._lock:
+            series = sorted((e, (list(c), s[0])) for e, (c, s) in self._series.items())
+        lineas = []
+        for etiquetas, (conteos, suma) in series:
+            acumulado = 0
+            for limite, n in zip((*self.buckets, float("inf")), conteos):
+                acumulado += n
+                le = f'le="{_numero(limite)}"'
+                lineas.append(f"{self.nombre}_bucket{self._etiquetas(etiquetas, le)} {acumulado}")
+            lineas.append(f"{self.nombre}_sum{self._etiquetas(etiquetas)} {_numero(suma)}")
+            lineas.append(f"{self.nombre}_count{self._etiquetas(etiquetas)} {acumulado}")
+        return lineas
+
+
+class Registro:
+    def __init__(self) -> None:
+        self._metricas: Dict[str, Metrica] = {}
+
+    def registrar(self, metrica: M) -> M:
+        if metrica.nombre in self._metricas:
+            raise ValueError(f"Métrica duplicada: {metrica.nombre}")
+        self._metricas[metrica.nombre] = metrica
+        return metrica
+
+    def exponer(self) -> str:
+        return "\n".join(linea for m in self._metricas.values() for linea in m.exponer()) + "\n"
+
+
+registro = Registro()
+
+http_duracion = registro.registrar(
+    Histograma(
+        "cafeteria_http_request_duration_seconds",
+        "Duración de los requests HTTP hasta el último byte de la respuesta",
+        ("method", "route"),
+    )
+)
+http_requests = registro.registrar(
+    Contador("cafeteria_http_requests_total", "Requests HTTP atendidos", ("method", "route", "status"))
+)
+http_en_curso = registro.registrar(
+    Medidor("cafeteria_http_requests_in_flight", "Requests HTTP en curso", ("method",))
+)
+bcrypt_duracion = registro.registrar(
+    Histograma(
+        "cafeteria_bcrypt_seconds",
+        "Verificaciones bcrypt: espera en el pool propio y cómputo",
+        ("fase",),
+        buckets=BCRYPT_BUCKETS,
+    )
+)
+db_checkouts = registro.registrar(
+    Contador("cafeteria_db_pool_checkouts_total", "Conexiones tomadas del pool", ("engine",))
+)
+
+_ENGINES: Dict[str, Engine] = {}
+
+
+def _estado_pools() -> Dict[Etiquetas, float]:
+    valores: Dict[Etiquetas, float] = {}
+    for nombre, engine in _ENGINES.items():
+        pool = engine.pool
+        for estado in ("size", "checkedout", "checkedin", "overflow"):
+            lectura = getattr(pool, estado, None)
+            # Sólo `QueuePool` los expone como métodos; `SingletonThreadPool` (SQLite en memoria) tiene `size` entero.
+            if callable(lectura):
+                # `overflow()` es negativo mientras el pool no se llenó: no hay conexiones extra.
+                valores[(nombre, estado)] = max(0, lectura())
+    return valores
+
+
+registro.registrar(
+    Medidor(
+        "cafeteria_db_pool_connections",
+        "Estado del pool de conexiones: size, checkedout, checkedin y overflow",
+        ("engine", "estado"),
+        funcion=_estado_pools,
+    )
+)
+
+
+def instrumentar_engine(nombre: str, engine: Engine) -> None:
+    """Cuenta las conexiones tomadas del pool y lo expone en `/metrics`; idempotente."""
+    if nombre in _ENGINES:
+        return
+    _ENGINES[nombre] = engine
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        db_checkouts.inc(nombre)
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metodo = scope["method"]
+        status = 500
+
+        async def send_con_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_en_curso.inc(metodo)
+        inicio = perf_counter()
+        try:
+            await self.app(scope, receive, send_con_status)
+        finally:
+            duracion = perf_counter() - inicio
+            http_en_curso.dec(metodo)
+            # El router de FastAPI deja la ruta resuelta en el scope; sin ella, no hubo match.
+            ruta = getattr(scope.get("route"), "path", None) or "sin_ruta"
+            http_duracion.observe(duracion, metodo, ruta)
+            http_requests.inc(metodo, ruta, str(status))
+
+
+class QueryCountMiddleware:
+    """Cuenta las sentencias SQL de cada request.
+
+    Con `server_timing` las informa en el header `Server-Timing` (las ejecutadas hasta
+    enviar los headers); si una misma forma se repite más de `repeticiones` veces lo
+    deja en el log como posible N+1.
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = False, repeticiones: int = 0) -> None:
+        self.app = app
+        self.server_timing = server_timing
+        self.repeticiones = repeticiones
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        inicio = perf_counter()
+        with contar() as conteo:
+
+            async def send_con_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    db = f'db;dur={conteo.segundos * 1000:.2f};desc="{conteo.sentencias} consultas"'
+                    total = f"app;dur={(perf_counter() - inicio) * 1000:.2f}"
+                    MutableHeaders(scope=message).append("Server-Timing", f"{db}, {total}")
+                await send(message)
+
+            await self.app(scope, receive, send_con_timing if self.server_timing else send)
+
+        repetidas = conteo.repetidas(self.repeticiones) if self.repeticiones else []
+        if repetidas:
+            ruta = getattr(scope.get("route"), "path", None) or scope["path"]
+            forma, veces = repetidas[0]
+            logger.warning(
+                "Posible N+1 en %s %s: %d sentencias, una repetida %d veces: %.300s",
+                scope["method"],
+                ruta,
+                conteo.sentencias,
+                veces,
+                forma,
+            )
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    # Expone rutas, códigos de estado y el pool: con `metrics_token` sólo lo lee quien tenga el token.
+    if settings.metrics_token and not hmac.compare_digest(
+        request.headers.get("authorization", "").encode(), f"Bearer {settings.metrics_token}".encode()
+    ):
+        return Response(status_code=401, headers={"WWW-Authenticate": "Bearer"})
+    return Response(registro.exponer(), media_type=CONTENT_TYPE)
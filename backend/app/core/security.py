@@ -1,22 +1,135 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from threading import Lock
+from time import monotonic, perf_counter
 from typing import Any, Dict
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.metrics import bcrypt_duracion
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt es deliberadamente lento: se ejecuta en un pool propio y acotado para no ocupar el
+# threadpool compartido ni el event loop que atienden al resto de los endpoints.
+_hash_executor = ThreadPoolExecutor(max_workers=settings.hash_max_workers, thread_name_prefix="bcrypt")
+
+
+@dataclass
+class HashMetrics:
+    verificaciones: int = 0
+    espera_total: float = 0.0
+    espera_max: float = 0.0
+    duracion_total: float = 0.0
+    _lock: Lock = field(default_factory=Lock, repr=False)
+
+    def observe(self, espera: float, duracion: float) -> None:
+        with self._lock:
+            self.verificaciones += 1
+            self.espera_total += espera
+            self.espera_max = max(self.espera_max, espera)
+            self.duracion_total += duracion
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            n = self.verificaciones or 1
+            return {
+                "verificaciones": self.verificaciones,
+                "espera_promedio": self.espera_total / n,
+                "espera_max": self.espera_max,
+                "duracion_promedio": self.duracion_total / n,
+            }
+
+
+hash_metrics = HashMetrics()
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    encolado = perf_counter()
+
+    def run() -> bool:
+        inicio = perf_counter()
+        try:
+            return pwd_context.verify(plain_password, hashed_password)
+        finally:
+            fin = perf_counter()
+            hash_metrics.observe(espera=inicio - encolado, duracion=fin - inicio)
+            bcrypt_duracion.observe(inicio - encolado, "espera")
+            bcrypt_duracion.observe(fin - inicio, "verificacion")
+
+    return await asyncio.get_running_loop().run_in_executor(_hash_executor, run)
+
+
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+@lru_cache
+def hash_ficticio() -> str:
+    """Hash contra el que se verifica cuando el usuario no existe: la respuesta tarda lo mismo."""
+    return get_password_hash("usuario-inexistente")
+
+
+@dataclass(frozen=True)
+class _Intentos:
+    fallos: int = 0
+    bloqueos: int = 0
+    hasta: float = 0.0
+
+
+class LimiteIntentos:
+    """Ingresos fallidos por clave (usuario o IP).
+
+    Al llegar a `maximo` la clave queda bloqueada `bloqueo_seconds`, el doble en cada bloqueo
+    siguiente hasta `bloqueo_max_seconds`. Con un PIN de 4 dígitos, probar las 10.000
+    combinaciones pasa a llevar semanas. Es por proceso, como el resto de las cachés.
+    """
+
+    def __init__(self, maximo: int, bloqueo_seconds: float, bloqueo_max_seconds: float = 3600) -> None:
+        self.maximo = maximo
+        self.bloqueo_seconds = bloqueo_seconds
+        self.bloqueo_max_seconds = bloqueo_max_seconds
+        self._intentos: TTLCache[str, _Intentos] = TTLCache(ttl_seconds=bloqueo_max_seconds, max_size=10_000)
+
+    def espera(self, clave: str) -> float:
+        """Segundos hasta poder reintentar; 0 si la clave no está bloqueada."""
+        intentos = self._intentos.get(clave)
+        return max(0.0, intentos.hasta - monotonic()) if intentos is not None else 0.0
+
+    def fallo(self, clave: str) -> None:
+        intentos = self._intentos.get(clave) or _Intentos()
+        if intentos.fallos + 1 < self.maximo:
+            intentos = _Intentos(intentos.fallos + 1, intentos.bloqueos, intentos.hasta)
+        else:
+            bloqueo = min(self.bloqueo_seconds * 2**intentos.bloqueos, self.bloqueo_max_seconds)
+            intentos = _Intentos(0, intentos.bloqueos + 1, monotonic() + bloqueo)
+        self._intentos.set(clave, intentos)
+
+    def exito(self, clave: str) -> None:
+        self._intentos.invalidate(clave)
+
+    def clear(self) -> None:
+        self._intentos.clear()
+
+
+intentos_usuario = LimiteIntentos(settings.login_max_failures, settings.login_lockout_seconds)
+intentos_ip = LimiteIntentos(settings.login_ip_max_failures, settings.login_lockout_seconds)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(_hash_executor, pwd_context.hash, password)
+
+
 def create_token(subject: str, expires_delta: timedelta | None = None, token_type: str = "access") -> str:
     expire = datetime.now(timezone.utc) + (
         expires_delta
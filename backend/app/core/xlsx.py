@@ -0,0 +1,115 @@
+"""Escritura de XLSX en streaming: una sola hoja, filas a medida que llegan.
+
+El libro se arma como ZIP sobre un buffer que se vacía después de cada lote, así el
+primer byte sale antes de leer la última fila y la memoria no crece con el tamaño del
+archivo (`zipfile` admite destinos sin `seek` usando descriptores de datos). Las celdas
+son números o texto en línea; no hace falta tabla de strings compartidos ni estilos.
+"""
+import re
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, AsyncIterator, List, Sequence
+from xml.sax.saxutils import escape
+
+_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml"
+ ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+<Override PartName="/xl/worksheets/sheet1.xml"
+ ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>
+</Types>"""
+
+_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Target="xl/workbook.xml"
+ Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>
+</Relationships>"""
+
+_WORKBOOK = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+ xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+<sheets><sheet name="{hoja}" sheetId="1" r:id="rId1"/></sheets>
+</workbook>"""
+
+_WORKBOOK_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Target="worksheets/sheet1.xml"
+ Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>
+</Relationships>"""
+
+_HOJA_INICIO = (
+    b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_HOJA_FIN = b"</sheetData></worksheet>"
+
+# Caracteres de control que XML 1.0 no admite ni escapados.
+_INVALIDOS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+class _Salida:
+    """Destino de sólo escritura para `ZipFile`; acumula hasta que se lo vacía."""
+
+    def __init__(self) -> None:
+        self._partes: List[bytes] = []
+
+    def write(self, datos: bytes) -> int:
+        self._partes.append(bytes(datos))
+        return len(datos)
+
+    def flush(self) -> None:
+        pass
+
+    def vaciar(self) -> bytes:
+        datos = b"".join(self._partes)
+        self._partes.clear()
+        return datos
+
+
+def texto(valor: Any) -> str:
+    """Representación en texto compartida con la exportación CSV."""
+    if valor is None:
+        return ""
+    if isinstance(valor, Enum):
+        return str(valor.value)
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    return str(valor)
+
+
+def _celda(valor: Any) -> str:
+    if valor is None:
+        return "<c/>"
+    if isinstance(valor, (int, float, Decimal)) and not isinstance(valor, bool):
+        return f"<c><v>{valor}</v></c>"
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{escape(_INVALIDOS.sub("", texto(valor)))}</t></is></c>'
+
+
+def _fila(valores: Sequence[Any]) -> bytes:
+    return ("<row>" + "".join(_celda(v) for v in valores) + "</row>").encode()
+
+
+async def xlsx_stream(
+    hoja: str, encabezados: Sequence[str], lotes: AsyncIterator[Sequence[Sequence[Any]]]
+) -> AsyncIterator[bytes]:
+    """Genera el archivo por partes: un fragmento comprimido por cada lote de filas."""
+    salida = _Salida()
+    with zipfile.ZipFile(salida, "w", compression=zipfile.ZIP_DEFLATED) as libro:
+        libro.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        libro.writestr("_rels/.rels", _RELS)
+        libro.writestr("xl/workbook.xml", _WORKBOOK.format(hoja=escape(hoja[:31])))
+        libro.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        with libro.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as datos:
+            datos.write(_HOJA_INICIO)
+            datos.write(_fila(encabezados))
+            async for lote in lotes:
+                datos.write(b"".join(_fila(fila) for fila in lote))
+                fragmento = salida.vaciar()
+                if fragmento:
+                    yield fragmento
+            datos.write(_HOJA_FIN)
+    yield salida.vaciar()
@@ -0,0 +1,83 @@
+"""Conteo de sentencias SQL por request (o por bloque) con eventos del engine.
+
+`contar()` abre un `ConteoSQL` en una ContextVar; los listeners de los engines suman en el
+conteo activo cada sentencia, su duración y su forma. Sin conteo activo el costo es leer
+la ContextVar. La variable se propaga a los greenlets del engine async y a los hilos del
+threadpool de FastAPI, así un conteo abierto en el middleware ve todo lo que ejecuta el
+request.
+
+La forma de una sentencia es su texto con los parámetros unificados y las listas de
+`IN (...)` colapsadas: la misma consulta repetida con otros valores (un N+1) comparte
+forma aunque cambie la cantidad de elementos.
+"""
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_PARAMETRO = re.compile(r"\?|%\(\w+\)s|%s|\$\d+")
+_LISTA = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_ESPACIOS = re.compile(r"\s+")
+
+
+def forma(statement: str) -> str:
+    texto = _PARAMETRO.sub("?", statement)
+    return _ESPACIOS.sub(" ", _LISTA.sub("(?)", texto)).strip()
+
+
+@dataclass
+class ConteoSQL:
+    sentencias: int = 0
+    segundos: float = 0.0
+    formas: Counter = field(default_factory=Counter)
+
+    def registrar(self, statement: str, segundos: float) -> None:
+        self.sentencias += 1
+        self.segundos += segundos
+        self.formas[forma(statement)] += 1
+
+    def repetidas(self, limite: int) -> List[Tuple[str, int]]:
+        """Formas ejecutadas más de `limite` veces, de la más repetida a la menos."""
+        return [(f, n) for f, n in self.formas.most_common() if n > limite]
+
+    def resumen(self) -> str:
+        return "\n".join(f"{n:>4} x {f}" for f, n in self.formas.most_common())
+
+
+_actual: ContextVar[Optional[ConteoSQL]] = ContextVar("conteo_sql", default=None)
+
+
+@contextmanager
+def contar() -> Iterator[ConteoSQL]:
+    conteo = ConteoSQL()
+    token = _actual.set(conteo)
+    try:
+        yield conteo
+    finally:
+        _actual.reset(token)
+
+
+def _antes(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None and _actual.get() is not None:
+        context.conteo_sql_inicio = perf_counter()
+
+
+def _despues(conn, cursor, statement, parameters, context, executemany) -> None:
+    conteo = _actual.get()
+    if conteo is not None:
+        inicio = getattr(context, "conteo_sql_inicio", None)
+        conteo.registrar(statement, perf_counter() - inicio if inicio is not None else 0.0)
+
+
+def instrumentar(engine: Engine) -> None:
+    """Registra los listeners de conteo en el engine (para uno async, su `sync_engine`); idempotente."""
+    if event.contains(engine, "before_cursor_execute", _antes):
+        return
+    event.listen(engine, "before_cursor_execute", _antes)
+    event.listen(engine, "after_cursor_execute", _despues)
@@ -2,13 +2,24 @@ from contextlib import contextmanager
 from typing import Generator
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
+from app.db.profiling import instrumentar
 
+# Motor síncrono: migraciones, seed y tareas en segundo plano.
 engine = create_engine(settings.sync_database_url, pool_pre_ping=True, future=True)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=Session)
 
+# Motor asíncrono: rutas de la API.
+async_engine = create_async_engine(settings.database_url, pool_pre_ping=True)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False, class_=AsyncSession)
+
+# Conteo de sentencias por request y por bloque de test (ver `app.db.profiling`).
+instrumentar(engine)
+instrumentar(async_engine.sync_engine)
+
 
 @contextmanager
 def session_scope() -> Generator[Session, None, None]:
@@ -0,0 +1,36 @@
+"""INSERT ... ON CONFLICT DO UPDATE que acumula sobre la fila existente, por dialecto."""
+from typing import Any, Mapping, Sequence
+
+from sqlalchemy import Select, Table
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.sql.dml import Insert
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _insert(dialect: str):
+    try:
+        return _INSERTS[dialect]
+    except KeyError as exc:
+        raise NotImplementedError(f"Upsert no soportado para {dialect}") from exc
+
+
+def _sumando(stmt, table: Table, columnas: Sequence[str], claves: Sequence[str]) -> Insert:
+    return stmt.on_conflict_do_update(
+        index_elements=list(claves),
+        set_={c: table.c[c] + stmt.excluded[c] for c in columnas if c not in claves},
+    )
+
+
+def insertar_sumando(dialect: str, table: Table, select_stmt: Select, claves: Sequence[str]) -> Insert:
+    """Inserta el resultado de `select_stmt`; si la clave ya existe suma las demás columnas.
+
+    Las columnas del SELECT deben estar etiquetadas con los nombres de `table`.
+    """
+    columnas = [c.name for c in select_stmt.selected_columns]
+    return _sumando(_insert(dialect)(table).from_select(columnas, select_stmt), table, columnas, claves)
+
+
+def sumar_fila(dialect: str, table: Table, fila: Mapping[str, Any], claves: Sequence[str]) -> Insert:
+    """Como `insertar_sumando` pero para una única fila de valores."""
+    return _sumando(_insert(dialect)(table).values(**fila), table, list(fila), claves)
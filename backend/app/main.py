@@ -1,8 +1,16 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.api.router import api_router
 from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, QueryCountMiddleware, instrumentar_engine, metrics_endpoint
+from app.db.session import async_engine, engine
+from app.services.errors import ServiceError
+
+
+async def service_error_handler(request: Request, exc: ServiceError) -> JSONResponse:
+    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
 
 
 def create_app() -> FastAPI:
@@ -17,6 +25,19 @@ def create_app() -> FastAPI:
             allow_credentials=True,
         )
 
+    if settings.debug or settings.sql_repeat_warning:
+        app.add_middleware(
+            QueryCountMiddleware, server_timing=settings.debug, repeticiones=settings.sql_repeat_warning
+        )
+
+    if settings.metrics_enabled:
+        # Último en agregarse, queda por fuera de CORS y mide el request completo.
+        app.add_middleware(MetricsMiddleware)
+        app.add_api_route("/metrics", metrics_endpoint, include_in_schema=False)
+        instrumentar_engine("sync", engine)
+        instrumentar_engine("async", async_engine.sync_engine)
+
+    app.add_exception_handler(ServiceError, service_error_handler)
     app.include_router(api_router, prefix="/api")
     return app
 
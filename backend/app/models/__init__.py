@@ -1 +1,4 @@
 from app.models.models import *  # noqa: F401,F403
+from app.models import search  # noqa: F401,E402
+from app.models import stock  # noqa: F401,E402
+from app.models import categorias  # noqa: F401,E402
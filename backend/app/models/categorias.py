@@ -0,0 +1,65 @@
+"""Mantenimiento de `categorias_productos_arbol` (clausura del árbol de categorías).
+
+Se actualiza desde eventos del mapper de `CategoriaProducto`, así cualquier alta, cambio
+de `parent_id` o baja hecha con el ORM deja la clausura consistente en la misma
+transacción. Mover una categoría reescribe los caminos de todo su subárbol con un DELETE
+y un único INSERT ... SELECT, sin recorrer descendientes. En bases gestionadas por
+Alembic la tabla y su carga inicial las crea la migración 0011.
+"""
+from sqlalchemy import delete, event, insert, inspect, or_, select, true
+from sqlalchemy.engine import Connection
+
+from app.models.models import CategoriaArbol, CategoriaProducto
+
+arbol = CategoriaArbol.__table__
+
+
+def _enlazar(connection: Connection, categoria_id: int, parent_id: int) -> None:
+    """Agrega los caminos de cada ancestro de `parent_id` (incluido) a cada nodo del subárbol de `categoria_id`."""
+    superior, inferior = arbol.alias("superior"), arbol.alias("inferior")
+    connection.execute(
+        insert(arbol).from_select(
+            ["ancestro_id", "descendiente_id", "profundidad"],
+            select(
+                superior.c.ancestro_id,
+                inferior.c.descendiente_id,
+                superior.c.profundidad + inferior.c.profundidad + 1,
+            )
+            .select_from(superior.join(inferior, true()))
+            .where(superior.c.descendiente_id == parent_id, inferior.c.ancestro_id == categoria_id),
+        )
+    )
+
+
+def _desenlazar(connection: Connection, categoria_id: int) -> None:
+    """Borra los caminos que llegan al subárbol de `categoria_id` desde fuera de él."""
+    nodos = select(arbol.c.descendiente_id).where(arbol.c.ancestro_id == categoria_id)
+    connection.execute(delete(arbol).where(arbol.c.descendiente_id.in_(nodos), arbol.c.ancestro_id.not_in(nodos)))
+
+
+@event.listens_for(CategoriaProducto, "after_insert")
+def _alta(mapper, connection: Connection, target: CategoriaProducto) -> None:
+    connection.execute(insert(arbol).values(ancestro_id=target.id, descendiente_id=target.id, profundidad=0))
+    if target.parent_id is not None:
+        _enlazar(connection, target.id, target.parent_id)
+
+
+@event.listens_for(CategoriaProducto, "after_update")
+def _movida(mapper, connection: Connection, target: CategoriaProducto) -> None:
+    if not inspect(target).attrs.parent_id.history.has_changes():
+        return
+    _desenlazar(connection, target.id)
+    if target.parent_id is not None:
+        _enlazar(connection, target.id, target.parent_id)
+
+
+@event.listens_for(CategoriaProducto, "after_delete")
+def _baja(mapper, connection: Connection, target: CategoriaProducto) -> None:
+    connection.execute(
+        delete(arbol).where(or_(arbol.c.ancestro_id == target.id, arbol.c.descendiente_id == target.id))
+    )
+
+
+def subarbol(categoria_id: int):
+    """Ids de la categoría y todos sus descendientes, para usar en `IN (...)`."""
+    return select(CategoriaArbol.descendiente_id).where(CategoriaArbol.ancestro_id == categoria_id)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, time
 from enum import Enum
 from typing import List, Optional
 
@@ -8,14 +8,18 @@ from sqlalchemy import (
     JSON,
     Boolean,
     CheckConstraint,
+    Column,
     DateTime,
     Enum as SqlEnum,
     Float,
     ForeignKey,
+    Index,
     Numeric,
     String,
     Table,
     Text,
+    Time,
+    UniqueConstraint,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -33,8 +37,8 @@ class RoleEnum(str, Enum):
 usuario_caja_association = Table(
     "usuario_caja_association",
     Base.metadata,
-    mapped_column("usuario_id", ForeignKey("usuarios.id"), primary_key=True),
-    mapped_column("caja_id", ForeignKey("cajas.id"), primary_key=True),
+    Column("usuario_id", ForeignKey("usuarios.id"), primary_key=True),
+    Column("caja_id", ForeignKey("cajas.id"), primary_key=True),
 )
 
 
@@ -71,6 +75,7 @@ class Caja(Base, TimestampMixin):
 
 class Turno(Base, TimestampMixin):
     __tablename__ = "turnos"
+    __table_args__ = (Index("ix_turnos_caja_cerrado", "caja_id", "cerrado_at"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     caja_id: Mapped[int] = mapped_column(ForeignKey("cajas.id"))
@@ -101,6 +106,10 @@ class MovimientoOrigen(str, Enum):
 
 class MovimientoCaja(Base, TimestampMixin):
     __tablename__ = "movimientos_caja"
+    __table_args__ = (
+        Index("ix_movimientos_caja_turno", "turno_id"),
+        Index("ix_movimientos_caja_created_at", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     turno_id: Mapped[int] = mapped_column(ForeignKey("turnos.id"))
@@ -112,6 +121,19 @@ class MovimientoCaja(Base, TimestampMixin):
     turno: Mapped[Turno] = relationship(back_populates="movimientos")
 
 
+class TurnoSaldo(Base):
+    """Saldo corriente de un turno por medio de pago: esperado = inicial + ingresos - egresos."""
+
+    __tablename__ = "turno_saldos"
+
+    turno_id: Mapped[int] = mapped_column(ForeignKey("turnos.id"), primary_key=True)
+    medio: Mapped[str] = mapped_column(String(50), primary_key=True)
+    inicial: Mapped[float] = mapped_column(Numeric(12, 2), default=0)
+    ingresos: Mapped[float] = mapped_column(Numeric(12, 2), default=0)
+    egresos: Mapped[float] = mapped_column(Numeric(12, 2), default=0)
+    declarado: Mapped[Optional[float]] = mapped_column(Numeric(12, 2))
+
+
 class Cliente(Base, TimestampMixin):
     __tablename__ = "clientes"
 
@@ -152,8 +174,24 @@ class CategoriaProducto(Base, TimestampMixin):
     proveedores: Mapped[List[Proveedor]] = relationship(back_populates="categoria")
 
 
+class CategoriaArbol(Base):
+    """Clausura transitiva de `CategoriaProducto.parent_id`: un par por ancestro, incluida la propia categoría."""
+
+    __tablename__ = "categorias_productos_arbol"
+    __table_args__ = (Index("ix_categorias_productos_arbol_descendiente", "descendiente_id", "profundidad"),)
+
+    ancestro_id: Mapped[int] = mapped_column(
+        ForeignKey("categorias_productos.id", ondelete="CASCADE"), primary_key=True
+    )
+    descendiente_id: Mapped[int] = mapped_column(
+        ForeignKey("categorias_productos.id", ondelete="CASCADE"), primary_key=True
+    )
+    profundidad: Mapped[int] = mapped_column()
+
+
 class Producto(Base, TimestampMixin):
     __tablename__ = "productos"
+    __table_args__ = (Index("ix_productos_categoria", "categoria_id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     nombre: Mapped[str] = mapped_column(String(200))
@@ -172,12 +210,14 @@ class Producto(Base, TimestampMixin):
 
 class Ingrediente(Base, TimestampMixin):
     __tablename__ = "ingredientes"
+    __table_args__ = (Index("ix_ingredientes_categoria", "categoria_id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     nombre: Mapped[str] = mapped_column(String(150))
     categoria_id: Mapped[Optional[int]] = mapped_column(ForeignKey("categorias_productos.id"))
-    stock_actual: Mapped[float] = mapped_column(Float, default=0)
-    stock_minimo: Mapped[float] = mapped_column(Float, default=0)
+    # `active_history` carga el valor previo al asignar: detectar el cruce del mínimo lo necesita.
+    stock_actual: Mapped[float] = mapped_column(Float, default=0, active_history=True)
+    stock_minimo: Mapped[float] = mapped_column(Float, default=0, active_history=True)
     unidad: Mapped[str] = mapped_column(String(20))
     activo: Mapped[bool] = mapped_column(Boolean, default=True)
 
@@ -209,6 +249,7 @@ class Receta(Base, TimestampMixin):
 
 class RecetaItem(Base):
     __tablename__ = "receta_items"
+    __table_args__ = (Index("ix_receta_items_receta", "receta_id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     receta_id: Mapped[int] = mapped_column(ForeignKey("recetas.id"))
@@ -231,6 +272,7 @@ class ListaPrecio(Base, TimestampMixin):
 
 class ListaPrecioItem(Base, TimestampMixin):
     __tablename__ = "listas_precio_items"
+    __table_args__ = (Index("ix_listas_precio_items_lista_producto", "lista_id", "producto_id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     lista_id: Mapped[int] = mapped_column(ForeignKey("listas_precio.id"))
@@ -241,6 +283,45 @@ class ListaPrecioItem(Base, TimestampMixin):
     producto: Mapped[Producto] = relationship(back_populates="lista_precios")
 
 
+class ListaPrecioProgramacion(Base, TimestampMixin):
+    """Franja horaria en la que rige otra lista (happy hour). `dias` usa 0=lunes ... 6=domingo."""
+
+    __tablename__ = "listas_precio_programacion"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    lista_id: Mapped[int] = mapped_column(ForeignKey("listas_precio.id"))
+    dias: Mapped[str] = mapped_column(String(7), default="0123456")
+    hora_desde: Mapped[time] = mapped_column(Time)
+    hora_hasta: Mapped[time] = mapped_column(Time)
+    activo: Mapped[bool] = mapped_column(Boolean, default=True)
+
+    lista: Mapped[ListaPrecio] = relationship()
+
+
+class CatalogoRevision(Base):
+    """Contador de revisiones del catálogo (una sola fila).
+
+    La transacción que cambia el catálogo la bloquea hasta su commit, así las revisiones
+    crecen en el orden en que se confirman.
+    """
+
+    __tablename__ = "catalogo_revision"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    revision: Mapped[int] = mapped_column(default=0)
+
+
+class CatalogoCambio(Base):
+    """Producto o categoría tocado (o borrado) en una revisión del catálogo."""
+
+    __tablename__ = "catalogo_cambios"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    revision: Mapped[int] = mapped_column(index=True)
+    producto_id: Mapped[Optional[int]] = mapped_column()
+    categoria_id: Mapped[Optional[int]] = mapped_column()
+
+
 class VentaTipo(str, Enum):
     MESA = "mesa"
     MOSTRADOR = "mostrador"
@@ -255,6 +336,11 @@ class VentaEstado(str, Enum):
 
 class Venta(Base, TimestampMixin):
     __tablename__ = "ventas"
+    __table_args__ = (
+        Index("ix_ventas_turno", "turno_id"),
+        Index("ix_ventas_mesa_estado", "mesa_id", "estado"),
+        Index("ix_ventas_estado_cerrada", "estado", "cerrada_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     tipo: Mapped[VentaTipo] = mapped_column(SqlEnum(VentaTipo))
@@ -268,6 +354,7 @@ class Venta(Base, TimestampMixin):
     total_descuento: Mapped[float] = mapped_column(Numeric(12, 2), default=0)
     total_neto: Mapped[float] = mapped_column(Numeric(12, 2), default=0)
     propina: Mapped[float] = mapped_column(Numeric(12, 2), default=0)
+    cerrada_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
 
     cliente: Mapped[Optional[Cliente]] = relationship(back_populates="ventas")
     mozo: Mapped[Usuario] = relationship()
@@ -282,6 +369,7 @@ class Venta(Base, TimestampMixin):
 
 class VentaItem(Base, TimestampMixin):
     __tablename__ = "ventas_items"
+    __table_args__ = (Index("ix_ventas_items_venta", "venta_id"), Index("ix_ventas_items_producto", "producto_id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     venta_id: Mapped[int] = mapped_column(ForeignKey("ventas.id"))
@@ -306,6 +394,7 @@ class MedioPago(str, Enum):
 
 class Pago(Base, TimestampMixin):
     __tablename__ = "pagos"
+    __table_args__ = (Index("ix_pagos_venta", "venta_id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     venta_id: Mapped[int] = mapped_column(ForeignKey("ventas.id"))
@@ -316,6 +405,45 @@ class Pago(Base, TimestampMixin):
     venta: Mapped[Venta] = relationship(back_populates="pagos")
 
 
+class VentasHoraProducto(Base):
+    """Acumulado por hora de cierre y producto; lo mantiene `app.services.rollups`."""
+
+    __tablename__ = "ventas_hora_producto"
+
+    hora: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    producto_id: Mapped[int] = mapped_column(ForeignKey("productos.id"), primary_key=True)
+    cantidad: Mapped[float] = mapped_column(Float, default=0)
+    importe: Mapped[float] = mapped_column(Numeric(14, 2), default=0)
+
+
+class VentasHoraMedio(Base):
+    __tablename__ = "ventas_hora_medio"
+
+    hora: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    medio: Mapped[str] = mapped_column(String(20), primary_key=True)
+    pagos: Mapped[int] = mapped_column(default=0)
+    monto: Mapped[float] = mapped_column(Numeric(14, 2), default=0)
+
+
+class VentasHoraMozo(Base):
+    __tablename__ = "ventas_hora_mozo"
+
+    hora: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    mozo_id: Mapped[int] = mapped_column(ForeignKey("usuarios.id"), primary_key=True)
+    ventas: Mapped[int] = mapped_column(default=0)
+    total_neto: Mapped[float] = mapped_column(Numeric(14, 2), default=0)
+    propina: Mapped[float] = mapped_column(Numeric(14, 2), default=0)
+
+
+class VentasHoraCaja(Base):
+    __tablename__ = "ventas_hora_caja"
+
+    hora: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    caja_id: Mapped[int] = mapped_column(ForeignKey("cajas.id"), primary_key=True)
+    ventas: Mapped[int] = mapped_column(default=0)
+    total_neto: Mapped[float] = mapped_column(Numeric(14, 2), default=0)
+
+
 class DescuentoTipo(str, Enum):
     FIJO = "fijo"
     PORCENTUAL = "porcentual"
@@ -323,6 +451,7 @@ class DescuentoTipo(str, Enum):
 
 class Descuento(Base, TimestampMixin):
     __tablename__ = "descuentos"
+    __table_args__ = (Index("ix_descuentos_venta", "venta_id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     tipo: Mapped[DescuentoTipo] = mapped_column(SqlEnum(DescuentoTipo))
@@ -350,6 +479,7 @@ class Mesa(Base, TimestampMixin):
 
 class Gasto(Base, TimestampMixin):
     __tablename__ = "gastos"
+    __table_args__ = (Index("ix_gastos_fecha", "fecha"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     proveedor_id: Mapped[Optional[int]] = mapped_column(ForeignKey("proveedores.id"))
@@ -377,6 +507,10 @@ class StockMovimientoTipo(str, Enum):
 
 class StockMovimiento(Base, TimestampMixin):
     __tablename__ = "stock_movimientos"
+    __table_args__ = (
+        Index("ix_stock_movimientos_ingrediente_fecha", "ingrediente_id", "fecha"),
+        Index("ix_stock_movimientos_fecha", "fecha"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     tipo: Mapped[StockMovimientoTipo] = mapped_column(SqlEnum(StockMovimientoTipo))
@@ -391,6 +525,18 @@ class StockMovimiento(Base, TimestampMixin):
     producto: Mapped[Optional[Producto]] = relationship()
 
 
+class StockSnapshot(Base, TimestampMixin):
+    """Saldo de un ingrediente con todos los movimientos anteriores a `fecha`."""
+
+    __tablename__ = "stock_snapshots"
+    __table_args__ = (UniqueConstraint("ingrediente_id", "fecha", name="uq_stock_snapshots_ingrediente_fecha"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    ingrediente_id: Mapped[int] = mapped_column(ForeignKey("ingredientes.id"))
+    fecha: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    saldo: Mapped[float] = mapped_column(Float)
+
+
 class PedidoCocinaEstado(str, Enum):
     PENDIENTE = "pendiente"
     EN_CURSO = "en_curso"
@@ -399,12 +545,17 @@ class PedidoCocinaEstado(str, Enum):
 
 class PedidoCocina(Base, TimestampMixin):
     __tablename__ = "pedidos_cocina"
+    __table_args__ = (
+        Index("ix_pedidos_cocina_venta", "venta_id"),
+        Index("ix_pedidos_cocina_estado_created", "estado", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     venta_id: Mapped[int] = mapped_column(ForeignKey("ventas.id"))
     estado: Mapped[PedidoCocinaEstado] = mapped_column(
         SqlEnum(PedidoCocinaEstado), default=PedidoCocinaEstado.PENDIENTE
     )
+    estacion: Mapped[Optional[str]] = mapped_column(String(50))
     items: Mapped[Optional[List[dict]]] = mapped_column(JSON)
     timestamps: Mapped[Optional[dict]] = mapped_column(JSON)
 
@@ -421,6 +572,7 @@ class Config(Base, TimestampMixin):
 
 class ReporteCache(Base, TimestampMixin):
     __tablename__ = "reportes_cache"
+    __table_args__ = (Index("ix_reportes_cache_tipo_rango", "tipo", "rango_desde", "rango_hasta", unique=True),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     tipo: Mapped[str] = mapped_column(String(100))
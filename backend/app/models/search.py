@@ -0,0 +1,53 @@
+"""Índice de búsqueda de clientes.
+
+En SQLite se usa una tabla virtual FTS5 sincronizada por triggers; en PostgreSQL un
+índice GIN de trigramas sobre la misma expresión que consulta el buscador. Estos DDL
+se aplican al crear el esquema con `metadata.create_all` (tests/desarrollo); en bases
+gestionadas por Alembic los crea la migración 0002.
+"""
+from sqlalchemy import DDL, event
+
+from app.models.models import Cliente
+
+CLIENTES_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS clientes_fts USING fts5(
+        nombre, telefono, email,
+        content='clientes', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS clientes_fts_ai AFTER INSERT ON clientes BEGIN
+        INSERT INTO clientes_fts(rowid, nombre, telefono, email)
+        VALUES (new.id, new.nombre, new.telefono, new.email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS clientes_fts_ad AFTER DELETE ON clientes BEGIN
+        INSERT INTO clientes_fts(clientes_fts, rowid, nombre, telefono, email)
+        VALUES ('delete', old.id, old.nombre, old.telefono, old.email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS clientes_fts_au AFTER UPDATE OF nombre, telefono, email ON clientes BEGIN
+        INSERT INTO clientes_fts(clientes_fts, rowid, nombre, telefono, email)
+        VALUES ('delete', old.id, old.nombre, old.telefono, old.email);
+        INSERT INTO clientes_fts(rowid, nombre, telefono, email)
+        VALUES (new.id, new.nombre, new.telefono, new.email);
+    END
+    """,
+]
+
+CLIENTES_TRGM_EXPR = "lower(nombre || ' ' || coalesce(telefono, '') || ' ' || coalesce(email, ''))"
+
+CLIENTES_TRGM_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX IF NOT EXISTS ix_clientes_busqueda_trgm ON clientes USING gin (({CLIENTES_TRGM_EXPR}) gin_trgm_ops)",
+]
+
+for statement in CLIENTES_FTS_DDL:
+    event.listen(Cliente.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(Cliente.__table__, "before_drop", DDL("DROP TABLE IF EXISTS clientes_fts").execute_if(dialect="sqlite"))
+
+for statement in CLIENTES_TRGM_DDL:
+    event.listen(Cliente.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
@@ -0,0 +1,56 @@
+"""Conjunto de ingredientes bajo stock mínimo.
+
+En SQLite lo mantiene la tabla `ingredientes_bajo_stock` mediante triggers sobre
+`ingredientes`; en PostgreSQL un índice parcial con el mismo predicado. En ambos casos
+consultar los faltantes no recorre la tabla completa. Como en `search`, estos DDL se
+aplican con `metadata.create_all`; en bases gestionadas por Alembic los crea la
+migración 0006.
+"""
+from sqlalchemy import DDL, column, event, table
+
+from app.models.models import Ingrediente
+
+BAJO_MINIMO = "activo AND stock_actual < stock_minimo"
+
+ingredientes_bajo_stock = table("ingredientes_bajo_stock", column("ingrediente_id"))
+
+BAJO_STOCK_SQLITE_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS ingredientes_bajo_stock (
+        ingrediente_id INTEGER PRIMARY KEY REFERENCES ingredientes(id)
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS ingredientes_bajo_stock_ai AFTER INSERT ON ingredientes
+    WHEN new.activo AND new.stock_actual < new.stock_minimo BEGIN
+        INSERT OR IGNORE INTO ingredientes_bajo_stock(ingrediente_id) VALUES (new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS ingredientes_bajo_stock_au AFTER UPDATE OF stock_actual, stock_minimo, activo
+    ON ingredientes BEGIN
+        DELETE FROM ingredientes_bajo_stock
+        WHERE ingrediente_id = old.id AND NOT (new.activo AND new.stock_actual < new.stock_minimo);
+        INSERT OR IGNORE INTO ingredientes_bajo_stock(ingrediente_id)
+        SELECT new.id WHERE new.activo AND new.stock_actual < new.stock_minimo;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS ingredientes_bajo_stock_ad AFTER DELETE ON ingredientes BEGIN
+        DELETE FROM ingredientes_bajo_stock WHERE ingrediente_id = old.id;
+    END
+    """,
+]
+
+BAJO_STOCK_PG_DDL = [f"CREATE INDEX IF NOT EXISTS ix_ingredientes_bajo_minimo ON ingredientes (id) WHERE {BAJO_MINIMO}"]
+
+for statement in BAJO_STOCK_SQLITE_DDL:
+    event.listen(Ingrediente.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(
+    Ingrediente.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS ingredientes_bajo_stock").execute_if(dialect="sqlite"),
+)
+
+for statement in BAJO_STOCK_PG_DDL:
+    event.listen(Ingrediente.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
@@ -21,6 +21,11 @@ class LoginRequest(BaseModel):
     password: str = Field(..., examples=["secreto"])
 
 
+class PinLoginRequest(BaseModel):
+    username: str = Field(..., examples=["mozo1"])
+    pin: str = Field(..., min_length=4, max_length=6, examples=["1234"])
+
+
 class RefreshRequest(BaseModel):
     refresh_token: str
 
@@ -0,0 +1,73 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.schemas.common import ORMModel
+
+
+class TurnoCreate(BaseModel):
+    caja_id: int
+    saldo_inicial: Decimal = Field(default=Decimal("0"), ge=0, description="Efectivo en el cajón al abrir")
+    arqueo_ciego: bool = False
+
+
+class TurnoPublic(ORMModel):
+    id: int
+    caja_id: int
+    usuario_id: int
+    abierto_at: datetime
+    cerrado_at: Optional[datetime] = None
+    arqueo_ciego: bool
+    saldo_inicial: Decimal
+    saldo_final: Optional[Decimal] = None
+    observaciones: Optional[str] = None
+
+
+class MovimientoCajaIn(BaseModel):
+    tipo: str = Field(..., examples=["ingreso", "egreso"])
+    origen: str = Field(default="manual", examples=["manual", "gasto"])
+    monto: Decimal = Field(..., gt=0)
+    medio_pago: str = Field(default="efectivo", examples=["efectivo", "mp_qr"])
+    descripcion: Optional[str] = None
+
+
+class MovimientoCajaPublic(ORMModel):
+    id: int
+    turno_id: int
+    tipo: str
+    origen: str
+    monto: Decimal
+    medio_pago: str
+    descripcion: Optional[str] = None
+
+
+class SaldoMedio(ORMModel):
+    medio: str
+    inicial: Decimal
+    ingresos: Decimal
+    egresos: Decimal
+    esperado: Decimal
+    declarado: Optional[Decimal] = None
+    diferencia: Optional[Decimal] = None
+
+
+class TurnoSaldoPublic(BaseModel):
+    turno_id: int
+    abierto: bool
+    medios: List[SaldoMedio]
+    esperado_total: Decimal
+
+
+class TurnoCierre(BaseModel):
+    declarado: Dict[str, Decimal] = Field(
+        default_factory=dict, description="Monto contado por medio de pago; obligatorio con arqueo ciego"
+    )
+    observaciones: Optional[str] = None
+
+
+class ArqueoResultado(BaseModel):
+    turno: TurnoPublic
+    medios: List[SaldoMedio]
+    diferencia_total: Decimal
@@ -0,0 +1,41 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from app.schemas.common import ORMModel
+
+
+class CategoriaCreate(BaseModel):
+    nombre: str
+    parent_id: Optional[int] = None
+
+
+class CategoriaMover(BaseModel):
+    parent_id: Optional[int] = None
+
+
+class CategoriaPublic(ORMModel):
+    id: int
+    nombre: str
+    parent_id: Optional[int]
+
+
+class CategoriaNodo(ORMModel):
+    id: int
+    nombre: str
+    parent_id: Optional[int]
+    profundidad: int
+
+
+class CategoriaMiembro(ORMModel):
+    id: int
+    nombre: str
+    categoria_id: int
+    profundidad: int
+
+
+class CategoriaSubarbol(ORMModel):
+    categoria_id: int
+    categorias: List[CategoriaNodo]
+    productos: List[CategoriaMiembro]
+    ingredientes: List[CategoriaMiembro]
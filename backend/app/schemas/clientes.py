@@ -1,5 +1,6 @@
+from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -32,3 +33,21 @@ class ClientePublic(ORMModel):
     email: Optional[str]
     descuento_pct: Optional[float]
     cta_corriente_saldo: Decimal
+
+
+class ImportRechazo(BaseModel):
+    fila: int
+    motivo: str
+
+
+class ImportJobPublic(ORMModel):
+    id: str
+    archivo: str
+    estado: str
+    procesadas: int
+    insertadas: int
+    rechazadas_total: int
+    rechazadas: List[ImportRechazo]
+    error: Optional[str] = None
+    creado_at: datetime
+    finalizado_at: Optional[datetime] = None
@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.schemas.common import ORMModel
+
+
+class PedidoCocinaCreate(BaseModel):
+    venta_id: int
+    estacion: Optional[str] = Field(default=None, examples=["cocina", "barra"])
+    items: List[dict] = Field(default_factory=list)
+
+
+class PedidoEstadoUpdate(BaseModel):
+    estado: str = Field(..., examples=["en_curso", "listo"])
+
+
+class PedidoCocinaPublic(ORMModel):
+    id: int
+    venta_id: int
+    estado: str
+    estacion: Optional[str] = None
+    items: Optional[List[dict]] = None
+    timestamps: Optional[dict] = None
+    created_at: Optional[datetime] = None
+
+
+class TableroCocina(BaseModel):
+    ultimo_evento_id: int
+    pedidos: List[PedidoCocinaPublic]
@@ -1,23 +1,22 @@
 from datetime import datetime
 from typing import Generic, List, Optional, TypeVar
 
-from pydantic import BaseModel
-from pydantic.generics import GenericModel
+from pydantic import BaseModel, ConfigDict
 
 
 T = TypeVar("T")
 
 
 class ORMModel(BaseModel):
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
-class Paginated(Generic[T], GenericModel):
+class Paginated(BaseModel, Generic[T]):
     items: List[T]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     size: int
+    next_cursor: Optional[str] = None
 
 
 class AuditInfo(BaseModel):
@@ -0,0 +1,16 @@
+from typing import Any, Dict
+
+from pydantic import BaseModel, Field
+
+
+class ConfigUpdate(BaseModel):
+    valor: str = Field(..., description="Valor en texto; si la clave es un campo de Settings se valida con su tipo")
+
+
+class ConfigPublic(BaseModel):
+    clave: str
+    valor: Any
+
+
+class ConfigValores(BaseModel):
+    valores: Dict[str, Any]
@@ -0,0 +1,41 @@
+from datetime import datetime, time
+from decimal import Decimal
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+from app.schemas.common import ORMModel
+
+
+class ProgramacionCreate(BaseModel):
+    lista_id: int
+    dias: List[int] = Field(default_factory=lambda: list(range(7)), description="0=lunes ... 6=domingo")
+    hora_desde: time
+    hora_hasta: time
+
+    @field_validator("dias")
+    @classmethod
+    def validar_dias(cls, dias: List[int]) -> List[int]:
+        if not dias or any(d < 0 or d > 6 for d in dias):
+            raise ValueError("Los días van de 0 (lunes) a 6 (domingo)")
+        return sorted(set(dias))
+
+
+class ProgramacionPublic(ORMModel):
+    id: int
+    lista_id: int
+    dias: str
+    hora_desde: time
+    hora_hasta: time
+    activo: bool
+
+
+class PrecioResuelto(BaseModel):
+    producto_id: int
+    precio: Decimal
+
+
+class PreciosVigentes(BaseModel):
+    momento: datetime
+    lista_id: Optional[int] = None
+    precios: List[PrecioResuelto]
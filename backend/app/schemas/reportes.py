@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Any, Dict, List
+
+from pydantic import BaseModel
+
+
+class ReportePublic(BaseModel):
+    tipo: str
+    desde: datetime
+    hasta: datetime
+    generado_at: datetime
+    cacheado: bool
+    datos: Dict[str, Any]
+
+
+class RollupSerie(BaseModel):
+    dimension: str
+    granularidad: str
+    filas: List[Dict[str, Any]]
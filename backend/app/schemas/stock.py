@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import List
+
+from pydantic import BaseModel
+
+from app.schemas.common import ORMModel
+
+
+class StockSaldo(BaseModel):
+    ingrediente_id: int
+    stock: float
+
+
+class StockAFecha(BaseModel):
+    momento: datetime
+    saldos: List[StockSaldo]
+
+
+class StockDiscrepancia(ORMModel):
+    ingrediente_id: int
+    nombre: str
+    stock_actual: float
+    stock_libro: float
+    diferencia: float
+
+
+class IngredienteStock(ORMModel):
+    id: int
+    nombre: str
+    unidad: str
+    stock_actual: float
+    stock_minimo: float
+
+
+class BajoMinimo(BaseModel):
+    ultimo_evento_id: int
+    ingredientes: List[IngredienteStock]
@@ -0,0 +1,96 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.schemas.common import ORMModel
+
+
+class VentaCreate(BaseModel):
+    tipo: str = Field(..., examples=["mesa", "mostrador", "online"])
+    mesa_id: Optional[int] = None
+    cliente_id: Optional[int] = None
+    caja_id: Optional[int] = None
+    turno_id: Optional[int] = None
+
+
+class VentaItemIn(BaseModel):
+    producto_id: int
+    cantidad: Decimal = Field(default=Decimal("1"), gt=0)
+    precio_unitario: Optional[Decimal] = Field(default=None, ge=0, description="Por defecto, el precio vigente")
+    modificadores: Optional[List[dict]] = None
+
+
+class VentaItemsCambio(BaseModel):
+    agregar: List[VentaItemIn] = Field(default_factory=list)
+    quitar: List[int] = Field(default_factory=list, description="IDs de ítems a eliminar")
+
+
+class DescuentoIn(BaseModel):
+    tipo: str = Field(..., examples=["fijo", "porcentual"])
+    valor: Decimal = Field(..., gt=0)
+    motivo: Optional[str] = None
+
+
+class PagoIn(BaseModel):
+    medio: str = Field(..., examples=["efectivo", "mp_qr", "debito"])
+    monto: Decimal = Field(..., gt=0)
+    propina: Decimal = Field(default=Decimal("0"), ge=0)
+    referencia: Optional[str] = None
+
+
+class VentaItemPublic(ORMModel):
+    id: int
+    producto_id: int
+    cantidad: float
+    precio_unitario: Decimal
+    modificadores: Optional[List[dict]] = None
+
+
+class DescuentoPublic(ORMModel):
+    id: int
+    tipo: str
+    valor: float
+    motivo: Optional[str] = None
+
+
+class PagoPublic(ORMModel):
+    id: int
+    medio: str
+    monto: Decimal
+    referencia: Optional[str] = None
+
+
+class VentaPublic(ORMModel):
+    id: int
+    tipo: str
+    estado: str
+    mesa_id: Optional[int] = None
+    cliente_id: Optional[int] = None
+    mozo_id: int
+    caja_id: Optional[int] = None
+    turno_id: Optional[int] = None
+    total_bruto: Decimal
+    total_descuento: Decimal
+    total_neto: Decimal
+    propina: Decimal
+    cerrada_at: Optional[datetime] = None
+
+
+class VentaDetalle(VentaPublic):
+    items: List[VentaItemPublic] = Field(default_factory=list)
+    descuentos: List[DescuentoPublic] = Field(default_factory=list)
+    pagos: List[PagoPublic] = Field(default_factory=list)
+
+
+class VentaItemsResultado(BaseModel):
+    venta: VentaPublic
+    agregados: List[VentaItemPublic]
+    quitados: List[int]
+
+
+class PagoResultado(BaseModel):
+    venta: VentaPublic
+    pago: PagoPublic
+    vuelto: Decimal = Decimal("0")
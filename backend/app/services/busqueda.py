@@ -0,0 +1,57 @@
+"""Búsqueda de clientes por nombre, teléfono o email sobre el índice de cada motor."""
+import re
+from typing import List
+
+from sqlalchemy import func, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import Cliente
+from app.models.search import CLIENTES_TRGM_EXPR
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def _fts_query(q: str) -> str:
+    # Cada término se busca por prefijo y todos deben aparecer ("ana 11" -> "ana"* "11"*).
+    return " ".join(f'"{token}"*' for token in _TOKEN.findall(q))
+
+
+async def buscar_clientes(db: AsyncSession, q: str, limit: int = 20) -> List[Cliente]:
+    terminos = _TOKEN.findall(q.lower())
+    if not terminos:
+        return []
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        stmt = select(Cliente).from_statement(
+            text(
+                "SELECT clientes.* FROM clientes_fts JOIN clientes ON clientes.id = clientes_fts.rowid "
+                "WHERE clientes_fts MATCH :q ORDER BY clientes_fts.rank LIMIT :limit"
+            )
+        )
+        result = await db.scalars(stmt, {"q": _fts_query(q), "limit": limit})
+        return list(result)
+
+    if dialect == "postgresql":
+        expr = text(CLIENTES_TRGM_EXPR)
+        stmt = (
+            select(Cliente)
+            .where(*(expr.op("LIKE")(f"%{termino}%") for termino in terminos))
+            .order_by(func.similarity(expr, q.lower()).desc(), Cliente.id)
+            .limit(limit)
+        )
+        return list(await db.scalars(stmt))
+
+    patrones = [f"%{termino}%" for termino in terminos]
+    stmt = (
+        select(Cliente)
+        .where(
+            *(
+                or_(Cliente.nombre.ilike(p), Cliente.telefono.ilike(p), Cliente.email.ilike(p))
+                for p in patrones
+            )
+        )
+        .order_by(Cliente.nombre, Cliente.id)
+        .limit(limit)
+    )
+    return list(await db.scalars(stmt))
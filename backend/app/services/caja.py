@@ -0,0 +1,174 @@
+"""Turnos de caja con saldo corriente por medio de pago.
+
+Cada movimiento de caja y cada pago de una venta del turno suma su monto a la fila
+(turno, medio) de `turno_saldos` con un upsert, así el saldo esperado se lee sin
+recorrer los movimientos y el cierre sólo compara esas filas con lo declarado.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, List, Mapping, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.upsert import sumar_fila
+from app.models.models import MovimientoCaja, MovimientoOrigen, MovimientoTipo, Turno, TurnoSaldo
+from app.schemas.caja import MovimientoCajaIn, TurnoCierre, TurnoCreate
+from app.services.errors import ConflictError, NotFoundError, ServiceError
+
+EFECTIVO = "efectivo"
+CENTAVO = Decimal("0.01")
+
+
+def _money(value) -> Decimal:
+    return Decimal(str(value or 0)).quantize(CENTAVO)
+
+
+def _medio(medio: str) -> str:
+    return medio.strip().lower()
+
+
+@dataclass(frozen=True)
+class Saldo:
+    medio: str
+    inicial: Decimal
+    ingresos: Decimal
+    egresos: Decimal
+    declarado: Optional[Decimal] = None
+
+    @property
+    def esperado(self) -> Decimal:
+        return self.inicial + self.ingresos - self.egresos
+
+    @property
+    def diferencia(self) -> Optional[Decimal]:
+        return None if self.declarado is None else self.declarado - self.esperado
+
+
+async def obtener_turno(db: AsyncSession, turno_id: int, *, bloquear: bool = False) -> Turno:
+    stmt = select(Turno).where(Turno.id == turno_id)
+    if bloquear:
+        stmt = stmt.with_for_update()
+    turno = await db.scalar(stmt)
+    if turno is None:
+        raise NotFoundError("Turno no encontrado")
+    return turno
+
+
+def _exigir_abierto(turno: Turno) -> None:
+    if turno.cerrado_at is not None:
+        raise ConflictError("El turno está cerrado")
+
+
+async def _sumar(
+    db: AsyncSession, turno_id: int, medio: str, *, inicial=0, ingresos=0, egresos=0
+) -> None:
+    fila = {
+        "turno_id": turno_id,
+        "medio": _medio(medio),
+        "inicial": _money(inicial),
+        "ingresos": _money(ingresos),
+        "egresos": _money(egresos),
+    }
+    await db.execute(sumar_fila(db.get_bind().dialect.name, TurnoSaldo.__table__, fila, ["turno_id", "medio"]))
+
+
+async def abrir_turno(db: AsyncSession, data: TurnoCreate, usuario_id: int) -> Turno:
+    abierto = await db.scalar(
+        select(Turno.id).where(Turno.caja_id == data.caja_id, Turno.cerrado_at.is_(None)).limit(1)
+    )
+    if abierto is not None:
+        raise ConflictError(f"La caja ya tiene abierto el turno {abierto}")
+    turno = Turno(
+        caja_id=data.caja_id,
+        usuario_id=usuario_id,
+        abierto_at=datetime.now(timezone.utc),
+        arqueo_ciego=data.arqueo_ciego,
+        saldo_inicial=_money(data.saldo_inicial),
+    )
+    db.add(turno)
+    await db.flush()
+    await _sumar(db, turno.id, EFECTIVO, inicial=turno.saldo_inicial)
+    return turno
+
+
+async def registrar_movimiento(db: AsyncSession, turno: Turno, data: MovimientoCajaIn) -> MovimientoCaja:
+    _exigir_abierto(turno)
+    try:
+        tipo = MovimientoTipo(data.tipo)
+        origen = MovimientoOrigen(data.origen)
+    except ValueError as exc:
+        raise ServiceError("Tipo u origen de movimiento inválido") from exc
+    if origen == MovimientoOrigen.VENTA:
+        raise ServiceError("Los cobros de ventas se registran como pagos de la venta")
+
+    movimiento = MovimientoCaja(
+        turno_id=turno.id,
+        tipo=tipo,
+        origen=origen,
+        monto=_money(data.monto),
+        medio_pago=_medio(data.medio_pago),
+        descripcion=data.descripcion,
+    )
+    db.add(movimiento)
+    await db.flush()
+    if tipo == MovimientoTipo.INGRESO:
+        await _sumar(db, turno.id, movimiento.medio_pago, ingresos=movimiento.monto)
+    else:
+        await _sumar(db, turno.id, movimiento.medio_pago, egresos=movimiento.monto)
+    return movimiento
+
+
+async def registrar_cobro(db: AsyncSession, turno_id: int, medio: str, monto) -> None:
+    """Suma el pago de una venta al saldo de su turno."""
+    turno = await obtener_turno(db, turno_id)
+    _exigir_abierto(turno)
+    await _sumar(db, turno_id, medio, ingresos=monto)
+
+
+async def saldos(db: AsyncSession, turno_id: int) -> List[Saldo]:
+    rows = await db.scalars(select(TurnoSaldo).where(TurnoSaldo.turno_id == turno_id).order_by(TurnoSaldo.medio))
+    return [
+        Saldo(
+            medio=r.medio,
+            inicial=_money(r.inicial),
+            ingresos=_money(r.ingresos),
+            egresos=_money(r.egresos),
+            declarado=None if r.declarado is None else _money(r.declarado),
+        )
+        for r in rows
+    ]
+
+
+async def cerrar_turno(db: AsyncSession, turno: Turno, data: TurnoCierre) -> List[Saldo]:
+    """Cierra el turno contra los saldos ya acumulados.
+
+    Con arqueo ciego el cajero debe declarar lo contado; sin él, un medio no declarado
+    se da por igual al esperado.
+    """
+    _exigir_abierto(turno)
+    if turno.arqueo_ciego and not data.declarado:
+        raise ServiceError("El arqueo ciego requiere declarar los montos contados")
+
+    declarado: Mapping[str, Decimal] = {_medio(m): _money(v) for m, v in data.declarado.items()}
+    filas: Dict[str, TurnoSaldo] = {
+        r.medio: r for r in await db.scalars(select(TurnoSaldo).where(TurnoSaldo.turno_id == turno.id))
+    }
+    for medio in declarado.keys() - filas.keys():
+        filas[medio] = TurnoSaldo(turno_id=turno.id, medio=medio, inicial=0, ingresos=0, egresos=0)
+        db.add(filas[medio])
+    for medio, fila in filas.items():
+        esperado = _money(fila.inicial) + _money(fila.ingresos) - _money(fila.egresos)
+        if medio in declarado:
+            fila.declarado = declarado[medio]
+        elif turno.arqueo_ciego:
+            fila.declarado = Decimal("0")
+        else:
+            fila.declarado = esperado
+
+    turno.cerrado_at = datetime.now(timezone.utc)
+    turno.saldo_final = _money(filas[EFECTIVO].declarado) if EFECTIVO in filas else Decimal("0")
+    turno.observaciones = data.observaciones or turno.observaciones
+    await db.flush()
+    return await saldos(db, turno.id)
@@ -0,0 +1,276 @@
+"""Catálogo para las tablets de los mozos: snapshot precalculado y deltas por versión.
+
+El snapshot completo (categorías y productos activos con su precio vigente) se arma una
+vez, se serializa y comprime, y se sirve igual a todas las tablets hasta que cambia algo
+del catálogo o la lista de precios que rige. La versión combina la revisión del catálogo
+con la lista vigente; `?since=version` devuelve sólo los productos y categorías
+registrados en `catalogo_cambios` después de esa revisión (altas, cambios y bajas, también
+de ítems de lista) más los ids vigentes, para que la tablet descarte lo que ya no está.
+
+La revisión es un contador en la base que cada transacción que toca el catálogo sube una
+vez, bloqueando su fila hasta el commit: crece en orden de confirmación, algo que
+`updated_at` (hora de inicio de la transacción en PostgreSQL) no garantiza. Si la versión
+pedida no se puede comparar (otra lista vigente o una revisión que la base no conoce) se
+responde el snapshot completo.
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from time import monotonic
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from sqlalchemy import event, insert, inspect, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.models import (
+    CatalogoCambio,
+    CatalogoRevision,
+    CategoriaProducto,
+    ListaPrecio,
+    ListaPrecioItem,
+    ListaPrecioProgramacion,
+    Producto,
+)
+from app.services.errors import ServiceError
+from app.services.precios import TablaPrecios, price_resolver
+
+_MODELOS_CATALOGO = (CategoriaProducto, Producto, ListaPrecio, ListaPrecioItem, ListaPrecioProgramacion)
+_COLUMNAS_CATEGORIA = (CategoriaProducto.id, CategoriaProducto.nombre, CategoriaProducto.parent_id)
+_COLUMNAS_PRODUCTO = (
+    Producto.id,
+    Producto.nombre,
+    Producto.sku,
+    Producto.categoria_id,
+    Producto.precio_lista,
+    Producto.favoritos,
+    Producto.activo,
+)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    version: str
+    revision: int
+    etag: str
+    cuerpo: bytes
+    comprimido: bytes
+    lista_id: Optional[int]
+    armado_at: float
+
+
+def formatear_version(revision: int, lista_id: Optional[int]) -> str:
+    return f"{revision}.{lista_id or 0}"
+
+
+def parsear_version(version: str) -> Tuple[int, Optional[int]]:
+    try:
+        revision, lista = version.split(".", 1)
+        return int(revision), int(lista) or None
+    except ValueError as exc:
+        raise ServiceError("Versión de catálogo inválida") from exc
+
+
+async def _revision(db: AsyncSession) -> int:
+    return await db.scalar(select(CatalogoRevision.revision).where(CatalogoRevision.id == 1)) or 0
+
+
+def _producto(p: Any, tabla: TablaPrecios, lista: Mapping[int, Any]) -> Dict[str, Any]:
+    precio = lista.get(p.id, tabla.base.get(p.id, p.precio_lista))
+    return {
+        "id": p.id,
+        "nombre": p.nombre,
+        "sku": p.sku,
+        "categoria_id": p.categoria_id,
+        "precio": str(precio),
+        "favoritos": p.favoritos,
+        "activo": p.activo,
+    }
+
+
+def _categoria(c: Any) -> Dict[str, Any]:
+    return {"id": c.id, "nombre": c.nombre, "parent_id": c.parent_id}
+
+
+def _serializar(payload: Dict[str, Any]) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+async def _armar(db: AsyncSession, tabla: TablaPrecios, lista_id: Optional[int]) -> Snapshot:
+    # La revisión se lee antes que las filas: el snapshot puede traer algo más nuevo, nunca algo más viejo.
+    revision = await _revision(db)
+    version = formatear_version(revision, lista_id)
+    lista = tabla.listas.get(lista_id, {})
+    categorias = await db.execute(select(*_COLUMNAS_CATEGORIA).order_by(CategoriaProducto.id))
+    productos = await db.execute(
+        select(*_COLUMNAS_PRODUCTO).where(Producto.activo.is_(True)).order_by(Producto.id)
+    )
+    cuerpo = _serializar(
+        {
+            "version": version,
+            "completo": True,
+            "lista_id": lista_id,
+            "categorias": [_categoria(c) for c in categorias],
+            "productos": [_producto(p, tabla, lista) for p in productos],
+        }
+    )
+    return Snapshot(
+        version=version,
+        revision=revision,
+        etag=f'"{hashlib.sha1(cuerpo).hexdigest()}"',
+        cuerpo=cuerpo,
+        comprimido=gzip.compress(cuerpo, compresslevel=6),
+        lista_id=lista_id,
+        armado_at=monotonic(),
+    )
+
+
+async def _armar_delta(db: AsyncSession, tabla: TablaPrecios, actual: Snapshot, desde: int) -> bytes:
+    lista = tabla.listas.get(actual.lista_id, {})
+    cambios = select(CatalogoCambio).where(CatalogoCambio.revision > desde).subquery()
+    # Los borrados no aparecen acá: la tablet los descarta al no encontrarlos en los ids vigentes.
+    categorias = await db.execute(
+        select(*_COLUMNAS_CATEGORIA)
+        .where(CategoriaProducto.id.in_(select(cambios.c.categoria_id)))
+        .order_by(CategoriaProducto.id)
+    )
+    productos = await db.execute(
+        select(*_COLUMNAS_PRODUCTO).where(Producto.id.in_(select(cambios.c.producto_id))).order_by(Producto.id)
+    )
+    categoria_ids = await db.scalars(select(CategoriaProducto.id).order_by(CategoriaProducto.id))
+    producto_ids = await db.scalars(select(Producto.id).where(Producto.activo.is_(True)).order_by(Producto.id))
+    return _serializar(
+        {
+            "version": actual.version,
+            "completo": False,
+            "lista_id": actual.lista_id,
+            "categorias": [_categoria(c) for c in categorias],
+            "productos": [_producto(p, tabla, lista) for p in productos],
+            "categoria_ids": list(categoria_ids),
+            "producto_ids": list(producto_ids),
+        }
+    )
+
+
+class CatalogoCache:
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[Snapshot] = None
+        self._generacion = 0
+        self._lock = asyncio.Lock()
+        self._deltas: TTLCache[str, bytes] = TTLCache(ttl_seconds=ttl_seconds, max_size=64)
+
+    def invalidate(self) -> None:
+        self._generacion += 1
+        self._snapshot = None
+        self._deltas.clear()
+
+    def _vigente(self, lista_id: Optional[int]) -> Optional[Snapshot]:
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.lista_id != lista_id or monotonic() - snapshot.armado_at >= self.ttl_seconds:
+            return None
+        return snapshot
+
+    async def snapshot(self, db: AsyncSession) -> Snapshot:
+        tabla = await price_resolver.tabla(db)
+        lista_id = tabla.lista_vigente(datetime.now(timezone.utc))
+        snapshot = self._vigente(lista_id)
+        if snapshot is not None:
+            return snapshot
+        # Un solo request arma el snapshot; las tablets que reconectan a la vez esperan y lo reutilizan.
+        async with self._lock:
+            snapshot = self._vigente(lista_id)
+            if snapshot is not None:
+                return snapshot
+            generacion = self._generacion
+            snapshot = await _armar(db, tabla, lista_id)
+            if generacion == self._generacion:
+                self._snapshot = snapshot
+            return snapshot
+
+    async def delta(self, db: AsyncSession, since: str) -> Tuple[Snapshot, Optional[bytes]]:
+        """Snapshot actual y cambios desde `since`; sin delta si no se puede comparar (hay que bajar todo)."""
+        desde, lista_desde = parsear_version(since)
+        actual = await self.snapshot(db)
+        if lista_desde != actual.lista_id or desde > actual.revision:
+            return actual, None
+        clave = f"{since}>{actual.version}"
+        cuerpo = self._deltas.get(clave)
+        if cuerpo is None:
+            cuerpo = await _armar_delta(db, await price_resolver.tabla(db), actual, desde)
+            self._deltas.set(clave, cuerpo)
+        return actual, cuerpo
+
+
+catalogo_cache = CatalogoCache(ttl_seconds=settings.catalogo_cache_ttl_seconds)
+
+
+@event.listens_for(Session, "before_flush")
+def _marcar_catalogo_modificado(session: Session, flush_context, instances) -> None:
+    cambios = (*session.new, *session.dirty, *session.deleted)
+    if any(isinstance(obj, _MODELOS_CATALOGO) for obj in cambios):
+        session.info["catalogo_modificado"] = True
+
+
+def _siguiente_revision(session: Session) -> int:
+    """Sube el contador una vez por transacción; el UPDATE deja la fila bloqueada hasta el commit."""
+    revision = session.info.get("catalogo_revision")
+    if revision is None:
+        conexion = session.connection()
+        revision = conexion.scalar(
+            update(CatalogoRevision)
+            .where(CatalogoRevision.id == 1)
+            .values(revision=CatalogoRevision.revision + 1)
+            .returning(CatalogoRevision.revision)
+        )
+        if revision is None:
+            # Bases creadas con `create_all`: en las migradas la fila la inserta la 0013.
+            revision = 1
+            conexion.execute(insert(CatalogoRevision).values(id=1, revision=revision))
+        session.info["catalogo_revision"] = revision
+    return revision
+
+
+@event.listens_for(Session, "after_flush")
+def _registrar_cambios(session: Session, flush_context) -> None:
+    cambios = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Producto):
+            cambios.add((obj.id, None))
+        elif isinstance(obj, ListaPrecioItem):
+            # Un ítem nuevo, modificado o borrado cambia el precio del producto (también el del que tenía antes).
+            anteriores = inspect(obj).attrs.producto_id.history.deleted
+            cambios.update((producto_id, None) for producto_id in {obj.producto_id, *anteriores} if producto_id)
+        elif isinstance(obj, CategoriaProducto):
+            cambios.add((None, obj.id))
+    if cambios:
+        revision = _siguiente_revision(session)
+        session.connection().execute(
+            insert(CatalogoCambio),
+            [{"revision": revision, "producto_id": p, "categoria_id": c} for p, c in cambios],
+        )
+
+
+@event.listens_for(Session, "before_commit")
+def _marcar_por_precios(session: Session) -> None:
+    # `activar_lista` cambia las listas con un UPDATE masivo que no pasa por `before_flush`.
+    if session.info.get("precios_modificados"):
+        session.info["catalogo_modificado"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidar_catalogo(session: Session) -> None:
+    session.info.pop("catalogo_revision", None)
+    if session.info.pop("catalogo_modificado", False):
+        catalogo_cache.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_catalogo_modificado(session: Session) -> None:
+    session.info.pop("catalogo_revision", None)
+    session.info.pop("catalogo_modificado", None)
@@ -0,0 +1,114 @@
+"""Árbol de categorías sobre la clausura `categorias_productos_arbol`.
+
+Un subárbol completo (categorías, productos e ingredientes) se lee con una sola consulta
+que une la clausura con las tres tablas; mover una categoría sólo cambia su `parent_id`
+y los eventos de `app.models.categorias` reescriben los caminos de sus descendientes.
+"""
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from sqlalchemy import literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import CategoriaArbol, CategoriaProducto, Ingrediente, Producto
+from app.services.errors import ConflictError, NotFoundError, ServiceError
+
+
+@dataclass
+class Nodo:
+    id: int
+    nombre: str
+    parent_id: Optional[int]
+    profundidad: int
+
+
+@dataclass
+class Miembro:
+    id: int
+    nombre: str
+    categoria_id: int
+    profundidad: int
+
+
+@dataclass
+class Subarbol:
+    categoria_id: int
+    categorias: List[Nodo] = field(default_factory=list)
+    productos: List[Miembro] = field(default_factory=list)
+    ingredientes: List[Miembro] = field(default_factory=list)
+
+
+async def _obtener(db: AsyncSession, categoria_id: int) -> CategoriaProducto:
+    categoria = await db.get(CategoriaProducto, categoria_id)
+    if categoria is None:
+        raise NotFoundError("Categoría no encontrada")
+    return categoria
+
+
+async def crear_categoria(db: AsyncSession, nombre: str, parent_id: Optional[int]) -> CategoriaProducto:
+    if parent_id is not None:
+        await _obtener(db, parent_id)
+    if await db.scalar(select(CategoriaProducto.id).where(CategoriaProducto.nombre == nombre)) is not None:
+        raise ConflictError("Ya existe una categoría con ese nombre")
+    categoria = CategoriaProducto(nombre=nombre, parent_id=parent_id)
+    db.add(categoria)
+    await db.flush()
+    return categoria
+
+
+async def mover_categoria(db: AsyncSession, categoria_id: int, parent_id: Optional[int]) -> CategoriaProducto:
+    categoria = await _obtener(db, categoria_id)
+    if parent_id is not None:
+        await _obtener(db, parent_id)
+        ciclo = await db.scalar(
+            select(CategoriaArbol.profundidad).where(
+                CategoriaArbol.ancestro_id == categoria_id, CategoriaArbol.descendiente_id == parent_id
+            )
+        )
+        if ciclo is not None:
+            raise ServiceError("Una categoría no puede colgar de sí misma ni de una subcategoría suya")
+    categoria.parent_id = parent_id
+    await db.flush()
+    return categoria
+
+
+async def subarbol(db: AsyncSession, categoria_id: int) -> Subarbol:
+    """La categoría, sus descendientes y los productos e ingredientes de todos ellos, en una consulta."""
+    arbol = (
+        select(CategoriaArbol.descendiente_id, CategoriaArbol.profundidad)
+        .where(CategoriaArbol.ancestro_id == categoria_id)
+        .subquery()
+    )
+    categorias = select(
+        literal("categoria").label("tipo"),
+        CategoriaProducto.id,
+        CategoriaProducto.nombre,
+        CategoriaProducto.parent_id.label("referencia_id"),
+        arbol.c.profundidad,
+    ).join(arbol, arbol.c.descendiente_id == CategoriaProducto.id)
+    productos = (
+        select(literal("producto"), Producto.id, Producto.nombre, Producto.categoria_id, arbol.c.profundidad)
+        .join(arbol, arbol.c.descendiente_id == Producto.categoria_id)
+        .where(Producto.activo.is_(True))
+    )
+    ingredientes = (
+        select(
+            literal("ingrediente"), Ingrediente.id, Ingrediente.nombre, Ingrediente.categoria_id, arbol.c.profundidad
+        )
+        .join(arbol, arbol.c.descendiente_id == Ingrediente.categoria_id)
+        .where(Ingrediente.activo.is_(True))
+    )
+    consulta = union_all(categorias, productos, ingredientes).subquery()
+    filas = await db.execute(select(consulta).order_by(consulta.c.profundidad, consulta.c.tipo, consulta.c.nombre))
+
+    resultado = Subarbol(categoria_id=categoria_id)
+    for tipo, id_, nombre, referencia_id, profundidad in filas:
+        if tipo == "categoria":
+            resultado.categorias.append(Nodo(id_, nombre, referencia_id, profundidad))
+        elif tipo == "producto":
+            resultado.productos.append(Miembro(id_, nombre, referencia_id, profundidad))
+        else:
+            resultado.ingredientes.append(Miembro(id_, nombre, referencia_id, profundidad))
+    if not resultado.categorias:
+        raise NotFoundError("Categoría no encontrada")
+    return resultado
@@ -0,0 +1,75 @@
+"""Pedidos de cocina y su publicación en el hub de tiempo real."""
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import PedidoCocina, PedidoCocinaEstado, Venta, VentaEstado
+from app.schemas.cocina import PedidoCocinaCreate, PedidoCocinaPublic
+from app.services.errors import ConflictError, NotFoundError, ServiceError
+from app.services.realtime import Evento, cocina_hub
+
+# Sólo se avanza: PENDIENTE -> EN_CURSO -> LISTO.
+SIGUIENTE_ESTADO = {
+    PedidoCocinaEstado.PENDIENTE: PedidoCocinaEstado.EN_CURSO,
+    PedidoCocinaEstado.EN_CURSO: PedidoCocinaEstado.LISTO,
+}
+
+
+def _ahora() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+async def crear_pedido(db: AsyncSession, data: PedidoCocinaCreate) -> PedidoCocina:
+    venta = await db.get(Venta, data.venta_id)
+    if venta is None:
+        raise NotFoundError("Venta no encontrada")
+    if venta.estado != VentaEstado.ABIERTA:
+        raise ConflictError(f"La venta está {venta.estado.value}")
+
+    pedido = PedidoCocina(
+        venta_id=venta.id,
+        estado=PedidoCocinaEstado.PENDIENTE,
+        estacion=data.estacion,
+        items=data.items,
+        timestamps={PedidoCocinaEstado.PENDIENTE.value: _ahora()},
+    )
+    db.add(pedido)
+    await db.flush()
+    return pedido
+
+
+async def cambiar_estado(db: AsyncSession, pedido_id: int, estado: str) -> PedidoCocina:
+    try:
+        nuevo = PedidoCocinaEstado(estado)
+    except ValueError as exc:
+        raise ServiceError("Estado inválido") from exc
+
+    pedido = await db.get(PedidoCocina, pedido_id)
+    if pedido is None:
+        raise NotFoundError("Pedido no encontrado")
+    if SIGUIENTE_ESTADO.get(pedido.estado) != nuevo:
+        raise ConflictError(f"Transición inválida: {pedido.estado.value} -> {nuevo.value}")
+
+    pedido.estado = nuevo
+    pedido.timestamps = {**(pedido.timestamps or {}), nuevo.value: _ahora()}
+    await db.flush()
+    return pedido
+
+
+ESTADOS_ACTIVOS = tuple(e for e in PedidoCocinaEstado if e != PedidoCocinaEstado.LISTO)
+
+
+async def pedidos_activos(db: AsyncSession, estacion: Optional[str] = None) -> List[PedidoCocina]:
+    # IN en lugar de "!= LISTO" para que use ix_pedidos_cocina_estado_created y no recorra los ya entregados.
+    stmt = select(PedidoCocina).where(PedidoCocina.estado.in_(ESTADOS_ACTIVOS))
+    if estacion is not None:
+        stmt = stmt.where((PedidoCocina.estacion == estacion) | PedidoCocina.estacion.is_(None))
+    return list(await db.scalars(stmt.order_by(PedidoCocina.id)))
+
+
+def publicar(tipo: str, pedido: PedidoCocina) -> Evento:
+    """Se llama después del commit para no anunciar cambios que luego se revierten."""
+    data = PedidoCocinaPublic.model_validate(pedido).model_dump(mode="json")
+    return cocina_hub.publish(tipo, data, estacion=pedido.estacion)
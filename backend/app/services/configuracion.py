@@ -0,0 +1,152 @@
+"""Configuración de tiempo de ejecución: tabla `config` en memoria, combinada con `Settings`.
+
+Las filas de `config` se cargan de una vez y las lecturas salen del diccionario en
+memoria. Las claves de `AJUSTABLES` pisan el campo homónimo de `Settings` y se convierten a
+su tipo; si no están en la tabla se devuelve el valor de `Settings`. El resto de los campos
+de `Settings` se leen una sola vez al iniciar, así que no se aceptan en la tabla. Los cambios confirmados
+en este proceso descartan el contenido al instante; los de otros workers se ven al
+recargar la tabla (unas pocas filas) cada `config_poll_seconds`, así que los caminos
+calientes no leen `config` en cada uso.
+"""
+from dataclasses import dataclass
+from time import monotonic
+from typing import Annotated, Any, Dict, Mapping, Optional
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import delete, event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import Settings, settings
+from app.models.models import Config
+from app.services.errors import NotFoundError, ServiceError
+
+# Campos de `Settings` que no se pueden pisar desde la base.
+PROTEGIDAS = frozenset(
+    {"secret_key", "database_url", "sync_database_url", "mercado_pago_access_token", "whatsapp_token", "metrics_token"}
+)
+# Campos de `Settings` que se leen con `config_store.get` en cada uso y admiten cambios en caliente.
+AJUSTABLES = frozenset({"count_cache_ttl_seconds", "import_batch_size", "export_batch_size"})
+
+
+def _fija(clave: str) -> bool:
+    return clave in Settings.model_fields and clave not in AJUSTABLES
+
+
+def _adaptador(clave: str) -> Optional[TypeAdapter]:
+    campo = Settings.model_fields.get(clave)
+    if campo is None or campo.annotation is str:
+        return None
+    # Con la metadata del campo (`gt`, `ge`, ...) rigen los mismos límites que al leer el entorno.
+    return TypeAdapter(Annotated[(campo.annotation, *campo.metadata)] if campo.metadata else campo.annotation)
+
+
+def convertir(clave: str, valor: str) -> Any:
+    """Valor de la tabla convertido al tipo del campo homónimo de `Settings` (texto si no hay campo)."""
+    adaptador = _adaptador(clave)
+    if adaptador is None:
+        return valor
+    try:
+        return adaptador.validate_json(valor)
+    except ValidationError:
+        try:
+            return adaptador.validate_python(valor)
+        except ValidationError as exc:
+            raise ServiceError(f"Valor inválido para {clave}: {valor!r}") from exc
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    valores: Mapping[str, Any]
+    cargada_at: float
+
+
+async def _cargar(db: AsyncSession) -> ConfigSnapshot:
+    valores: Dict[str, Any] = {}
+    for clave, valor in await db.execute(select(Config.k, Config.v)):
+        if _fija(clave):
+            continue
+        try:
+            valores[clave] = convertir(clave, valor)
+        except ServiceError:
+            # Una fila inválida escrita por fuera de `guardar` no tumba la carga: rige el valor de `Settings`.
+            continue
+    return ConfigSnapshot(valores=valores, cargada_at=monotonic())
+
+
+class ConfigStore:
+    def __init__(self, base: Settings, poll_seconds: float) -> None:
+        self.base = base
+        self.poll_seconds = poll_seconds
+        self._snapshot: Optional[ConfigSnapshot] = None
+        self._generacion = 0
+
+    def invalidate(self) -> None:
+        self._generacion += 1
+        self._snapshot = None
+
+    async def refrescar(self, db: AsyncSession) -> None:
+        """Recarga si se invalidó o pasaron `poll_seconds` desde la última carga; si no, no toca la base."""
+        snapshot = self._snapshot
+        if snapshot is not None and monotonic() - snapshot.cargada_at < self.poll_seconds:
+            return
+        generacion = self._generacion
+        snapshot = await _cargar(db)
+        if generacion == self._generacion:
+            self._snapshot = snapshot
+
+    def get(self, clave: str, default: Any = None) -> Any:
+        snapshot = self._snapshot
+        if snapshot is not None and clave in snapshot.valores:
+            return snapshot.valores[clave]
+        if clave in Settings.model_fields:
+            return getattr(self.base, clave)
+        return default
+
+    def valores(self) -> Dict[str, Any]:
+        """`Settings` (sin los campos protegidos) pisado por las filas de la tabla."""
+        combinados = {k: v for k, v in self.base.model_dump().items() if k not in PROTEGIDAS}
+        if self._snapshot is not None:
+            combinados.update(self._snapshot.valores)
+        return combinados
+
+
+config_store = ConfigStore(settings, poll_seconds=settings.config_poll_seconds)
+
+
+@event.listens_for(Session, "before_flush")
+def _marcar_config_modificada(session: Session, flush_context, instances) -> None:
+    if any(isinstance(obj, Config) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info["config_modificada"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidar_config(session: Session) -> None:
+    if session.info.pop("config_modificada", False):
+        config_store.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_config_modificada(session: Session) -> None:
+    session.info.pop("config_modificada", None)
+
+
+async def guardar(db: AsyncSession, clave: str, valor: str) -> Any:
+    """Crea o actualiza la clave y devuelve el valor ya convertido."""
+    if _fija(clave):
+        raise ServiceError(f"{clave} no se puede modificar en tiempo de ejecución")
+    convertido = convertir(clave, valor)
+    fila = await db.scalar(select(Config).where(Config.k == clave))
+    if fila is None:
+        db.add(Config(k=clave, v=valor))
+    else:
+        fila.v = valor
+    await db.flush()
+    return convertido
+
+
+async def borrar(db: AsyncSession, clave: str) -> None:
+    resultado = await db.execute(delete(Config).where(Config.k == clave))
+    if resultado.rowcount == 0:
+        raise NotFoundError("Clave de configuración inexistente")
+    db.info["config_modificada"] = True
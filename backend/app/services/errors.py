@@ -0,0 +1,17 @@
+"""Errores de dominio de la capa de servicios; `app.main` los traduce a respuestas HTTP."""
+
+
+class ServiceError(Exception):
+    status_code = 400
+
+    def __init__(self, detail: str) -> None:
+        super().__init__(detail)
+        self.detail = detail
+
+
+class NotFoundError(ServiceError):
+    status_code = 404
+
+
+class ConflictError(ServiceError):
+    status_code = 409
@@ -0,0 +1,210 @@
+"""Exportación de ventas, stock y caja a CSV/XLSX en streaming.
+
+Cada exportación es una única consulta ordenada que se recorre con un cursor del lado
+del servidor (`yield_per`) en su propia sesión: la respuesta se escribe lote a lote
+mientras se lee, sin materializar el resultado ni el archivo. La sesión no puede ser la
+del request porque FastAPI la cierra antes de enviar el cuerpo.
+"""
+import csv
+import io
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, Dict, Sequence
+
+from sqlalchemy import Select, and_, literal, null, select, union_all
+
+from app.core.xlsx import texto, xlsx_stream
+from app.db.session import AsyncSessionLocal
+from app.models.models import (
+    Ingrediente,
+    MovimientoCaja,
+    Pago,
+    Producto,
+    StockMovimiento,
+    Turno,
+    Venta,
+    VentaEstado,
+    VentaItem,
+)
+from app.services.configuracion import config_store
+from app.services.errors import ServiceError
+from app.services.reportes import ReporteTipo, a_utc
+
+
+class ExportFormato(str, Enum):
+    CSV = "csv"
+    XLSX = "xlsx"
+
+
+MEDIA_TYPES = {
+    ExportFormato.CSV: "text/csv; charset=utf-8",
+    ExportFormato.XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+@dataclass(frozen=True)
+class Exportacion:
+    encabezados: Sequence[str]
+    consulta: Callable[[datetime, datetime], Select]
+
+
+def _ventas(desde: datetime, hasta: datetime) -> Select:
+    """Una fila por ítem y una por pago de cada venta cerrada, agrupadas por venta."""
+    cerradas = and_(Venta.estado == VentaEstado.CERRADA, Venta.cerrada_at >= desde, Venta.cerrada_at < hasta)
+    items = (
+        select(
+            Venta.id.label("venta_id"),
+            Venta.cerrada_at,
+            Venta.mozo_id,
+            Venta.mesa_id,
+            Venta.total_neto,
+            Venta.propina,
+            literal("item").label("linea"),
+            VentaItem.producto_id,
+            Producto.nombre.label("producto"),
+            VentaItem.cantidad,
+            VentaItem.precio_unitario,
+            # Con el tipo de la columna, para que el UNION devuelva el enum y no el nombre guardado.
+            literal(None, Pago.medio.type).label("medio"),
+            literal(None, Pago.monto.type).label("monto"),
+        )
+        .join(VentaItem, VentaItem.venta_id == Venta.id)
+        .join(Producto, Producto.id == VentaItem.producto_id)
+        .where(cerradas)
+    )
+    pagos = (
+        select(
+            Venta.id,
+            Venta.cerrada_at,
+            Venta.mozo_id,
+            Venta.mesa_id,
+            Venta.total_neto,
+            Venta.propina,
+            literal("pago"),
+            null(),
+            null(),
+            null(),
+            null(),
+            Pago.medio,
+            Pago.monto,
+        )
+        .join(Pago, Pago.venta_id == Venta.id)
+        .where(cerradas)
+    )
+    lineas = union_all(items, pagos).subquery()
+    return select(lineas).order_by(lineas.c.cerrada_at, lineas.c.venta_id, lineas.c.linea)
+
+
+def _stock(desde: datetime, hasta: datetime) -> Select:
+    return (
+        select(
+            StockMovimiento.id,
+            StockMovimiento.fecha,
+            StockMovimiento.tipo,
+            StockMovimiento.ingrediente_id,
+            Ingrediente.nombre,
+            StockMovimiento.producto_id,
+            StockMovimiento.delta,
+            StockMovimiento.ref_id,
+            StockMovimiento.motivo,
+        )
+        .outerjoin(Ingrediente, Ingrediente.id == StockMovimiento.ingrediente_id)
+        .where(StockMovimiento.fecha >= desde, StockMovimiento.fecha < hasta)
+        .order_by(StockMovimiento.fecha, StockMovimiento.id)
+    )
+
+
+def _caja(desde: datetime, hasta: datetime) -> Select:
+    return (
+        select(
+            MovimientoCaja.id,
+            MovimientoCaja.created_at,
+            Turno.caja_id,
+            MovimientoCaja.turno_id,
+            MovimientoCaja.tipo,
+            MovimientoCaja.origen,
+            MovimientoCaja.medio_pago,
+            MovimientoCaja.monto,
+            MovimientoCaja.descripcion,
+        )
+        .join(Turno, Turno.id == MovimientoCaja.turno_id)
+        .where(MovimientoCaja.created_at >= desde, MovimientoCaja.created_at < hasta)
+        .order_by(MovimientoCaja.created_at, MovimientoCaja.id)
+    )
+
+
+EXPORTACIONES: Dict[ReporteTipo, Exportacion] = {
+    ReporteTipo.VENTAS: Exportacion(
+        [
+            "venta_id",
+            "cerrada_at",
+            "mozo_id",
+            "mesa_id",
+            "total_neto",
+            "propina",
+            "linea",
+            "producto_id",
+            "producto",
+            "cantidad",
+            "precio_unitario",
+            "medio",
+            "monto",
+        ],
+        _ventas,
+    ),
+    ReporteTipo.STOCK: Exportacion(
+        ["id", "fecha", "tipo", "ingrediente_id", "ingrediente", "producto_id", "delta", "ref_id", "motivo"], _stock
+    ),
+    ReporteTipo.CAJA: Exportacion(
+        ["id", "fecha", "caja_id", "turno_id", "tipo", "origen", "medio_pago", "monto", "descripcion"], _caja
+    ),
+}
+
+
+async def _lotes(consulta: Select) -> AsyncIterator[Sequence[Sequence[Any]]]:
+    async with AsyncSessionLocal() as db:
+        await config_store.refrescar(db)
+        resultado = await db.stream(consulta.execution_options(yield_per=config_store.get("export_batch_size")))
+        async for lote in resultado.partitions():
+            yield lote
+
+
+# Con estos prefijos Excel toma la celda como fórmula al abrir el CSV.
+_PREFIJOS_FORMULA = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _celda_csv(valor: Any) -> str:
+    """Texto libre (descripciones, motivos, nombres) que parece fórmula sale precedido de `'`; los números no."""
+    if isinstance(valor, str) and valor.startswith(_PREFIJOS_FORMULA):
+        return f"'{valor}"
+    return texto(valor)
+
+
+async def _csv_stream(
+    encabezados: Sequence[str], lotes: AsyncIterator[Sequence[Sequence[Any]]]
+) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    # BOM para que Excel detecte UTF-8 al abrir el archivo directamente.
+    buffer.write("\ufeff")
+    escritor.writerow(encabezados)
+    async for lote in lotes:
+        escritor.writerows([_celda_csv(v) for v in fila] for fila in lote)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def exportar(tipo: ReporteTipo, desde: datetime, hasta: datetime, formato: ExportFormato) -> AsyncIterator[bytes]:
+    """Generador del archivo; la consulta recién se ejecuta cuando se empieza a consumir."""
+    desde, hasta = a_utc(desde), a_utc(hasta)
+    if desde >= hasta:
+        raise ServiceError("El rango de la exportación es vacío")
+    exportacion = EXPORTACIONES[tipo]
+    lotes = _lotes(exportacion.consulta(desde, hasta))
+    if formato == ExportFormato.XLSX:
+        return xlsx_stream(tipo.value, exportacion.encabezados, lotes)
+    return _csv_stream(exportacion.encabezados, lotes)
@@ -0,0 +1,155 @@
+"""Importación masiva de clientes desde CSV/XLSX, en segundo plano y por lotes."""
+import csv
+import os
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional
+
+from openpyxl import load_workbook
+from pydantic import ValidationError
+from sqlalchemy import insert
+
+from app.db.session import session_scope
+from app.models.models import Cliente
+from app.schemas.clientes import ClienteCreate
+
+MAX_RECHAZOS_DETALLE = 1000
+MAX_JOBS = 50
+
+
+class ImportFormato(str, Enum):
+    CSV = "csv"
+    XLSX = "xlsx"
+
+
+class ImportEstado(str, Enum):
+    PENDIENTE = "pendiente"
+    EN_CURSO = "en_curso"
+    COMPLETADO = "completado"
+    FALLIDO = "fallido"
+
+
+@dataclass
+class ImportJob:
+    id: str
+    archivo: str
+    estado: ImportEstado = ImportEstado.PENDIENTE
+    procesadas: int = 0
+    insertadas: int = 0
+    rechazadas_total: int = 0
+    rechazadas: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+    creado_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finalizado_at: Optional[datetime] = None
+
+    def rechazar(self, fila: int, motivo: str) -> None:
+        self.rechazadas_total += 1
+        if len(self.rechazadas) < MAX_RECHAZOS_DETALLE:
+            self.rechazadas.append({"fila": fila, "motivo": motivo})
+
+
+_jobs: "OrderedDict[str, ImportJob]" = OrderedDict()
+_jobs_lock = Lock()
+
+
+def crear_job(archivo: str) -> ImportJob:
+    job = ImportJob(id=uuid.uuid4().hex, archivo=archivo)
+    with _jobs_lock:
+        _jobs[job.id] = job
+        while len(_jobs) > MAX_JOBS:
+            _jobs.popitem(last=False)
+    return job
+
+
+def obtener_job(job_id: str) -> Optional[ImportJob]:
+    with _jobs_lock:
+        return _jobs.get(job_id)
+
+
+def detectar_formato(nombre_archivo: str) -> Optional[ImportFormato]:
+    extension = os.path.splitext(nombre_archivo or "")[1].lower().lstrip(".")
+    return next((f for f in ImportFormato if f.value == extension), None)
+
+
+def _normalizar(fila: Dict[str, Any]) -> Dict[str, Any]:
+    limpia: Dict[str, Any] = {}
+    for clave, valor in fila.items():
+        if clave is None:
+            continue
+        # openpyxl devuelve int/float en las celdas numéricas: un teléfono 1155550000 llega
+        # como 1155550000.0. Se pasa a texto y los esquemas convierten lo que sea numérico.
+        if isinstance(valor, float) and valor.is_integer():
+            valor = int(valor)
+        if valor is not None and not isinstance(valor, str):
+            valor = str(valor)
+        if isinstance(valor, str):
+            valor = valor.strip()
+        limpia[str(clave).strip().lower()] = None if valor == "" else valor
+    return limpia
+
+
+def _filas_csv(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, newline="", encoding="utf-8-sig") as fh:
+        yield from csv.DictReader(fh)
+
+
+def _filas_xlsx(path: str) -> Iterator[Dict[str, Any]]:
+    # read_only itera las filas del XML sin materializar la hoja completa.
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        filas = workbook.active.iter_rows(values_only=True)
+        encabezados = next(filas, None)
+        if encabezados is None:
+            return
+        for valores in filas:
+            yield dict(zip(encabezados, valores))
+    finally:
+        workbook.close()
+
+
+def _motivo(exc: ValidationError) -> str:
+    error = exc.errors()[0]
+    campo = ".".join(str(p) for p in error["loc"])
+    return f"{campo}: {error['msg']}" if campo else error["msg"]
+
+
+def importar_clientes(job_id: str, path: str, formato: ImportFormato, tamano_lote: int) -> None:
+    """Procesa el archivo fila a fila e inserta lotes de `tamano_lote` con un solo executemany."""
+    job = obtener_job(job_id)
+    if job is None:  # pragma: no cover - el job se crea antes de encolar la tarea
+        return
+    job.estado = ImportEstado.EN_CURSO
+    filas = _filas_csv(path) if formato == ImportFormato.CSV else _filas_xlsx(path)
+    lote: List[Dict[str, Any]] = []
+
+    try:
+        with session_scope() as session:
+            for numero, fila in enumerate(filas, start=2):
+                job.procesadas += 1
+                try:
+                    lote.append(ClienteCreate.model_validate(_normalizar(fila)).model_dump())
+                except ValidationError as exc:
+                    job.rechazar(numero, _motivo(exc))
+                    continue
+
+                if len(lote) >= tamano_lote:
+                    session.execute(insert(Cliente), lote)
+                    session.commit()
+                    job.insertadas += len(lote)
+                    lote = []
+
+            if lote:
+                session.execute(insert(Cliente), lote)
+                session.commit()
+                job.insertadas += len(lote)
+        job.estado = ImportEstado.COMPLETADO
+    except Exception as exc:  # noqa: BLE001 - el error queda registrado en el job
+        job.estado = ImportEstado.FALLIDO
+        job.error = str(exc)
+    finally:
+        job.finalizado_at = datetime.now(timezone.utc)
+        os.unlink(path)
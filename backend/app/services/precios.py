@@ -0,0 +1,148 @@
+"""Resolución de precios desde una tabla en memoria.
+
+`PriceResolver` carga de una vez el `precio_lista` de los productos activos, los ítems
+de la lista activa y de las listas programadas (happy hour) y sus franjas. La tabla es
+inmutable: una recarga arma otra y reemplaza la referencia, así una resolución en curso
+nunca ve una mezcla de dos versiones. Se descarta al confirmarse un cambio sobre
+productos, listas o programaciones en este proceso, y por TTL para los cambios hechos
+por otros procesos.
+"""
+from dataclasses import dataclass
+from datetime import datetime, time, timezone
+from decimal import Decimal
+from time import monotonic
+from typing import Dict, FrozenSet, Iterable, Mapping, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import event, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import ListaPrecio, ListaPrecioItem, ListaPrecioProgramacion, Producto
+from app.services.errors import NotFoundError
+
+_MODELOS_PRECIO = (Producto, ListaPrecio, ListaPrecioItem, ListaPrecioProgramacion)
+
+
+@dataclass(frozen=True)
+class Franja:
+    lista_id: int
+    dias: FrozenSet[int]
+    desde: time
+    hasta: time
+
+    def vigente(self, local: datetime) -> bool:
+        hora, dia = local.time(), local.weekday()
+        if self.desde <= self.hasta:
+            return dia in self.dias and self.desde <= hora < self.hasta
+        # Cruza la medianoche: la madrugada pertenece a la franja del día anterior.
+        return (dia in self.dias and hora >= self.desde) or ((dia - 1) % 7 in self.dias and hora < self.hasta)
+
+
+@dataclass(frozen=True)
+class TablaPrecios:
+    base: Mapping[int, Decimal]
+    listas: Mapping[int, Mapping[int, Decimal]]
+    activa: Optional[int]
+    franjas: Tuple[Franja, ...]
+    cargada_at: float
+
+    def lista_vigente(self, momento: datetime) -> Optional[int]:
+        local = momento.astimezone(ZoneInfo(settings.timezone))
+        for franja in self.franjas:
+            if franja.vigente(local):
+                return franja.lista_id
+        return self.activa
+
+    def resolver(self, producto_ids: Iterable[int], momento: datetime) -> Dict[int, Decimal]:
+        """Precio de cada producto activo; los inexistentes o inactivos se omiten."""
+        lista = self.listas.get(self.lista_vigente(momento), {})
+        return {pid: lista.get(pid, self.base[pid]) for pid in producto_ids if pid in self.base}
+
+
+def _precio(valor) -> Decimal:
+    return Decimal(str(valor)).quantize(Decimal("0.01"))
+
+
+async def _cargar(db: AsyncSession) -> TablaPrecios:
+    rows = await db.execute(select(Producto.id, Producto.precio_lista).where(Producto.activo.is_(True)))
+    base = {producto_id: _precio(precio) for producto_id, precio in rows}
+    franjas = tuple(
+        Franja(lista_id=p.lista_id, dias=frozenset(int(d) for d in p.dias), desde=p.hora_desde, hasta=p.hora_hasta)
+        for p in await db.scalars(
+            select(ListaPrecioProgramacion)
+            .where(ListaPrecioProgramacion.activo.is_(True))
+            .order_by(ListaPrecioProgramacion.id)
+        )
+    )
+    activa = await db.scalar(select(ListaPrecio.id).where(ListaPrecio.activa.is_(True)).limit(1))
+    usadas = {f.lista_id for f in franjas} | ({activa} if activa is not None else set())
+
+    listas: Dict[int, Dict[int, Decimal]] = {lista_id: {} for lista_id in usadas}
+    if usadas:
+        rows = await db.execute(
+            select(ListaPrecioItem.lista_id, ListaPrecioItem.producto_id, ListaPrecioItem.precio).where(
+                ListaPrecioItem.lista_id.in_(usadas)
+            )
+        )
+        for lista_id, producto_id, precio in rows:
+            listas[lista_id][producto_id] = _precio(precio)
+    return TablaPrecios(base=base, listas=listas, activa=activa, franjas=franjas, cargada_at=monotonic())
+
+
+class PriceResolver:
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._tabla: Optional[TablaPrecios] = None
+        self._generacion = 0
+
+    def invalidate(self) -> None:
+        self._generacion += 1
+        self._tabla = None
+
+    async def tabla(self, db: AsyncSession) -> TablaPrecios:
+        tabla = self._tabla
+        if tabla is not None and monotonic() - tabla.cargada_at < self.ttl_seconds:
+            return tabla
+        generacion = self._generacion
+        tabla = await _cargar(db)
+        # Si hubo una invalidación durante la carga, la tabla puede estar vieja: se usa pero no se guarda.
+        if generacion == self._generacion:
+            self._tabla = tabla
+        return tabla
+
+    async def resolve(
+        self, db: AsyncSession, producto_ids: Iterable[int], momento: Optional[datetime] = None
+    ) -> Dict[int, Decimal]:
+        tabla = await self.tabla(db)
+        return tabla.resolver(producto_ids, momento or datetime.now(timezone.utc))
+
+
+price_resolver = PriceResolver(ttl_seconds=settings.precios_cache_ttl_seconds)
+
+
+@event.listens_for(Session, "before_flush")
+def _marcar_precios_modificados(session: Session, flush_context, instances) -> None:
+    cambios = (*session.new, *session.dirty, *session.deleted)
+    if any(isinstance(obj, _MODELOS_PRECIO) for obj in cambios):
+        session.info["precios_modificados"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidar_precios(session: Session) -> None:
+    if session.info.pop("precios_modificados", False):
+        price_resolver.invalidate()
+
+
+async def activar_lista(db: AsyncSession, lista_id: Optional[int]) -> None:
+    """Deja activa sólo `lista_id` (o ninguna, con `None`) en un único UPDATE."""
+    if lista_id is not None and await db.get(ListaPrecio, lista_id) is None:
+        raise NotFoundError("Lista de precios no encontrada")
+    await db.execute(
+        update(ListaPrecio)
+        .where(or_(ListaPrecio.activa.is_(True), ListaPrecio.id == lista_id))
+        .values(activa=ListaPrecio.id == lista_id)
+        .execution_options(synchronize_session=False)
+    )
+    db.info["precios_modificados"] = True
@@ -0,0 +1,39 @@
+"""Usuario autenticado resuelto desde el JWT y cacheado por proceso."""
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.models import RoleEnum, Usuario
+
+
+@dataclass(frozen=True)
+class Principal:
+    id: int
+    username_lower: str
+    nombre: str
+    rol: RoleEnum
+    activo: bool
+
+
+principal_cache: TTLCache[str, Principal] = TTLCache(
+    ttl_seconds=settings.principal_cache_ttl_seconds,
+    max_size=settings.principal_cache_max_size,
+)
+
+
+def to_principal(user: Usuario) -> Principal:
+    return Principal(
+        id=user.id,
+        username_lower=user.username_lower,
+        nombre=user.nombre,
+        rol=user.rol,
+        activo=user.activo,
+    )
+
+
+async def load_principal(db: AsyncSession, username_lower: str) -> Principal | None:
+    user: Usuario | None = await db.scalar(select(Usuario).where(Usuario.username_lower == username_lower))
+    return to_principal(user) if user is not None else None
@@ -0,0 +1,115 @@
+"""Hub pub/sub en memoria para empujar eventos a pantallas (WebSocket/SSE).
+
+Cada evento recibe un id creciente y queda en un buffer circular, así un cliente que se
+reconecta con `Last-Event-ID` recibe sólo lo que se perdió. Cada suscriptor tiene una
+cola acotada: si no la consume a tiempo se lo desconecta (backpressure) en lugar de
+acumular memoria o frenar a los demás; al reconectarse retoma desde su último id.
+El hub vive en el proceso: con varios workers cada uno publica a sus propios clientes.
+"""
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Set
+
+from app.core.config import settings
+
+RESYNC = "resync"
+
+
+@dataclass(frozen=True)
+class Evento:
+    id: int
+    tipo: str
+    data: Dict[str, Any]
+    estacion: Optional[str] = None
+
+
+def _para_estacion(evento: Evento, estacion: Optional[str]) -> bool:
+    return estacion is None or evento.estacion is None or evento.estacion == estacion
+
+
+@dataclass(eq=False)
+class Suscripcion:
+    estacion: Optional[str]
+    queue: "asyncio.Queue[Optional[Evento]]"
+    cerrada: bool = False
+    pendientes: Deque[Evento] = field(default_factory=deque)
+
+
+class EventHub:
+    def __init__(self, buffer_size: int, queue_size: int) -> None:
+        self.queue_size = queue_size
+        self._buffer: Deque[Evento] = deque(maxlen=buffer_size)
+        self._ids = count(1)
+        self._ultimo_id = 0
+        self._suscripciones: Set[Suscripcion] = set()
+
+    @property
+    def ultimo_id(self) -> int:
+        return self._ultimo_id
+
+    @property
+    def suscriptores(self) -> int:
+        return len(self._suscripciones)
+
+    def publish(self, tipo: str, data: Dict[str, Any], estacion: Optional[str] = None) -> Evento:
+        evento = Evento(id=next(self._ids), tipo=tipo, data=data, estacion=estacion)
+        self._ultimo_id = evento.id
+        self._buffer.append(evento)
+        for sub in list(self._suscripciones):
+            if _para_estacion(evento, sub.estacion):
+                self._entregar(sub, evento)
+        return evento
+
+    def _entregar(self, sub: Suscripcion, evento: Evento) -> None:
+        try:
+            sub.queue.put_nowait(evento)
+        except asyncio.QueueFull:
+            self._desconectar(sub)
+
+    def _desconectar(self, sub: Suscripcion) -> None:
+        self._suscripciones.discard(sub)
+        sub.cerrada = True
+        while not sub.queue.empty():
+            sub.queue.get_nowait()
+        sub.queue.put_nowait(None)
+
+    def subscribe(self, estacion: Optional[str] = None, last_event_id: Optional[int] = None) -> Suscripcion:
+        sub = Suscripcion(estacion=estacion, queue=asyncio.Queue(maxsize=self.queue_size))
+        if last_event_id is not None:
+            sub.pendientes.extend(self._replay(last_event_id, estacion))
+        self._suscripciones.add(sub)
+        return sub
+
+    def _replay(self, last_event_id: int, estacion: Optional[str]) -> list[Evento]:
+        primero = self._buffer[0].id if self._buffer else self._ultimo_id + 1
+        if last_event_id > self._ultimo_id or last_event_id < primero - 1:
+            # El id no está en el buffer (reinicio del proceso o desconexión larga): hay que recargar el tablero.
+            return [Evento(id=self._ultimo_id, tipo=RESYNC, data={})]
+        return [e for e in self._buffer if e.id > last_event_id and _para_estacion(e, estacion)]
+
+    def unsubscribe(self, sub: Suscripcion) -> None:
+        self._suscripciones.discard(sub)
+        sub.cerrada = True
+
+    async def eventos(self, sub: Suscripcion, heartbeat: Optional[float] = None) -> AsyncIterator[Optional[Evento]]:
+        """Itera los eventos de la suscripción; emite `None` cada `heartbeat` segundos sin tráfico."""
+        try:
+            while sub.pendientes:
+                yield sub.pendientes.popleft()
+            while True:
+                try:
+                    evento = await asyncio.wait_for(sub.queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if evento is None:
+                    return
+                yield evento
+        finally:
+            self.unsubscribe(sub)
+
+
+cocina_hub = EventHub(buffer_size=settings.realtime_buffer_size, queue_size=settings.realtime_queue_size)
+stock_hub = EventHub(buffer_size=settings.realtime_buffer_size, queue_size=settings.realtime_queue_size)
@@ -0,0 +1,223 @@
+"""Reportes de ventas, stock y caja cacheados en `reportes_cache` por (tipo, rango).
+
+Cada reporte se agrega una vez por rango `[desde, hasta)` y se sirve desde la tabla en
+las lecturas siguientes. Al escribirse un hecho con fecha (venta cerrada, movimiento de
+stock, gasto o movimiento de caja) se borran sólo las entradas de su tipo cuyo rango
+contiene esa fecha; los reportes de otros períodos siguen válidos.
+
+Los cambios hechos con el ORM se detectan en `after_flush`; las inserciones masivas con
+Core (p. ej. los movimientos de stock de una venta) llaman a `invalidar_reportes`.
+"""
+from collections import defaultdict
+from datetime import datetime, timezone
+from decimal import ROUND_HALF_UP, Decimal
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Iterable, Mapping, Set, Tuple
+
+from sqlalchemy import and_, delete, event, func, inspect, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.models import (
+    Gasto,
+    MovimientoCaja,
+    Pago,
+    Producto,
+    ReporteCache,
+    StockMovimiento,
+    Venta,
+    VentaEstado,
+    VentaItem,
+)
+from app.services.errors import ServiceError
+
+
+class ReporteTipo(str, Enum):
+    VENTAS = "ventas"
+    STOCK = "stock"
+    CAJA = "caja"
+
+
+def a_utc(fecha: datetime) -> datetime:
+    """Fecha en UTC; las que llegan sin zona se toman como UTC."""
+    return fecha.replace(tzinfo=timezone.utc) if fecha.tzinfo is None else fecha.astimezone(timezone.utc)
+
+
+def _importe(valor) -> str:
+    # Se guarda como texto para no perder precisión en el JSON.
+    return str(Decimal(str(valor or 0)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
+
+
+async def _reporte_ventas(db: AsyncSession, desde: datetime, hasta: datetime) -> Dict[str, Any]:
+    en_rango = and_(Venta.estado == VentaEstado.CERRADA, Venta.cerrada_at >= desde, Venta.cerrada_at < hasta)
+    cantidad, bruto, descuento, neto, propina = (
+        await db.execute(
+            select(
+                func.count(Venta.id),
+                func.sum(Venta.total_bruto),
+                func.sum(Venta.total_descuento),
+                func.sum(Venta.total_neto),
+                func.sum(Venta.propina),
+            ).where(en_rango)
+        )
+    ).one()
+    productos = await db.execute(
+        select(
+            VentaItem.producto_id,
+            Producto.nombre,
+            func.sum(VentaItem.cantidad),
+            func.sum(VentaItem.cantidad * VentaItem.precio_unitario).label("importe"),
+        )
+        .join(Venta, Venta.id == VentaItem.venta_id)
+        .join(Producto, Producto.id == VentaItem.producto_id)
+        .where(en_rango)
+        .group_by(VentaItem.producto_id, Producto.nombre)
+        .order_by(func.sum(VentaItem.cantidad * VentaItem.precio_unitario).desc())
+    )
+    medios = await db.execute(
+        select(Pago.medio, func.sum(Pago.monto))
+        .join(Venta, Venta.id == Pago.venta_id)
+        .where(en_rango)
+        .group_by(Pago.medio)
+    )
+    return {
+        "ventas": cantidad,
+        "total_bruto": _importe(bruto),
+        "total_descuento": _importe(descuento),
+        "total_neto": _importe(neto),
+        "propina": _importe(propina),
+        "por_producto": [
+            {"producto_id": producto_id, "nombre": nombre, "cantidad": float(cant), "importe": _importe(importe)}
+            for producto_id, nombre, cant, importe in productos
+        ],
+        "por_medio": {medio.value: _importe(monto) for medio, monto in medios},
+    }
+
+
+async def _reporte_stock(db: AsyncSession, desde: datetime, hasta: datetime) -> Dict[str, Any]:
+    rows = await db.execute(
+        select(
+            StockMovimiento.ingrediente_id,
+            StockMovimiento.producto_id,
+            StockMovimiento.tipo,
+            func.count(StockMovimiento.id),
+            func.sum(StockMovimiento.delta),
+        )
+        .where(StockMovimiento.fecha >= desde, StockMovimiento.fecha < hasta)
+        .group_by(StockMovimiento.ingrediente_id, StockMovimiento.producto_id, StockMovimiento.tipo)
+        .order_by(StockMovimiento.ingrediente_id, StockMovimiento.producto_id, StockMovimiento.tipo)
+    )
+    return {
+        "movimientos": [
+            {
+                "ingrediente_id": ingrediente_id,
+                "producto_id": producto_id,
+                "tipo": tipo.value,
+                "cantidad": cantidad,
+                "delta": float(delta),
+            }
+            for ingrediente_id, producto_id, tipo, cantidad, delta in rows
+        ]
+    }
+
+
+async def _reporte_caja(db: AsyncSession, desde: datetime, hasta: datetime) -> Dict[str, Any]:
+    movimientos = await db.execute(
+        select(MovimientoCaja.tipo, MovimientoCaja.medio_pago, func.sum(MovimientoCaja.monto))
+        .where(MovimientoCaja.created_at >= desde, MovimientoCaja.created_at < hasta)
+        .group_by(MovimientoCaja.tipo, MovimientoCaja.medio_pago)
+    )
+    gastos = await db.execute(
+        select(Gasto.medio_pago, func.count(Gasto.id), func.sum(Gasto.monto))
+        .where(Gasto.fecha >= desde, Gasto.fecha < hasta)
+        .group_by(Gasto.medio_pago)
+    )
+    por_tipo: Dict[str, Dict[str, str]] = defaultdict(dict)
+    for tipo, medio, monto in movimientos:
+        por_tipo[tipo.value][medio] = _importe(monto)
+    return {
+        "movimientos": dict(por_tipo),
+        "gastos": [
+            {"medio_pago": medio, "cantidad": cantidad, "total": _importe(total)} for medio, cantidad, total in gastos
+        ],
+    }
+
+
+GENERADORES: Mapping[ReporteTipo, Callable[[AsyncSession, datetime, datetime], Awaitable[Dict[str, Any]]]] = {
+    ReporteTipo.VENTAS: _reporte_ventas,
+    ReporteTipo.STOCK: _reporte_stock,
+    ReporteTipo.CAJA: _reporte_caja,
+}
+
+
+async def obtener_reporte(
+    db: AsyncSession, tipo: ReporteTipo, desde: datetime, hasta: datetime
+) -> Tuple[ReporteCache, bool]:
+    """Devuelve el reporte y si salió de la caché; si no estaba lo genera y lo guarda."""
+    desde, hasta = a_utc(desde), a_utc(hasta)
+    if desde >= hasta:
+        raise ServiceError("El rango del reporte es vacío")
+
+    reporte = await db.scalar(
+        select(ReporteCache).where(
+            ReporteCache.tipo == tipo.value, ReporteCache.rango_desde == desde, ReporteCache.rango_hasta == hasta
+        )
+    )
+    if reporte is not None:
+        return reporte, True
+
+    reporte = ReporteCache(
+        tipo=tipo.value,
+        rango_desde=desde,
+        rango_hasta=hasta,
+        payload_json=await GENERADORES[tipo](db, desde, hasta),
+        generado_at=datetime.now(timezone.utc),
+    )
+    try:
+        async with db.begin_nested():
+            db.add(reporte)
+    except IntegrityError:
+        # Otro request lo guardó en paralelo: se sirve el recién calculado igual.
+        pass
+    return reporte, False
+
+
+def _condiciones(fechas: Mapping[ReporteTipo, Iterable[datetime]]):
+    return or_(
+        *(
+            and_(ReporteCache.tipo == tipo.value, ReporteCache.rango_desde <= fecha, ReporteCache.rango_hasta > fecha)
+            for tipo, valores in fechas.items()
+            for fecha in {a_utc(f) for f in valores}
+        )
+    )
+
+
+async def invalidar_reportes(db: AsyncSession, tipo: ReporteTipo, fechas: Iterable[datetime]) -> None:
+    fechas = list(fechas)
+    if fechas:
+        await db.execute(delete(ReporteCache).where(_condiciones({tipo: fechas})))
+
+
+def _fechas(obj: Any, atributo: str) -> Set[datetime]:
+    """Valor actual y anterior del atributo: mover un hecho de fecha afecta a ambos rangos."""
+    historia = inspect(obj).attrs[atributo].history
+    return {f for f in (*historia.added, *historia.unchanged, *historia.deleted) if f is not None}
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidar_por_cambios(session: Session, flush_context) -> None:
+    fechas: Dict[ReporteTipo, Set[datetime]] = defaultdict(set)
+    ahora = datetime.now(timezone.utc)
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Venta):
+            fechas[ReporteTipo.VENTAS] |= _fechas(obj, "cerrada_at")
+        elif isinstance(obj, StockMovimiento):
+            fechas[ReporteTipo.STOCK] |= _fechas(obj, "fecha") or {ahora}
+        elif isinstance(obj, Gasto):
+            fechas[ReporteTipo.CAJA] |= _fechas(obj, "fecha") or {ahora}
+        elif isinstance(obj, MovimientoCaja):
+            fechas[ReporteTipo.CAJA] |= _fechas(obj, "created_at") or {ahora}
+    fechas = {tipo: valores for tipo, valores in fechas.items() if valores}
+    if fechas:
+        session.connection().execute(delete(ReporteCache).where(_condiciones(fechas)))
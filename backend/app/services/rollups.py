@@ -0,0 +1,174 @@
+"""Acumulados horarios de ventas por producto, medio de pago, mozo y caja.
+
+Al cerrar una venta se suman sus importes a la hora de `cerrada_at` con un
+INSERT ... SELECT ... ON CONFLICT DO UPDATE por tabla. `reconstruir` rehace un rango
+desde el historial con las mismas consultas, así ambos caminos agrupan igual. Los
+tableros leen estas tablas (`serie`) en lugar de `ventas_items` y `pagos`.
+
+Las horas se guardan en UTC; `serie` agrupa los días en `settings.timezone`, igual en
+SQLite y PostgreSQL.
+"""
+from dataclasses import dataclass
+from datetime import datetime, tzinfo
+from enum import Enum
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import ColumnElement, String, and_, cast, delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.upsert import insertar_sumando
+from app.models.models import (
+    Pago,
+    Venta,
+    VentaEstado,
+    VentaItem,
+    VentasHoraCaja,
+    VentasHoraMedio,
+    VentasHoraMozo,
+    VentasHoraProducto,
+)
+from app.core.config import settings
+from app.services.errors import NotFoundError
+from app.services.reportes import a_utc
+
+
+class Granularidad(str, Enum):
+    HORA = "hora"
+    DIA = "dia"
+
+
+def truncar(columna, granularidad: Granularidad, dialect: str) -> ColumnElement:
+    if dialect == "postgresql":
+        return func.date_trunc("hour" if granularidad == Granularidad.HORA else "day", columna)
+    # Mismo formato con el que SQLAlchemy guarda DateTime en SQLite, para que las claves coincidan.
+    formato = "%Y-%m-%d %H:00:00.000000" if granularidad == Granularidad.HORA else "%Y-%m-%d 00:00:00.000000"
+    return func.strftime(formato, columna)
+
+
+@dataclass(frozen=True)
+class Dimension:
+    modelo: Any
+    clave: str
+    consulta: Callable[[ColumnElement], Any]
+
+    @property
+    def metricas(self) -> List[str]:
+        return [c.name for c in self.modelo.__table__.columns if c.name not in ("hora", self.clave)]
+
+
+def _por_producto(hora: ColumnElement):
+    return (
+        select(
+            hora.label("hora"),
+            VentaItem.producto_id.label("producto_id"),
+            func.sum(VentaItem.cantidad).label("cantidad"),
+            func.sum(VentaItem.cantidad * VentaItem.precio_unitario).label("importe"),
+        )
+        .join(Venta, Venta.id == VentaItem.venta_id)
+        .group_by(hora, VentaItem.producto_id)
+    )
+
+
+def _por_medio(hora: ColumnElement):
+    medio = cast(Pago.medio, String)
+    return (
+        select(
+            hora.label("hora"),
+            medio.label("medio"),
+            func.count(Pago.id).label("pagos"),
+            func.sum(Pago.monto).label("monto"),
+        )
+        .join(Venta, Venta.id == Pago.venta_id)
+        .group_by(hora, medio)
+    )
+
+
+def _por_mozo(hora: ColumnElement):
+    return select(
+        hora.label("hora"),
+        Venta.mozo_id.label("mozo_id"),
+        func.count(Venta.id).label("ventas"),
+        func.sum(Venta.total_neto).label("total_neto"),
+        func.sum(Venta.propina).label("propina"),
+    ).group_by(hora, Venta.mozo_id)
+
+
+def _por_caja(hora: ColumnElement):
+    return (
+        select(
+            hora.label("hora"),
+            Venta.caja_id.label("caja_id"),
+            func.count(Venta.id).label("ventas"),
+            func.sum(Venta.total_neto).label("total_neto"),
+        )
+        .where(Venta.caja_id.is_not(None))
+        .group_by(hora, Venta.caja_id)
+    )
+
+
+DIMENSIONES: Dict[str, Dimension] = {
+    "producto": Dimension(VentasHoraProducto, "producto_id", _por_producto),
+    "medio": Dimension(VentasHoraMedio, "medio", _por_medio),
+    "mozo": Dimension(VentasHoraMozo, "mozo_id", _por_mozo),
+    "caja": Dimension(VentasHoraCaja, "caja_id", _por_caja),
+}
+
+
+def _acumular(dialect: str, filtro: ColumnElement) -> List[Any]:
+    hora = truncar(Venta.cerrada_at, Granularidad.HORA, dialect)
+    cerradas = and_(Venta.estado == VentaEstado.CERRADA, Venta.cerrada_at.is_not(None), filtro)
+    return [
+        insertar_sumando(dialect, d.modelo.__table__, d.consulta(hora).where(cerradas), ["hora", d.clave])
+        for d in DIMENSIONES.values()
+    ]
+
+
+async def acumular_venta(db: AsyncSession, venta: Venta) -> None:
+    for stmt in _acumular(db.get_bind().dialect.name, Venta.id == venta.id):
+        await db.execute(stmt)
+
+
+def reconstruir(session: Session, desde: datetime, hasta: datetime) -> None:
+    """Borra y recalcula las horas de `[desde, hasta)`; los límites deben caer en horas exactas."""
+    for dimension in DIMENSIONES.values():
+        modelo = dimension.modelo
+        session.execute(delete(modelo).where(modelo.hora >= desde, modelo.hora < hasta))
+    filtro = and_(Venta.cerrada_at >= desde, Venta.cerrada_at < hasta)
+    for stmt in _acumular(session.get_bind().dialect.name, filtro):
+        session.execute(stmt)
+
+
+def _periodo(hora: datetime, granularidad: Granularidad, zona: tzinfo) -> datetime:
+    local = a_utc(hora).astimezone(zona)
+    return local if granularidad == Granularidad.HORA else local.replace(hour=0, minute=0)
+
+
+async def serie(
+    db: AsyncSession, dimension: str, desde: datetime, hasta: datetime, granularidad: Granularidad
+) -> Sequence[Dict[str, Any]]:
+    """Suma las horas de `[desde, hasta)` por período y clave.
+
+    Las filas ya son horarias: los días se arman acá y no con `truncar`, que en SQLite corta
+    por día UTC y en PostgreSQL por la zona de la sesión.
+    """
+    d = DIMENSIONES.get(dimension)
+    if d is None:
+        raise NotFoundError(f"Dimensión inexistente: {dimension}")
+    modelo = d.modelo
+    zona = ZoneInfo(settings.timezone)
+    rows = await db.execute(
+        select(modelo.hora, getattr(modelo, d.clave).label("clave"), *(getattr(modelo, m) for m in d.metricas)).where(
+            modelo.hora >= a_utc(desde), modelo.hora < a_utc(hasta)
+        )
+    )
+    filas: Dict[Tuple[datetime, Any], Dict[str, Any]] = {}
+    for row in rows:
+        periodo = _periodo(row.hora, granularidad, zona)
+        fila = filas.setdefault(
+            (periodo, row.clave), {"periodo": periodo, "clave": row.clave, **dict.fromkeys(d.metricas, 0)}
+        )
+        for m in d.metricas:
+            fila[m] += row._mapping[m]
+    return sorted(filas.values(), key=lambda f: (f["periodo"], f["clave"] is None, f["clave"] or 0))
@@ -0,0 +1,377 @@
+"""Descuento de stock al cerrar ventas a partir de las recetas de cada producto.
+
+La receta de cada producto se aplana una vez a `{ingrediente_id: cantidad por unidad}`
+y se guarda en `bom_cache`; la caché se limpia cuando se confirma un cambio sobre
+`Receta`/`RecetaItem` o un `Producto` (la explosión guarda `controla_stock`). Al cerrar
+una venta se agregan los consumos de todo el ticket por ingrediente y se escriben con un
+único INSERT masivo en `stock_movimientos` y un único UPDATE con CASE sobre
+`ingredientes.stock_actual`.
+
+`SubIngrediente` no tiene stock propio ni aparece en `RecetaItem`, por lo que la
+explosión llega hasta el ingrediente.
+
+`stock_movimientos` es el libro mayor y `stock_actual` un saldo desnormalizado. Los
+`StockSnapshot` diarios guardan el saldo de cada ingrediente a una fecha de corte: el
+stock a cualquier fecha y la reconciliación sólo suman los movimientos posteriores al
+último corte. Los movimientos se registran con la fecha del hecho; uno cargado con fecha
+anterior a un corte ya tomado obliga a regenerar ese corte.
+
+Cuando un descuento, una corrección o una edición del ingrediente (saldo, mínimo) cruza
+el `stock_minimo` en cualquier sentido se publica un evento en `stock_hub` al confirmarse
+la transacción. El hub vive en memoria del proceso: lo confirmado en otro proceso (la
+tarea de cron, un script) no llega a los suscriptores, que igual pueden releer
+`/stock/bajo-minimo`.
+"""
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from sqlalchemy import (
+    DateTime,
+    Select,
+    and_,
+    case,
+    delete,
+    event,
+    func,
+    insert,
+    inspect,
+    literal,
+    or_,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.stock import BAJO_MINIMO, ingredientes_bajo_stock
+from app.models.models import (
+    Ingrediente,
+    Producto,
+    Receta,
+    RecetaItem,
+    StockMovimiento,
+    StockMovimientoTipo,
+    StockSnapshot,
+    Venta,
+    VentaItem,
+)
+from app.services.realtime import stock_hub
+from app.services.reportes import ReporteTipo, a_utc, invalidar_reportes
+
+STOCK_BAJO = "stock_bajo"
+STOCK_REPUESTO = "stock_repuesto"
+
+
+@dataclass(frozen=True)
+class Explosion:
+    controla_stock: bool
+    ingredientes: Dict[int, float] = field(default_factory=dict)
+
+
+bom_cache: TTLCache[int, Explosion] = TTLCache(ttl_seconds=settings.bom_cache_ttl_seconds, max_size=10_000)
+
+
+@event.listens_for(Session, "before_flush")
+def _marcar_recetas_modificadas(session: Session, flush_context, instances) -> None:
+    cambios = (*session.new, *session.dirty, *session.deleted)
+    if any(isinstance(obj, (Receta, RecetaItem, Producto)) for obj in cambios):
+        session.info["recetas_modificadas"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidar_recetas(session: Session) -> None:
+    if session.info.pop("recetas_modificadas", False):
+        bom_cache.clear()
+
+
+def _anterior(obj: Ingrediente, campo: str) -> Any:
+    historia = inspect(obj).attrs[campo].history
+    return historia.deleted[0] if historia.deleted else getattr(obj, campo)
+
+
+@event.listens_for(Session, "before_flush")
+def _cruces_por_edicion(session: Session, flush_context, instances) -> None:
+    """Un saldo o mínimo editado con el ORM también puede cruzar el mínimo."""
+    alertas = []
+    for obj in session.dirty:
+        if not isinstance(obj, Ingrediente) or not obj.activo:
+            continue
+        antes = _bajo(_anterior(obj, "stock_actual"), _anterior(obj, "stock_minimo"))
+        tipo = _cruce(antes, _bajo(obj.stock_actual, obj.stock_minimo))
+        if tipo is not None:
+            alertas.append(_alerta(tipo, obj.id, obj.nombre, obj.stock_actual, obj.stock_minimo))
+    _encolar_alertas(session.info, alertas)
+
+
+@event.listens_for(Session, "after_commit")
+def _publicar_alertas(session: Session) -> None:
+    for tipo, data in session.info.pop("alertas_stock", ()):
+        stock_hub.publish(tipo, data)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_alertas(session: Session) -> None:
+    session.info.pop("alertas_stock", None)
+
+
+async def explosiones(db: AsyncSession, producto_ids: Iterable[int]) -> Dict[int, Explosion]:
+    """Recetas aplanadas por producto; los que no están en caché se cargan en una sola consulta."""
+    resultado: Dict[int, Explosion] = {}
+    faltantes: List[int] = []
+    for producto_id in set(producto_ids):
+        cacheada = bom_cache.get(producto_id)
+        if cacheada is None:
+            faltantes.append(producto_id)
+        else:
+            resultado[producto_id] = cacheada
+
+    if faltantes:
+        rows = await db.execute(
+            select(Producto.id, Producto.controla_stock, RecetaItem.ingrediente_id, func.sum(RecetaItem.cantidad))
+            .outerjoin(Receta, Receta.producto_id == Producto.id)
+            .outerjoin(RecetaItem, RecetaItem.receta_id == Receta.id)
+            .where(Producto.id.in_(faltantes))
+            .group_by(Producto.id, Producto.controla_stock, RecetaItem.ingrediente_id)
+        )
+        controla: Dict[int, bool] = {}
+        consumos: Dict[int, Dict[int, float]] = defaultdict(dict)
+        for producto_id, controla_stock, ingrediente_id, cantidad in rows:
+            controla[producto_id] = bool(controla_stock)
+            if ingrediente_id is not None:
+                consumos[producto_id][ingrediente_id] = float(cantidad or 0)
+        for producto_id, controla_stock in controla.items():
+            explosion = Explosion(controla_stock=controla_stock, ingredientes=consumos.get(producto_id, {}))
+            bom_cache.set(producto_id, explosion)
+            resultado[producto_id] = explosion
+    return resultado
+
+
+def _sumar_stock(deltas: Mapping[int, float]):
+    return (
+        update(Ingrediente)
+        .where(Ingrediente.id.in_(deltas))
+        .values(stock_actual=Ingrediente.stock_actual + case(dict(deltas), value=Ingrediente.id, else_=0))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _sumar_stock_con_saldos(deltas: Mapping[int, float]):
+    return _sumar_stock(deltas).returning(
+        Ingrediente.id, Ingrediente.nombre, Ingrediente.stock_actual, Ingrediente.stock_minimo, Ingrediente.activo
+    )
+
+
+def _bajo(stock: Optional[float], minimo: Optional[float]) -> bool:
+    return stock is not None and minimo is not None and stock < minimo
+
+
+def _cruce(antes: bool, ahora: bool) -> Optional[str]:
+    if antes == ahora:
+        return None
+    return STOCK_BAJO if ahora else STOCK_REPUESTO
+
+
+def _alerta(tipo: str, ingrediente_id: int, nombre: str, stock: float, minimo: float) -> tuple:
+    return tipo, {"ingrediente_id": ingrediente_id, "nombre": nombre, "stock_actual": stock, "stock_minimo": minimo}
+
+
+def _encolar_alertas(info: Dict, alertas: List) -> None:
+    if alertas:
+        info.setdefault("alertas_stock", []).extend(alertas)
+
+
+def _registrar_cruces(info: Dict, deltas: Mapping[int, float], rows) -> None:
+    """Encola en `info` las alertas de los ingredientes cuyo saldo cruzó `stock_minimo`."""
+    alertas = []
+    for ingrediente_id, nombre, nuevo, minimo, activo in rows:
+        tipo = _cruce(_bajo(nuevo - deltas[ingrediente_id], minimo), _bajo(nuevo, minimo)) if activo else None
+        if tipo is not None:
+            alertas.append(_alerta(tipo, ingrediente_id, nombre, nuevo, minimo))
+    _encolar_alertas(info, alertas)
+
+
+async def aplicar_deltas_ingredientes(db: AsyncSession, deltas: Mapping[int, float]) -> None:
+    """Suma `deltas` a `stock_actual` con un único UPDATE ... CASE id.
+
+    El RETURNING trae el saldo nuevo; el anterior es `nuevo - delta`, así que detectar el
+    cruce del mínimo no cuesta otra lectura. Las alertas se publican tras el commit.
+    """
+    deltas = {ingrediente_id: delta for ingrediente_id, delta in deltas.items() if delta}
+    if deltas:
+        _registrar_cruces(db.info, deltas, await db.execute(_sumar_stock_con_saldos(deltas)))
+
+
+async def bajo_minimo(db: AsyncSession) -> List[Ingrediente]:
+    """Ingredientes activos con `stock_actual < stock_minimo`, sin recorrer `ingredientes`."""
+    stmt = select(Ingrediente).order_by(Ingrediente.nombre)
+    if db.get_bind().dialect.name == "sqlite":
+        stmt = stmt.join(ingredientes_bajo_stock, ingredientes_bajo_stock.c.ingrediente_id == Ingrediente.id)
+    else:
+        # Mismo predicado que el índice parcial para que el planificador lo use.
+        stmt = stmt.where(text(BAJO_MINIMO))
+    return list(await db.scalars(stmt))
+
+
+async def descontar_stock_venta(db: AsyncSession, venta: Venta) -> List[Dict]:
+    """Escribe los movimientos de stock de una venta cerrada y devuelve las filas insertadas."""
+    rows = await db.execute(
+        select(VentaItem.producto_id, func.sum(VentaItem.cantidad))
+        .where(VentaItem.venta_id == venta.id)
+        .group_by(VentaItem.producto_id)
+    )
+    vendidos = {producto_id: float(cantidad) for producto_id, cantidad in rows}
+    if not vendidos:
+        return []
+
+    recetas = await explosiones(db, vendidos)
+    por_ingrediente: Dict[int, float] = defaultdict(float)
+    por_producto: Dict[int, float] = {}
+    for producto_id, cantidad in vendidos.items():
+        explosion = recetas.get(producto_id)
+        if explosion is None or not explosion.controla_stock:
+            continue
+        if explosion.ingredientes:
+            for ingrediente_id, por_unidad in explosion.ingredientes.items():
+                por_ingrediente[ingrediente_id] -= por_unidad * cantidad
+        else:
+            por_producto[producto_id] = -cantidad
+
+    fecha = venta.cerrada_at or datetime.now(timezone.utc)
+    motivo = f"Venta #{venta.id}"
+    movimientos = [
+        {
+            "tipo": StockMovimientoTipo.RECETA,
+            "ref_id": venta.id,
+            "ingrediente_id": ingrediente_id,
+            "producto_id": None,
+            "delta": delta,
+            "fecha": fecha,
+            "motivo": motivo,
+        }
+        for ingrediente_id, delta in sorted(por_ingrediente.items())
+    ] + [
+        {
+            "tipo": StockMovimientoTipo.VENTA,
+            "ref_id": venta.id,
+            "ingrediente_id": None,
+            "producto_id": producto_id,
+            "delta": delta,
+            "fecha": fecha,
+            "motivo": motivo,
+        }
+        for producto_id, delta in sorted(por_producto.items())
+    ]
+    if movimientos:
+        await db.execute(insert(StockMovimiento), movimientos)
+        await invalidar_reportes(db, ReporteTipo.STOCK, [fecha])
+    await aplicar_deltas_ingredientes(db, por_ingrediente)
+    return movimientos
+
+
+def corte_diario(dia: date) -> datetime:
+    return datetime.combine(dia, time.min, tzinfo=timezone.utc)
+
+
+def _saldos(momento: Optional[datetime] = None) -> Select:
+    """Saldo por ingrediente: último snapshot con `fecha <= momento` + movimientos desde ese corte.
+
+    Con `momento=None` se toma el último snapshot y todos los movimientos posteriores.
+    """
+    cortes = select(StockSnapshot.ingrediente_id, func.max(StockSnapshot.fecha).label("fecha"))
+    if momento is not None:
+        cortes = cortes.where(StockSnapshot.fecha <= momento)
+    corte = cortes.group_by(StockSnapshot.ingrediente_id).subquery("corte")
+    snapshot = aliased(StockSnapshot)
+
+    cola = select(func.coalesce(func.sum(StockMovimiento.delta), 0)).where(
+        StockMovimiento.ingrediente_id == Ingrediente.id,
+        or_(corte.c.fecha.is_(None), StockMovimiento.fecha >= corte.c.fecha),
+    )
+    if momento is not None:
+        cola = cola.where(StockMovimiento.fecha < momento)
+
+    return (
+        select(
+            Ingrediente.id.label("ingrediente_id"),
+            (func.coalesce(snapshot.saldo, 0) + cola.scalar_subquery()).label("saldo"),
+        )
+        .outerjoin(corte, corte.c.ingrediente_id == Ingrediente.id)
+        .outerjoin(snapshot, and_(snapshot.ingrediente_id == Ingrediente.id, snapshot.fecha == corte.c.fecha))
+    )
+
+
+async def stock_a_fecha(
+    db: AsyncSession, momento: datetime, ingrediente_ids: Optional[Iterable[int]] = None
+) -> Dict[int, float]:
+    # SQLite compara la hora guardada en UTC sin zona: el momento tiene que llegar en UTC.
+    stmt = _saldos(a_utc(momento))
+    if ingrediente_ids is not None:
+        stmt = stmt.where(Ingrediente.id.in_(set(ingrediente_ids)))
+    rows = await db.execute(stmt)
+    return {ingrediente_id: float(saldo) for ingrediente_id, saldo in rows}
+
+
+def crear_snapshots(session: Session, corte: datetime) -> int:
+    """Graba (o regenera) el saldo de todos los ingredientes al corte con un INSERT ... SELECT."""
+    session.execute(delete(StockSnapshot).where(StockSnapshot.fecha == corte))
+    saldos = _saldos(corte).subquery()
+    result = session.execute(
+        insert(StockSnapshot).from_select(
+            ["ingrediente_id", "fecha", "saldo"],
+            select(saldos.c.ingrediente_id, literal(corte, DateTime(timezone=True)), saldos.c.saldo),
+        )
+    )
+    return result.rowcount
+
+
+@dataclass(frozen=True)
+class Discrepancia:
+    ingrediente_id: int
+    nombre: str
+    stock_actual: float
+    stock_libro: float
+
+    @property
+    def diferencia(self) -> float:
+        return self.stock_libro - self.stock_actual
+
+
+def _discrepancias(tolerancia: float) -> Select:
+    saldos = _saldos().subquery()
+    return (
+        select(Ingrediente.id, Ingrediente.nombre, Ingrediente.stock_actual, saldos.c.saldo)
+        .join(saldos, saldos.c.ingrediente_id == Ingrediente.id)
+        .where(func.abs(func.coalesce(Ingrediente.stock_actual, 0) - saldos.c.saldo) > tolerancia)
+        .order_by(Ingrediente.id)
+    )
+
+
+def _a_discrepancias(rows) -> List[Discrepancia]:
+    return [
+        Discrepancia(ingrediente_id=id_, nombre=nombre, stock_actual=float(actual or 0), stock_libro=float(libro))
+        for id_, nombre, actual, libro in rows
+    ]
+
+
+async def discrepancias(db: AsyncSession, tolerancia: float = 1e-6) -> List[Discrepancia]:
+    return _a_discrepancias(await db.execute(_discrepancias(tolerancia)))
+
+
+def reconciliar(session: Session, *, corregir: bool = False, tolerancia: float = 1e-6) -> List[Discrepancia]:
+    """Compara `stock_actual` con snapshot + cola del libro; con `corregir` ajusta la diferencia.
+
+    El ajuste se aplica como delta y no como valor absoluto, así una venta que se cierre
+    entre la lectura y el UPDATE no se pierde: mueve el libro y el saldo por igual. Como
+    cualquier otro delta, publica las alertas de `stock_minimo` al confirmarse (para que
+    lleguen a los suscriptores, desde la API: `POST /stock/reconciliacion`).
+    """
+    encontradas = _a_discrepancias(session.execute(_discrepancias(tolerancia)))
+    if corregir and encontradas:
+        deltas = {d.ingrediente_id: d.diferencia for d in encontradas}
+        _registrar_cruces(session.info, deltas, session.execute(_sumar_stock_con_saldos(deltas)))
+    return encontradas
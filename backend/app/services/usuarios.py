@@ -0,0 +1,53 @@
+"""Consultas compartidas por los endpoints de usuarios."""
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import Caja, Usuario, usuario_caja_association
+from app.schemas.usuarios import UsuarioPublic
+from app.services.principal import Principal
+
+
+async def cajas_por_usuario(db: AsyncSession, usuario_ids: Iterable[int]) -> Dict[int, List[int]]:
+    """IDs de cajas asignadas a cada usuario, en una sola consulta sobre la tabla de asociación."""
+    ids = list(usuario_ids)
+    asignaciones: Dict[int, List[int]] = defaultdict(list)
+    if not ids:
+        return asignaciones
+    rows = await db.execute(
+        select(usuario_caja_association.c.usuario_id, usuario_caja_association.c.caja_id)
+        .where(usuario_caja_association.c.usuario_id.in_(ids))
+        .order_by(usuario_caja_association.c.caja_id)
+    )
+    for usuario_id, caja_id in rows:
+        asignaciones[usuario_id].append(caja_id)
+    return asignaciones
+
+
+async def asignar_cajas(db: AsyncSession, usuario_id: int, cajas_ids: Iterable[int]) -> List[int]:
+    """Reemplaza las cajas del usuario sin cargar la colección ORM. Ignora IDs inexistentes."""
+    solicitadas = set(cajas_ids)
+    validas: List[int] = []
+    if solicitadas:
+        validas = list(await db.scalars(select(Caja.id).where(Caja.id.in_(solicitadas)).order_by(Caja.id)))
+
+    await db.execute(delete(usuario_caja_association).where(usuario_caja_association.c.usuario_id == usuario_id))
+    if validas:
+        await db.execute(
+            insert(usuario_caja_association),
+            [{"usuario_id": usuario_id, "caja_id": caja_id} for caja_id in validas],
+        )
+    return validas
+
+
+def to_public(user: Usuario | Principal, cajas_ids: List[int]) -> UsuarioPublic:
+    return UsuarioPublic(
+        id=user.id,
+        username_lower=user.username_lower,
+        nombre=user.nombre,
+        rol=user.rol.value,
+        activo=user.activo,
+        cajas_asignadas=cajas_ids,
+    )
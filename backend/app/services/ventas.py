@@ -0,0 +1,219 @@
+"""Motor de ventas: apertura, carga de ítems, descuentos, pagos y cierre.
+
+Los totales de la venta se mantienen por diferencia: cada cambio de ítems calcula el
+delta del lote y lo aplica sobre `total_bruto`, sin volver a sumar los ítems existentes.
+Todo se hace con `Decimal` y las funciones sólo hacen `flush`; el commit queda a cargo
+del endpoint, de modo que cada request es una única transacción.
+"""
+from datetime import datetime, timezone
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Iterable, List, Sequence, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.models.models import (
+    Descuento,
+    DescuentoTipo,
+    MedioPago,
+    Pago,
+    Venta,
+    VentaEstado,
+    VentaItem,
+    VentaTipo,
+)
+from app.schemas.ventas import DescuentoIn, PagoIn, VentaCreate, VentaItemIn
+from app.services.caja import registrar_cobro
+from app.services.errors import ConflictError, NotFoundError, ServiceError
+from app.services.precios import price_resolver
+from app.services.rollups import acumular_venta
+from app.services.stock import descontar_stock_venta
+
+CENTAVO = Decimal("0.01")
+
+
+def money(value) -> Decimal:
+    return Decimal(str(value or 0)).quantize(CENTAVO, rounding=ROUND_HALF_UP)
+
+
+async def obtener_venta(db: AsyncSession, venta_id: int, *, detalle: bool = False) -> Venta:
+    stmt = select(Venta).where(Venta.id == venta_id)
+    if detalle:
+        stmt = stmt.options(selectinload(Venta.items), selectinload(Venta.descuentos), selectinload(Venta.pagos))
+    else:
+        stmt = stmt.with_for_update()
+    venta = await db.scalar(stmt)
+    if venta is None:
+        raise NotFoundError("Venta no encontrada")
+    return venta
+
+
+def _exigir_abierta(venta: Venta) -> None:
+    if venta.estado != VentaEstado.ABIERTA:
+        raise ConflictError(f"La venta está {venta.estado.value}")
+
+
+async def _recalcular_descuento(db: AsyncSession, venta: Venta) -> None:
+    """Descuento = fijos + bruto * porcentuales. Depende de los descuentos, no de los ítems."""
+    rows = await db.execute(
+        select(Descuento.tipo, func.sum(Descuento.valor))
+        .where(Descuento.venta_id == venta.id)
+        .group_by(Descuento.tipo)
+    )
+    sumas = {tipo: Decimal(str(total)) for tipo, total in rows}
+    bruto = money(venta.total_bruto)
+    fijo = sumas.get(DescuentoTipo.FIJO, Decimal("0"))
+    porcentual = sumas.get(DescuentoTipo.PORCENTUAL, Decimal("0"))
+    descuento = fijo + bruto * porcentual / 100
+    venta.total_descuento = min(money(descuento), bruto)
+    venta.total_neto = bruto - venta.total_descuento
+
+
+async def _aplicar_delta(db: AsyncSession, venta: Venta, delta: Decimal) -> None:
+    venta.total_bruto = money(venta.total_bruto) + delta
+    await _recalcular_descuento(db, venta)
+
+
+async def abrir_venta(db: AsyncSession, data: VentaCreate, mozo_id: int) -> Venta:
+    try:
+        tipo = VentaTipo(data.tipo)
+    except ValueError as exc:
+        raise ServiceError("Tipo de venta inválido") from exc
+    venta = Venta(
+        tipo=tipo,
+        mesa_id=data.mesa_id,
+        cliente_id=data.cliente_id,
+        caja_id=data.caja_id,
+        turno_id=data.turno_id,
+        mozo_id=mozo_id,
+        estado=VentaEstado.ABIERTA,
+        total_bruto=Decimal("0"),
+        total_descuento=Decimal("0"),
+        total_neto=Decimal("0"),
+        propina=Decimal("0"),
+    )
+    db.add(venta)
+    await db.flush()
+    return venta
+
+
+async def precios_vigentes(db: AsyncSession, producto_ids: Iterable[int]) -> dict[int, Decimal]:
+    ids = set(producto_ids)
+    precios = {producto_id: money(precio) for producto_id, precio in (await price_resolver.resolve(db, ids)).items()}
+    faltantes = ids - precios.keys()
+    if faltantes:
+        raise NotFoundError(f"Productos inexistentes o inactivos: {sorted(faltantes)}")
+    return precios
+
+
+async def cambiar_items(
+    db: AsyncSession, venta: Venta, agregar: Sequence[VentaItemIn], quitar: Sequence[int]
+) -> Tuple[List[VentaItem], List[int]]:
+    """Agrega y quita ítems en lote y aplica un único delta a los totales."""
+    _exigir_abierta(venta)
+    delta = Decimal("0")
+
+    quitados: List[int] = []
+    if quitar:
+        rows = await db.execute(
+            select(VentaItem.id, VentaItem.cantidad, VentaItem.precio_unitario).where(
+                VentaItem.venta_id == venta.id, VentaItem.id.in_(set(quitar))
+            )
+        )
+        for item_id, cantidad, precio in rows:
+            delta -= money(Decimal(str(cantidad)) * money(precio))
+            quitados.append(item_id)
+        if len(quitados) != len(set(quitar)):
+            raise NotFoundError("Hay ítems que no pertenecen a la venta")
+        await db.execute(delete(VentaItem).where(VentaItem.id.in_(quitados)))
+
+    agregados: List[VentaItem] = []
+    if agregar:
+        # Todos pasan por la lista vigente: un precio explícito no habilita un producto inexistente o inactivo.
+        precios = await precios_vigentes(db, {item.producto_id for item in agregar})
+        for item in agregar:
+            precio = money(item.precio_unitario) if item.precio_unitario is not None else precios[item.producto_id]
+            agregados.append(
+                VentaItem(
+                    venta_id=venta.id,
+                    producto_id=item.producto_id,
+                    cantidad=float(item.cantidad),
+                    precio_unitario=precio,
+                    modificadores=item.modificadores,
+                )
+            )
+            delta += money(item.cantidad * precio)
+        db.add_all(agregados)
+
+    await _aplicar_delta(db, venta, delta)
+    await db.flush()
+    return agregados, quitados
+
+
+async def aplicar_descuento(db: AsyncSession, venta: Venta, data: DescuentoIn) -> Descuento:
+    _exigir_abierta(venta)
+    try:
+        tipo = DescuentoTipo(data.tipo)
+    except ValueError as exc:
+        raise ServiceError("Tipo de descuento inválido") from exc
+    if tipo == DescuentoTipo.PORCENTUAL and data.valor > 100:
+        raise ServiceError("El descuento porcentual no puede superar el 100%")
+
+    descuento = Descuento(
+        tipo=tipo, valor=float(data.valor), motivo=data.motivo, venta_id=venta.id, cliente_id=venta.cliente_id
+    )
+    db.add(descuento)
+    await db.flush()
+    await _recalcular_descuento(db, venta)
+    await db.flush()
+    return descuento
+
+
+async def total_pagado(db: AsyncSession, venta: Venta) -> Decimal:
+    return money(await db.scalar(select(func.coalesce(func.sum(Pago.monto), 0)).where(Pago.venta_id == venta.id)))
+
+
+async def registrar_pago(db: AsyncSession, venta: Venta, data: PagoIn) -> Tuple[Pago, Decimal]:
+    """Registra un pago y devuelve el vuelto.
+
+    En efectivo lo entregado por encima del saldo pendiente es vuelto: el pago (y el ingreso
+    a la caja) se toma por el saldo. Con otros medios un monto mayor al saldo se rechaza.
+    """
+    _exigir_abierta(venta)
+    try:
+        medio = MedioPago(data.medio)
+    except ValueError as exc:
+        raise ServiceError("Medio de pago inválido") from exc
+
+    if data.propina:
+        venta.propina = money(venta.propina) + money(data.propina)
+    pendiente = money(venta.total_neto) + money(venta.propina) - await total_pagado(db, venta)
+    if pendiente <= 0:
+        raise ConflictError("La venta no tiene saldo pendiente")
+    monto = money(data.monto)
+    if monto > pendiente and medio != MedioPago.EFECTIVO:
+        raise ServiceError(f"El pago supera el saldo pendiente de {pendiente}")
+    vuelto = max(monto - pendiente, Decimal("0"))
+
+    pago = Pago(venta_id=venta.id, medio=medio, monto=monto - vuelto, referencia=data.referencia)
+    db.add(pago)
+    if venta.turno_id is not None:
+        await registrar_cobro(db, venta.turno_id, medio.value, pago.monto)
+    await db.flush()
+    return pago, vuelto
+
+
+async def cerrar_venta(db: AsyncSession, venta: Venta) -> Venta:
+    _exigir_abierta(venta)
+    pagado = await total_pagado(db, venta)
+    pendiente = money(venta.total_neto) + money(venta.propina) - pagado
+    if pendiente > 0:
+        raise ConflictError(f"Saldo pendiente de {pendiente}")
+
+    venta.estado = VentaEstado.CERRADA
+    venta.cerrada_at = datetime.now(timezone.utc)
+    await db.flush()
+    await descontar_stock_venta(db, venta)
+    await acumular_venta(db, venta)
+    return venta
@@ -0,0 +1,62 @@
+"""Reconstruye los acumulados horarios de ventas desde el historial, por tramos.
+
+    python -m app.tasks.rollups [--desde AAAA-MM-DD] [--hasta AAAA-MM-DD] [--horas 24]
+
+Cada tramo se borra, recalcula y confirma por separado: una corrida larga no retiene
+una transacción abierta y si se corta se puede relanzar desde el último tramo impreso.
+"""
+import argparse
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import func, select
+
+from app.db.session import session_scope
+from app.models.models import Venta
+from app.services.rollups import reconstruir
+
+
+def _hora(fecha: datetime) -> datetime:
+    fecha = fecha.replace(tzinfo=timezone.utc) if fecha.tzinfo is None else fecha.astimezone(timezone.utc)
+    return fecha.replace(minute=0, second=0, microsecond=0)
+
+
+def tramos(desde: datetime, hasta: datetime, horas: int) -> Iterator[Tuple[datetime, datetime]]:
+    paso = timedelta(hours=horas)
+    inicio = desde
+    while inicio < hasta:
+        fin = min(inicio + paso, hasta)
+        yield inicio, fin
+        inicio = fin
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.tasks.rollups")
+    parser.add_argument("--desde", type=date.fromisoformat, help="por defecto, el primer cierre registrado")
+    parser.add_argument("--hasta", type=date.fromisoformat, help="exclusivo; por defecto, la hora actual")
+    parser.add_argument("--horas", type=int, default=24, help="horas por tramo")
+    args = parser.parse_args(argv)
+
+    if args.desde is not None:
+        desde = datetime.combine(args.desde, datetime.min.time(), tzinfo=timezone.utc)
+    else:
+        with session_scope() as session:
+            primero = session.scalar(select(func.min(Venta.cerrada_at)))
+        if primero is None:
+            print("No hay ventas cerradas")
+            return 0
+        desde = _hora(primero)
+    if args.hasta is not None:
+        hasta = datetime.combine(args.hasta, datetime.min.time(), tzinfo=timezone.utc)
+    else:
+        hasta = _hora(datetime.now(timezone.utc)) + timedelta(hours=1)
+
+    for inicio, fin in tramos(desde, hasta, args.horas):
+        with session_scope() as session:
+            reconstruir(session, inicio, fin)
+        print(f"{inicio.isoformat()} - {fin.isoformat()}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -1,11 +1,78 @@
-"""Script simple para poblar datos demo en la base local."""
-from datetime import datetime
+"""Datos demo para la base local y generador de volumen sintético.
 
+    python -m app.tasks.seed
+    python -m app.tasks.seed --clientes 100000 --ventas 2000000 --days 365 [--semilla 42]
+
+Sin opciones carga sólo las cuentas iniciales. Con `--ventas` genera además un historial
+consistente: catálogo con recetas, clientes, turnos por caja y día, ventas con ítems,
+pagos y descuentos, movimientos de stock (consumo por receta y compras de reposición) y
+saldos de caja. Todo va con `INSERT` de Core en lotes e ids asignados de antemano, sin
+pasar por la unidad de trabajo del ORM; cada día se confirma por separado y se
+recalculan sus acumulados horarios. La misma semilla produce los mismos datos.
+"""
+import argparse
+import random
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from itertools import accumulate
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import Table, bindparam, delete, func, select, text
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.security import get_password_hash
-from app.db.session import SessionLocal
-from app.models.models import Caja, CategoriaProducto, Cliente, RoleEnum, Usuario
+from app.db.base import Base
+from app.db.session import SessionLocal, session_scope
+from app.models.models import (
+    Caja,
+    CategoriaProducto,
+    Cliente,
+    Descuento,
+    DescuentoTipo,
+    Ingrediente,
+    MedioPago,
+    Mesa,
+    MovimientoCaja,
+    MovimientoOrigen,
+    MovimientoTipo,
+    Pago,
+    Producto,
+    Receta,
+    RecetaItem,
+    ReporteCache,
+    RoleEnum,
+    StockMovimiento,
+    StockMovimientoTipo,
+    Turno,
+    TurnoSaldo,
+    Usuario,
+    Venta,
+    VentaEstado,
+    VentaItem,
+    VentaTipo,
+    usuario_caja_association,
+)
+from app.services.rollups import reconstruir
+
+CENTAVO = Decimal("0.01")
+
+CATEGORIAS = {
+    "Cafetería": ["Cafés", "Tés e infusiones"],
+    "Bebidas": ["Gaseosas", "Jugos", "Cervezas"],
+    "Cocina": ["Platos del día", "Sándwiches", "Ensaladas"],
+    "Panadería": ["Facturas", "Tortas"],
+}
+UNIDADES = ("g", "ml", "u")
+# Peso relativo de cada hora local en las ventas del día: pico de almuerzo y de merienda.
+HORAS = {8: 3, 9: 5, 10: 4, 11: 5, 12: 12, 13: 14, 14: 8, 15: 4, 16: 6, 17: 8, 18: 6, 19: 4, 20: 5, 21: 6, 22: 3}
+MEDIOS = (MedioPago.EFECTIVO, MedioPago.DEBITO, MedioPago.CREDITO, MedioPago.MP_QR, MedioPago.TRANSFER)
+PESOS_MEDIOS = (35, 25, 10, 25, 5)
+SALDO_INICIAL = Decimal("20000.00")
 
 
 def seed_base(session: Session) -> None:
@@ -38,7 +105,520 @@ def seed_base(session: Session) -> None:
     session.commit()
 
 
-if __name__ == "__main__":  # pragma: no cover
-    with SessionLocal() as session:
+@dataclass
+class Volumen:
+    clientes: int = 1000
+    ventas: int = 10000
+    dias: int = 30
+    productos: int = 120
+    ingredientes: int = 80
+    mozos: int = 12
+    cajas: int = 2
+    mesas: int = 30
+    semilla: int = 42
+    lote: int = 5000
+
+
+@dataclass
+class Producido:
+    id: int
+    precio: Decimal
+    # Consumo por unidad vendida: {ingrediente_id: cantidad}; vacío si se descuenta el producto.
+    receta: Dict[int, float]
+    controla_stock: bool
+
+
+def _dinero(valor: Any) -> Decimal:
+    return Decimal(valor).quantize(CENTAVO)
+
+
+class Generador:
+    """Arma las filas en memoria y las escribe por tabla en lotes de `volumen.lote`."""
+
+    def __init__(self, session: Session, volumen: Volumen, hasta: date) -> None:
+        self.session = session
+        self.volumen = volumen
+        self.hasta = hasta
+        self.azar = random.Random(volumen.semilla)
+        self.zona = ZoneInfo(settings.timezone)
+        self.prefijo = f"s{volumen.semilla}"
+        self.ids: Dict[str, int] = {}
+        self.filas: Dict[Table, List[Dict[str, Any]]] = defaultdict(list)
+        self.conteos: Dict[str, int] = defaultdict(int)
+        self.stock: Dict[int, float] = defaultdict(float)
+        # Consumo diario esperado por ingrediente: fija el mínimo y el tamaño de las compras.
+        self.consumo_diario: Dict[int, float] = defaultdict(float)
+        self.productos: Dict[int, Producido] = {}
+        self.orden = {tabla: i for i, tabla in enumerate(Base.metadata.sorted_tables)}
+
+    # --- infraestructura -------------------------------------------------------------
+
+    def _id(self, modelo) -> int:
+        """Próximo id libre de la tabla; los ids se asignan acá para no leerlos de vuelta."""
+        tabla = modelo.__tablename__
+        if tabla not in self.ids:
+            self.ids[tabla] = (self.session.scalar(select(func.max(modelo.id))) or 0) + 1
+        siguiente = self.ids[tabla]
+        self.ids[tabla] += 1
+        return siguiente
+
+    def _agregar(self, modelo, **valores: Any) -> Dict[str, Any]:
+        tabla = modelo if isinstance(modelo, Table) else modelo.__table__
+        self.filas[tabla].append(valores)
+        return valores
+
+    def _volcar(self) -> None:
+        """Inserta lo acumulado respetando el orden de dependencias de la metadata."""
+        for tabla in sorted(self.filas, key=self.orden.__getitem__):
+            filas = self.filas[tabla]
+            for inicio in range(0, len(filas), self.volumen.lote):
+                self.session.execute(tabla.insert(), filas[inicio : inicio + self.volumen.lote])
+            self.conteos[tabla.name] += len(filas)
+        self.filas.clear()
+
+    def _utc(self, dia: date, hora: int, minuto: int = 0, segundo: int = 0) -> datetime:
+        return datetime.combine(dia, time(hora, minuto, segundo), tzinfo=self.zona).astimezone(timezone.utc)
+
+    # --- datos fijos -----------------------------------------------------------------
+
+    def _personal(self) -> Tuple[List[int], List[Tuple[int, int]]]:
+        existe = self.session.scalar(
+            select(Usuario.id).where(Usuario.username_lower.like(f"{self.prefijo}\\_%", escape="\\")).limit(1)
+        )
+        if existe is not None:
+            raise ValueError(f"Ya hay datos generados con la semilla {self.volumen.semilla}")
+        # Un solo hash para todas las cuentas sintéticas: bcrypt es deliberadamente lento.
+        hash_ = get_password_hash(self.prefijo)
+        mozos = []
+        for i in range(self.volumen.mozos):
+            mozos.append(self._id(Usuario))
+            self._agregar(
+                Usuario,
+                id=mozos[-1],
+                username_lower=f"{self.prefijo}_mozo{i + 1}",
+                nombre=f"Mozo {i + 1}",
+                rol=RoleEnum.MOZO,
+                password_hash=hash_,
+                pin_hash=hash_,
+                activo=True,
+            )
+        cajas = []
+        for i in range(self.volumen.cajas):
+            caja_id, cajero_id = self._id(Caja), self._id(Usuario)
+            cajas.append((caja_id, cajero_id))
+            self._agregar(Caja, id=caja_id, nombre=f"Caja {i + 1} ({self.prefijo})", activo=True)
+            self._agregar(
+                Usuario,
+                id=cajero_id,
+                username_lower=f"{self.prefijo}_cajero{i + 1}",
+                nombre=f"Cajero {i + 1}",
+                rol=RoleEnum.CAJA,
+                password_hash=hash_,
+                pin_hash=hash_,
+                activo=True,
+            )
+            self._agregar(usuario_caja_association, usuario_id=cajero_id, caja_id=caja_id)
+        return mozos, cajas
+
+    def _categorias(self) -> List[int]:
+        """Árbol de categorías por el ORM (son pocas filas): así los eventos mantienen la clausura."""
+        hojas = []
+        for raiz, subcategorias in CATEGORIAS.items():
+            padre = self._categoria(raiz, None)
+            hojas += [self._categoria(nombre, padre).id for nombre in subcategorias]
+        self.session.flush()
+        return hojas
+
+    def _categoria(self, nombre: str, padre: Optional[CategoriaProducto]) -> CategoriaProducto:
+        categoria = self.session.scalar(select(CategoriaProducto).where(CategoriaProducto.nombre == nombre))
+        if categoria is None:
+            categoria = CategoriaProducto(nombre=nombre, parent=padre)
+            self.session.add(categoria)
+            self.session.flush()
+        return categoria
+
+    def _catalogo(self, categorias: Sequence[int], ventas_por_dia: float) -> None:
+        azar, volumen = self.azar, self.volumen
+        ingredientes = []
+        for i in range(volumen.ingredientes):
+            ingredientes.append(self._id(Ingrediente))
+            self._agregar(
+                Ingrediente,
+                id=ingredientes[-1],
+                nombre=f"Ingrediente {i + 1} ({self.prefijo})",
+                categoria_id=azar.choice(categorias),
+                stock_actual=0.0,
+                stock_minimo=0.0,
+                unidad=azar.choice(UNIDADES),
+                activo=True,
+            )
+
+        for i in range(volumen.productos):
+            producto_id = self._id(Producto)
+            precio = _dinero(azar.randrange(800, 6000, 50))
+            controla_stock = azar.random() < 0.95
+            receta: Dict[int, float] = {}
+            # La mayoría se elabora; el resto (botellas, envasados) descuenta el propio producto.
+            if controla_stock and azar.random() < 0.85:
+                receta_id = self._id(Receta)
+                self._agregar(Receta, id=receta_id, producto_id=producto_id)
+                for ingrediente_id in azar.sample(ingredientes, k=min(len(ingredientes), azar.randint(2, 5))):
+                    receta[ingrediente_id] = round(azar.uniform(5, 150), 1)
+                    self._agregar(
+                        RecetaItem,
+                        id=self._id(RecetaItem),
+                        receta_id=receta_id,
+                        ingrediente_id=ingrediente_id,
+                        cantidad=receta[ingrediente_id],
+                    )
+            self._agregar(
+                Producto,
+                id=producto_id,
+                nombre=f"Producto {i + 1}",
+                sku=f"{self.prefijo.upper()}-{i + 1:05d}",
+                categoria_id=azar.choice(categorias),
+                precio_lista=precio,
+                controla_stock=controla_stock,
+                favoritos=azar.random() < 0.1,
+                activo=True,
+            )
+            self.productos[producto_id] = Producido(producto_id, precio, receta, controla_stock)
+
+        # Tres ítems por venta y 1,4 unidades por ítem en promedio, repartidos entre todos los productos.
+        unidades_por_producto = ventas_por_dia * 3 * 1.4 / max(1, len(self.productos))
+        for producto in self.productos.values():
+            for ingrediente_id, cantidad in producto.receta.items():
+                self.consumo_diario[ingrediente_id] += cantidad * unidades_por_producto
+
+    def _clientes(self) -> List[int]:
+        azar = self.azar
+        ids = []
+        for i in range(self.volumen.clientes):
+            ids.append(self._id(Cliente))
+            self._agregar(
+                Cliente,
+                id=ids[-1],
+                nombre=f"Cliente {i + 1}",
+                telefono=f"11{azar.randrange(10**8):08d}",
+                email=f"cliente{i + 1}.{self.prefijo}@example.com" if azar.random() < 0.6 else None,
+                descuento_pct=10.0 if azar.random() < 0.05 else None,
+                cta_corriente_saldo=0,
+            )
+            if len(ids) % self.volumen.lote == 0:
+                self._volcar()
+        return ids
+
+    def _mesas(self) -> List[int]:
+        ids = []
+        for i in range(self.volumen.mesas):
+            ids.append(self._id(Mesa))
+            self._agregar(Mesa, id=ids[-1], sala="Salón" if i < 20 else "Vereda", numero=f"{self.prefijo}-{i + 1}")
+        return ids
+
+    # --- historial -------------------------------------------------------------------
+
+    def _comprar(self, ingrediente_id: int, cantidad: float, fecha: datetime) -> None:
+        self.stock[ingrediente_id] += cantidad
+        self._agregar(
+            StockMovimiento,
+            tipo=StockMovimientoTipo.COMPRA,
+            ref_id=None,
+            ingrediente_id=ingrediente_id,
+            producto_id=None,
+            delta=cantidad,
+            fecha=fecha,
+            motivo="Reposición",
+            created_at=fecha,
+        )
+
+    def _dia(
+        self,
+        dia: date,
+        cantidad: int,
+        mozos: Sequence[int],
+        cajas: Sequence[Tuple[int, int]],
+        clientes: Sequence[int],
+        mesas: Sequence[int],
+    ) -> None:
+        azar = self.azar
+        apertura, cierre = self._utc(dia, 7), self._utc(dia, 23, 30)
+        turnos: Dict[int, Tuple[int, Dict[str, Any]]] = {}
+        saldos: Dict[int, Dict[str, Decimal]] = {}
+        for caja_id, cajero_id in cajas:
+            turno_id = self._id(Turno)
+            saldos[turno_id] = defaultdict(Decimal)
+            turnos[turno_id] = caja_id, self._agregar(
+                Turno,
+                id=turno_id,
+                caja_id=caja_id,
+                usuario_id=cajero_id,
+                abierto_at=apertura,
+                cerrado_at=cierre,
+                arqueo_ciego=False,
+                saldo_inicial=SALDO_INICIAL,
+                created_at=apertura,
+            )
+
+        productos = list(self.productos.values())
+        horas = list(HORAS)
+        pesos = list(accumulate(HORAS.values()))
+        for hora in sorted(azar.choices(horas, cum_weights=pesos, k=cantidad)):
+            cerrada_at = self._utc(dia, hora, azar.randrange(60), azar.randrange(60))
+            abierta_at = cerrada_at - timedelta(minutes=azar.randint(5, 50))
+            turno_id = azar.choice(list(turnos))
+            caja_id = turnos[turno_id][0]
+            venta_id = self._id(Venta)
+            tipo = azar.choices((VentaTipo.MESA, VentaTipo.MOSTRADOR, VentaTipo.ONLINE), (60, 35, 5))[0]
+
+            bruto = Decimal("0")
+            vendidos: Dict[int, float] = defaultdict(float)
+            for producto in azar.sample(productos, k=min(len(productos), azar.randint(1, 5))):
+                unidades = azar.choices((1, 2, 3), (70, 20, 10))[0]
+                bruto += producto.precio * unidades
+                vendidos[producto.id] += unidades
+                self._agregar(
+                    VentaItem,
+                    id=self._id(VentaItem),
+                    venta_id=venta_id,
+                    producto_id=producto.id,
+                    cantidad=float(unidades),
+                    precio_unitario=producto.precio,
+                    modificadores=None,
+                    created_at=abierta_at,
+                )
+
+            descuento = Decimal("0")
+            if azar.random() < 0.08:
+                descuento = _dinero(bruto * Decimal("0.10"))
+                self._agregar(
+                    Descuento,
+                    id=self._id(Descuento),
+                    tipo=DescuentoTipo.PORCENTUAL,
+                    valor=10.0,
+                    motivo="Promoción",
+                    venta_id=venta_id,
+                    cliente_id=None,
+                    created_at=cerrada_at,
+                )
+            neto = bruto - descuento
+            propina = Decimal("0")
+            if tipo == VentaTipo.MESA and azar.random() < 0.3:
+                propina = _dinero(neto * Decimal("0.10"))
+
+            a_cobrar = neto + propina
+            medios = azar.choices(MEDIOS, PESOS_MEDIOS, k=2 if azar.random() < 0.1 else 1)
+            montos = [a_cobrar] if len(medios) == 1 else [_dinero(a_cobrar / 2), a_cobrar - _dinero(a_cobrar / 2)]
+            for medio, monto in zip(medios, montos):
+                saldos[turno_id][medio.value] += monto
+                self._agregar(
+                    Pago,
+                    id=self._id(Pago),
+                    venta_id=venta_id,
+                    medio=medio,
+                    monto=monto,
+                    referencia=None,
+                    created_at=cerrada_at,
+                )
+
+            self._agregar(
+                Venta,
+                id=venta_id,
+                tipo=tipo,
+                mesa_id=azar.choice(mesas) if tipo == VentaTipo.MESA and mesas else None,
+                cliente_id=azar.choice(clientes) if clientes and azar.random() < 0.3 else None,
+                mozo_id=azar.choice(mozos),
+                caja_id=caja_id,
+                turno_id=turno_id,
+                estado=VentaEstado.CERRADA,
+                total_bruto=bruto,
+                total_descuento=descuento,
+                total_neto=neto,
+                propina=propina,
+                cerrada_at=cerrada_at,
+                created_at=abierta_at,
+            )
+            self._consumir(venta_id, vendidos, cerrada_at)
+
+        # Reposición al cierre para los ingredientes que quedaron por debajo de dos días de consumo.
+        for ingrediente_id, diario in self.consumo_diario.items():
+            if self.stock[ingrediente_id] < 2 * diario:
+                self._comprar(ingrediente_id, round(7 * diario, 1), self._utc(dia, 22))
+
+        for turno_id, (_, turno) in turnos.items():
+            efectivo = saldos[turno_id][MedioPago.EFECTIVO.value]
+            retiro = _dinero(efectivo / 2)
+            if retiro:
+                self._agregar(
+                    MovimientoCaja,
+                    id=self._id(MovimientoCaja),
+                    turno_id=turno_id,
+                    tipo=MovimientoTipo.EGRESO,
+                    origen=MovimientoOrigen.MANUAL,
+                    monto=retiro,
+                    medio_pago=MedioPago.EFECTIVO.value,
+                    descripcion="Retiro a tesorería",
+                    created_at=cierre - timedelta(minutes=15),
+                )
+            for medio in {MedioPago.EFECTIVO.value, *saldos[turno_id]}:
+                inicial = SALDO_INICIAL if medio == MedioPago.EFECTIVO.value else Decimal("0")
+                egresos = retiro if medio == MedioPago.EFECTIVO.value else Decimal("0")
+                ingresos = saldos[turno_id][medio]
+                self._agregar(
+                    TurnoSaldo,
+                    turno_id=turno_id,
+                    medio=medio,
+                    inicial=inicial,
+                    ingresos=ingresos,
+                    egresos=egresos,
+                    declarado=inicial + ingresos - egresos,
+                )
+            turno["saldo_final"] = SALDO_INICIAL + efectivo - retiro
+
+    def _consumir(self, venta_id: int, vendidos: Dict[int, float], fecha: datetime) -> None:
+        """Mismos movimientos que `descontar_stock_venta`: uno por ingrediente y uno por producto sin receta."""
+        por_ingrediente: Dict[int, float] = defaultdict(float)
+        por_producto: Dict[int, float] = {}
+        for producto_id, cantidad in vendidos.items():
+            producto = self.productos[producto_id]
+            if not producto.controla_stock:
+                continue
+            if producto.receta:
+                for ingrediente_id, por_unidad in producto.receta.items():
+                    por_ingrediente[ingrediente_id] -= por_unidad * cantidad
+            else:
+                por_producto[producto_id] = -cantidad
+        motivo = f"Venta #{venta_id}"
+        for ingrediente_id, delta in sorted(por_ingrediente.items()):
+            self.stock[ingrediente_id] += delta
+            self._agregar(
+                StockMovimiento,
+                tipo=StockMovimientoTipo.RECETA,
+                ref_id=venta_id,
+                ingrediente_id=ingrediente_id,
+                producto_id=None,
+                delta=delta,
+                fecha=fecha,
+                motivo=motivo,
+                created_at=fecha,
+            )
+        for producto_id, delta in sorted(por_producto.items()):
+            self._agregar(
+                StockMovimiento,
+                tipo=StockMovimientoTipo.VENTA,
+                ref_id=venta_id,
+                ingrediente_id=None,
+                producto_id=producto_id,
+                delta=delta,
+                fecha=fecha,
+                motivo=motivo,
+                created_at=fecha,
+            )
+
+    def generar(self, progreso: Callable[[str], None] = print) -> Dict[str, int]:
+        volumen, session = self.volumen, self.session
+        inicio = perf_counter()
+        dias = [self.hasta - timedelta(days=n) for n in range(volumen.dias, 0, -1)]
+        # Fines de semana con más movimiento; el reparto es exacto: la suma da `volumen.ventas`.
+        pesos = [1.3 if d.weekday() >= 5 else 1.0 for d in dias]
+        cortes = [round(volumen.ventas * p / sum(pesos)) for p in accumulate(pesos)]
+        por_dia = [b - a for a, b in zip([0, *cortes], cortes)]
+
+        mozos, cajas = self._personal()
+        categorias = self._categorias()
+        self._catalogo(categorias, volumen.ventas / max(1, volumen.dias))
+        mesas = self._mesas()
+        if dias:
+            # Stock de arranque para la primera semana.
+            for ingrediente_id, diario in self.consumo_diario.items():
+                self._comprar(ingrediente_id, round(7 * diario, 1), self._utc(dias[0], 6))
+        self._volcar()
+        clientes = self._clientes()
+        self._volcar()
+        session.commit()
+
+        for dia, cantidad in zip(dias, por_dia):
+            self._dia(dia, cantidad, mozos, cajas, clientes, mesas)
+            self._volcar()
+            reconstruir(session, self._utc(dia, 0), self._utc(dia + timedelta(days=1), 0))
+            session.commit()
+            progreso(f"{dia.isoformat()}: {cantidad} ventas ({perf_counter() - inicio:.1f} s)")
+
+        self._cerrar()
+        session.commit()
+        return dict(self.conteos)
+
+    def _cerrar(self) -> None:
+        """Saldos de stock, caché de reportes y secuencias, que los INSERT de Core no tocan."""
+        session = self.session
+        tabla = Ingrediente.__table__
+        if self.stock:
+            session.execute(
+                tabla.update()
+                .where(tabla.c.id == bindparam("ingrediente_id"))
+                .values(stock_actual=bindparam("saldo"), stock_minimo=bindparam("minimo")),
+                [
+                    {"ingrediente_id": i, "saldo": saldo, "minimo": round(2 * self.consumo_diario[i], 1)}
+                    for i, saldo in self.stock.items()
+                ],
+            )
+        session.execute(delete(ReporteCache))
+        if session.get_bind().dialect.name == "postgresql":
+            for tabla in self.ids:
+                session.execute(
+                    text(f"SELECT setval(pg_get_serial_sequence('{tabla}', 'id'), (SELECT max(id) FROM {tabla}))")
+                )
+
+
+def generar(
+    session: Session, volumen: Volumen, hasta: Optional[date] = None, progreso: Callable[[str], None] = print
+) -> Dict[str, int]:
+    """Genera `volumen.dias` días de historial que terminan el día anterior a `hasta` (hoy, por defecto)."""
+    return Generador(session, volumen, hasta or datetime.now(timezone.utc).date()).generar(progreso)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.tasks.seed")
+    parser.add_argument("--clientes", type=int, default=0, help="clientes sintéticos")
+    parser.add_argument("--ventas", type=int, default=0, help="ventas cerradas (0: sólo cuentas demo)")
+    parser.add_argument("--days", "--dias", dest="dias", type=int, default=Volumen.dias, help="días de historial")
+    parser.add_argument("--productos", type=int, default=Volumen.productos)
+    parser.add_argument("--ingredientes", type=int, default=Volumen.ingredientes)
+    parser.add_argument("--mozos", type=int, default=Volumen.mozos)
+    parser.add_argument("--cajas", type=int, default=Volumen.cajas)
+    parser.add_argument("--semilla", type=int, default=Volumen.semilla, help="misma semilla, mismos datos")
+    parser.add_argument("--lote", type=int, default=Volumen.lote, help="filas por INSERT")
+    parser.add_argument("--hasta", type=date.fromisoformat, default=None, help="día siguiente al último generado")
+    args = parser.parse_args(argv)
+
+    with session_scope() as session:
         seed_base(session)
-        print("Datos demo cargados", datetime.utcnow())
+    print("Datos demo cargados", datetime.now(timezone.utc))
+    if not args.ventas and not args.clientes:
+        return 0
+
+    volumen = Volumen(
+        clientes=args.clientes,
+        ventas=args.ventas,
+        dias=args.dias,
+        productos=args.productos,
+        ingredientes=args.ingredientes,
+        mozos=args.mozos,
+        cajas=args.cajas,
+        semilla=args.semilla,
+        lote=args.lote,
+    )
+    inicio = perf_counter()
+    with SessionLocal() as session:
+        try:
+            conteos = generar(session, volumen, args.hasta)
+        except ValueError as exc:
+            print(exc)
+            return 1
+    for tabla, filas in sorted(conteos.items()):
+        print(f"{tabla}\t{filas}")
+    print(f"{sum(conteos.values())} filas en {perf_counter() - inicio:.1f} s")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
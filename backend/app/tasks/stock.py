@@ -0,0 +1,42 @@
+"""Tareas de stock para cron: snapshot diario y reconciliación del saldo contra el libro.
+
+    python -m app.tasks.stock snapshot [--fecha AAAA-MM-DD]
+    python -m app.tasks.stock reconciliar [--corregir]
+
+Las alertas de stock mínimo que deje una corrección se publican en el hub de este proceso
+y no llegan a las pantallas; para avisarles, corregir con `POST /api/stock/reconciliacion`.
+"""
+import argparse
+from datetime import date, datetime, timezone
+from typing import List, Optional
+
+from app.db.session import session_scope
+from app.services.stock import corte_diario, crear_snapshots, reconciliar
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.tasks.stock")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    snapshot = comandos.add_parser("snapshot", help="graba el saldo de cada ingrediente al inicio del día")
+    snapshot.add_argument("--fecha", type=date.fromisoformat, default=None, help="día del corte (por defecto hoy, UTC)")
+    conciliacion = comandos.add_parser("reconciliar", help="compara stock_actual contra snapshot + movimientos")
+    conciliacion.add_argument("--corregir", action="store_true", help="ajusta stock_actual al saldo del libro")
+    conciliacion.add_argument("--tolerancia", type=float, default=1e-6)
+    args = parser.parse_args(argv)
+
+    with session_scope() as session:
+        if args.comando == "snapshot":
+            corte = corte_diario(args.fecha or datetime.now(timezone.utc).date())
+            print(f"Snapshot {corte.isoformat()}: {crear_snapshots(session, corte)} ingredientes")
+            return 0
+
+        encontradas = reconciliar(session, corregir=args.corregir, tolerancia=args.tolerancia)
+        for d in encontradas:
+            print(f"{d.ingrediente_id}\t{d.nombre}\tactual={d.stock_actual:g}\tlibro={d.stock_libro:g}\tdif={d.diferencia:+g}")
+        estado = "corregidas" if args.corregir else "encontradas"
+        print(f"{len(encontradas)} discrepancias {estado}")
+    return 1 if encontradas and not args.corregir else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,104 @@
+import os
+import tempfile
+
+_db_dir = tempfile.mkdtemp(prefix="cafeteria-tests-")
+os.environ["SYNC_DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_dir}/test.db"
+os.environ["METRICS_ENABLED"] = "true"
+
+from contextlib import contextmanager  # noqa: E402
+from typing import Callable, ContextManager, Dict, Generator, Iterator  # noqa: E402
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.api.pagination import count_cache  # noqa: E402
+from app.core.security import create_token, get_password_hash, intentos_ip, intentos_usuario  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.profiling import ConteoSQL  # noqa: E402
+from app.db.session import SessionLocal, async_engine, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.models import RoleEnum, Usuario  # noqa: E402
+from app.services.catalogo import catalogo_cache  # noqa: E402
+from app.services.configuracion import config_store  # noqa: E402
+from app.services.precios import price_resolver  # noqa: E402
+from app.services.principal import principal_cache  # noqa: E402
+from app.services.stock import bom_cache  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _schema() -> Generator[None, None, None]:
+    Base.metadata.create_all(engine)
+    principal_cache.clear()
+    count_cache.clear()
+    bom_cache.clear()
+    price_resolver.invalidate()
+    catalogo_cache.invalidate()
+    config_store.invalidate()
+    intentos_usuario.clear()
+    intentos_ip.clear()
+    yield
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def db() -> Generator[Session, None, None]:
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def client() -> TestClient:
+    return TestClient(app)
+
+
+@pytest.fixture
+def make_user(db: Session) -> Callable[..., Dict[str, str]]:
+    """Crea un usuario y devuelve los headers Authorization listos para usar."""
+
+    def factory(username: str = "admin", rol: RoleEnum = RoleEnum.ADMIN, pin: str = "1234") -> Dict[str, str]:
+        db.add(
+            Usuario(
+                username_lower=username,
+                nombre=username.title(),
+                rol=rol,
+                password_hash=get_password_hash("secreto"),
+                pin_hash=get_password_hash(pin),
+            )
+        )
+        db.commit()
+        return {"Authorization": f"Bearer {create_token(username)}"}
+
+    return factory
+
+
+@pytest.fixture
+def query_budget() -> Callable[[int], ContextManager[ConteoSQL]]:
+    """`with query_budget(n) as consultas:` falla el test si el bloque ejecuta más de `n` sentencias SQL.
+
+    Escucha los dos engines directamente: el TestClient atiende en otro hilo, fuera del
+    contexto del test.
+    """
+
+    @contextmanager
+    def presupuesto(maximo: int) -> Iterator[ConteoSQL]:
+        conteo = ConteoSQL()
+
+        def registrar(conn, cursor, statement, *args) -> None:
+            conteo.registrar(statement, 0.0)
+
+        motores = (engine, async_engine.sync_engine)
+        for motor in motores:
+            event.listen(motor, "before_cursor_execute", registrar)
+        try:
+            yield conteo
+        finally:
+            for motor in motores:
+                event.remove(motor, "before_cursor_execute", registrar)
+        if conteo.sentencias > maximo:
+            detalle = conteo.resumen()
+            pytest.fail(f"{conteo.sentencias} sentencias SQL (presupuesto {maximo}):\n{detalle}", pytrace=False)
+
+    return presupuesto
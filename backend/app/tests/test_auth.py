@@ -0,0 +1,72 @@
+from sqlalchemy import event
+
+from app.core.security import hash_metrics, intentos_ip
+from app.db.session import async_engine
+from app.models.models import RoleEnum, Usuario
+from app.services.principal import principal_cache
+
+
+def test_role_checks_served_from_principal_cache(client, make_user) -> None:
+    headers = make_user()
+    statements: list[str] = []
+
+    def track(conn, cursor, statement, *args) -> None:
+        if "FROM usuarios" in statement:
+            statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", track)
+    try:
+        for _ in range(3):
+            assert client.get("/api/auth/me", headers=headers).status_code == 200
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", track)
+
+    assert len(statements) == 1
+    assert principal_cache.get("admin") is not None
+
+
+def test_update_usuario_invalidates_cached_principal(client, make_user, db) -> None:
+    admin_headers = make_user()
+    mozo_headers = make_user("mozo1", RoleEnum.MOZO)
+    assert client.get("/api/clientes/", headers=mozo_headers).status_code == 200
+
+    mozo_id = db.query(Usuario.id).filter(Usuario.username_lower == "mozo1").scalar()
+    response = client.put(f"/api/usuarios/{mozo_id}", json={"activo": False}, headers=admin_headers)
+    assert response.status_code == 200
+
+    assert principal_cache.get("mozo1") is None
+    assert client.get("/api/clientes/", headers=mozo_headers).status_code == 403
+
+
+def test_pin_login_issues_tokens_and_records_hash_metrics(client, make_user) -> None:
+    make_user("mozo1", RoleEnum.MOZO, pin="5678")
+    antes = hash_metrics.snapshot()["verificaciones"]
+
+    response = client.post("/api/auth/pin-login", json={"username": "Mozo1", "pin": "5678"})
+    assert response.status_code == 200
+    me = client.get("/api/auth/me", headers={"Authorization": f"Bearer {response.json()['access_token']}"})
+    assert me.json()["username"] == "mozo1"
+
+    assert client.post("/api/auth/pin-login", json={"username": "mozo1", "pin": "0000"}).status_code == 401
+    assert hash_metrics.snapshot()["verificaciones"] == antes + 2
+
+
+def test_pin_login_locks_out_after_repeated_failures(client, make_user, monkeypatch) -> None:
+    make_user("mozo1", RoleEnum.MOZO, pin="5678")
+    make_user("mozo2", RoleEnum.MOZO, pin="4321")
+
+    for pin in ("0000", "0001", "0002", "0003", "0004"):
+        assert client.post("/api/auth/pin-login", json={"username": "mozo1", "pin": pin}).status_code == 401
+    bloqueado = client.post("/api/auth/pin-login", json={"username": "MOZO1", "pin": "5678"})
+    assert bloqueado.status_code == 429
+    assert int(bloqueado.headers["Retry-After"]) > 0
+    assert client.post("/api/auth/login", json={"username": "mozo1", "password": "secreto"}).status_code == 429
+    # El bloqueo es por usuario: otro mozo desde la misma terminal sigue entrando.
+    assert client.post("/api/auth/pin-login", json={"username": "mozo2", "pin": "4321"}).status_code == 200
+
+    # Usuario inexistente: también se verifica un hash (mismo tiempo) y cuenta para la IP.
+    monkeypatch.setattr(intentos_ip, "maximo", 6)
+    antes = hash_metrics.snapshot()["verificaciones"]
+    assert client.post("/api/auth/pin-login", json={"username": "nadie", "pin": "1234"}).status_code == 401
+    assert hash_metrics.snapshot()["verificaciones"] == antes + 1
+    assert client.post("/api/auth/pin-login", json={"username": "mozo2", "pin": "4321"}).status_code == 429
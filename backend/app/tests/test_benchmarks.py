@@ -0,0 +1,27 @@
+import asyncio
+import json
+
+from app.benchmarks import metricas
+from app.benchmarks.almuerzo import Parametros, correr
+
+
+def test_lunch_scenario_runs_without_errors(tmp_path) -> None:
+    resultado = asyncio.run(correr(Parametros(mozos=2, ventas_por_mozo=2, items_por_venta=2, cocinas=1)))
+
+    endpoints = resultado["endpoints"]
+    assert endpoints["POST /ventas/"]["n"] == 4
+    assert endpoints["POST /ventas/{id}/cerrar"]["n"] == 4
+    assert endpoints["POST /caja/turnos/{id}/cerrar"]["n"] == 1
+    assert all(e["errores"] == 0 for e in endpoints.values())
+    assert all(e["p50_ms"] <= e["p95_ms"] <= e["p99_ms"] <= e["max_ms"] for e in endpoints.values())
+
+    ruta = metricas.guardar("almuerzo", resultado, tmp_path)
+    assert json.loads(ruta.read_text())["pedidos"] == resultado["pedidos"]
+    assert metricas.anterior("almuerzo", ruta, tmp_path) is None
+
+
+def test_regressions_respect_tolerance() -> None:
+    previo = {"GET /x": {"p95_ms": 10.0}, "GET /y": {"p95_ms": 10.0}}
+    actual = {"GET /x": {"p95_ms": 11.0}, "GET /y": {"p95_ms": 15.0}, "GET /z": {"p95_ms": 1.0}}
+
+    assert metricas.regresiones(previo, actual, "p95_ms", 0.2) == ["GET /y: p95_ms 10.0 -> 15.0 (+50%)"]
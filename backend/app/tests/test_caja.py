@@ -0,0 +1,91 @@
+from decimal import Decimal
+
+import pytest
+
+from app.models.models import Caja, CategoriaProducto, Producto, RoleEnum, Turno
+
+
+@pytest.fixture
+def caja_id(db) -> int:
+    caja = Caja(nombre="Caja 1")
+    db.add(caja)
+    db.commit()
+    return caja.id
+
+
+@pytest.fixture
+def producto_id(db) -> int:
+    categoria = CategoriaProducto(nombre="Cafetería")
+    db.add(categoria)
+    db.flush()
+    producto = Producto(nombre="Café", sku="CAF", categoria_id=categoria.id, precio_lista=Decimal("1800.00"))
+    db.add(producto)
+    db.commit()
+    return producto.id
+
+
+def _cobrar(client, headers, turno_id: int, producto_id: int, pagos: list[tuple[str, str]]) -> None:
+    venta = client.post("/api/ventas/", json={"tipo": "mostrador", "turno_id": turno_id}, headers=headers).json()
+    url = f"/api/ventas/{venta['id']}"
+    client.post(f"{url}/items", json={"agregar": [{"producto_id": producto_id}]}, headers=headers)
+    for medio, monto in pagos:
+        assert client.post(f"{url}/pagos", json={"medio": medio, "monto": monto}, headers=headers).status_code == 201
+
+
+def test_running_balance_follows_movements_and_payments(client, make_user, db, caja_id, producto_id) -> None:
+    headers = make_user("caja1", RoleEnum.CAJA)
+    turno = client.post("/api/caja/turnos", json={"caja_id": caja_id, "saldo_inicial": "1000"}, headers=headers).json()
+    url = f"/api/caja/turnos/{turno['id']}"
+    assert client.post("/api/caja/turnos", json={"caja_id": caja_id}, headers=headers).status_code == 409
+
+    client.post(f"{url}/movimientos", json={"tipo": "ingreso", "monto": "500"}, headers=headers)
+    client.post(f"{url}/movimientos", json={"tipo": "egreso", "origen": "gasto", "monto": "200"}, headers=headers)
+    _cobrar(client, headers, turno["id"], producto_id, [("efectivo", "1500"), ("debito", "300")])
+
+    saldo = client.get(f"{url}/saldo", headers=headers).json()
+    assert {m["medio"]: Decimal(m["esperado"]) for m in saldo["medios"]} == {
+        "debito": Decimal("300"),
+        "efectivo": Decimal("2800"),
+    }
+    assert Decimal(saldo["esperado_total"]) == Decimal("3100")
+
+    cierre = client.post(f"{url}/cerrar", json={"declarado": {"efectivo": "2750"}}, headers=headers).json()
+    diferencias = {m["medio"]: Decimal(m["diferencia"]) for m in cierre["medios"]}
+    assert diferencias == {"debito": Decimal("0"), "efectivo": Decimal("-50")}
+    assert Decimal(cierre["turno"]["saldo_final"]) == Decimal("2750")
+    assert client.post(f"{url}/movimientos", json={"tipo": "ingreso", "monto": "1"}, headers=headers).status_code == 409
+    assert client.post(f"{url}/cerrar", json={}, headers=headers).status_code == 409
+
+
+def test_cash_change_is_not_counted_in_the_drawer(client, make_user, caja_id, producto_id) -> None:
+    headers = make_user("caja1", RoleEnum.CAJA)
+    turno = client.post("/api/caja/turnos", json={"caja_id": caja_id, "saldo_inicial": "1000"}, headers=headers).json()
+    venta = client.post("/api/ventas/", json={"tipo": "mostrador", "turno_id": turno["id"]}, headers=headers).json()
+    url = f"/api/ventas/{venta['id']}"
+    client.post(f"{url}/items", json={"agregar": [{"producto_id": producto_id}]}, headers=headers)
+
+    assert client.post(f"{url}/pagos", json={"medio": "debito", "monto": "2000"}, headers=headers).status_code == 400
+    pago = client.post(f"{url}/pagos", json={"medio": "efectivo", "monto": "3000"}, headers=headers).json()
+    assert Decimal(pago["pago"]["monto"]) == Decimal("1800") and Decimal(pago["vuelto"]) == Decimal("1200")
+    assert client.post(f"{url}/pagos", json={"medio": "efectivo", "monto": "100"}, headers=headers).status_code == 409
+
+    saldo = client.get(f"/api/caja/turnos/{turno['id']}/saldo", headers=headers).json()
+    assert {m["medio"]: Decimal(m["esperado"]) for m in saldo["medios"]} == {"efectivo": Decimal("2800")}
+
+
+def test_blind_count_hides_expected_balance_from_cashier(client, make_user, db, caja_id) -> None:
+    cajero = make_user("caja1", RoleEnum.CAJA)
+    admin = make_user("admin")
+    turno = client.post(
+        "/api/caja/turnos", json={"caja_id": caja_id, "saldo_inicial": "1000", "arqueo_ciego": True}, headers=cajero
+    ).json()
+    url = f"/api/caja/turnos/{turno['id']}"
+
+    assert client.get(f"{url}/saldo", headers=cajero).status_code == 403
+    assert client.get(f"{url}/saldo", headers=admin).status_code == 200
+    assert client.post(f"{url}/cerrar", json={}, headers=cajero).status_code == 400
+
+    cierre = client.post(f"{url}/cerrar", json={"declarado": {"efectivo": "1000"}}, headers=cajero).json()
+    assert Decimal(cierre["diferencia_total"]) == 0
+    assert db.get(Turno, turno["id"]).cerrado_at is not None
+    assert client.get(f"{url}/saldo", headers=cajero).status_code == 200
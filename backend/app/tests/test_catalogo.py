@@ -0,0 +1,88 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+from app.db.session import async_engine
+from app.models.models import CategoriaProducto, ListaPrecio, ListaPrecioItem, Producto
+
+
+@pytest.fixture
+def carta(db) -> dict:
+    categoria = CategoriaProducto(nombre="Bar")
+    db.add(categoria)
+    db.flush()
+    cerveza = Producto(nombre="Cerveza", sku="CER", categoria_id=categoria.id, precio_lista=Decimal("1000"))
+    agua = Producto(nombre="Agua", sku="AGU", categoria_id=categoria.id, precio_lista=Decimal("500"))
+    db.add_all([cerveza, agua])
+    db.flush()
+    db.add(ListaPrecio(nombre="Salón", activa=True, items=[ListaPrecioItem(producto_id=cerveza.id, precio=1200)]))
+    db.commit()
+    return {"cerveza": cerveza, "agua": agua}
+
+
+def test_snapshot_is_served_compressed_and_revalidated_without_queries(client, make_user, carta) -> None:
+    headers = make_user()
+    response = client.get("/api/catalogo/", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    etag = response.headers["etag"]
+    body = response.json()
+    assert body["completo"] is True
+    assert {p["sku"]: p["precio"] for p in body["productos"]} == {"CER": "1200.00", "AGU": "500.00"}
+
+    statements: list[str] = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        revalidado = client.get("/api/catalogo/", headers={**headers, "If-None-Match": etag})
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+    assert revalidado.status_code == 304
+    assert revalidado.headers["etag"] == etag
+    assert not any("productos" in s for s in statements)
+
+    plano = client.get("/api/catalogo/", headers={**headers, "Accept-Encoding": "identity"})
+    assert "content-encoding" not in plano.headers
+    assert plano.json() == body
+
+
+def test_changes_invalidate_snapshot_and_since_returns_delta(client, db, make_user, carta) -> None:
+    headers = make_user()
+    anterior = client.get("/api/catalogo/", headers=headers)
+    version = anterior.json()["version"]
+
+    carta["agua"].precio_lista = Decimal("550")
+    carta["cerveza"].activo = False
+    db.commit()
+
+    actual = client.get("/api/catalogo/", headers={**headers, "If-None-Match": anterior.headers["etag"]})
+    assert actual.status_code == 200
+    assert [p["sku"] for p in actual.json()["productos"]] == ["AGU"]
+
+    delta = client.get("/api/catalogo/", params={"since": version}, headers=headers).json()
+    assert delta["completo"] is False
+    assert delta["version"] == actual.json()["version"]
+    cambios = {p["sku"]: p for p in delta["productos"]}
+    assert cambios["AGU"]["precio"] == "550.00"
+    assert cambios["CER"]["activo"] is False
+    assert delta["producto_ids"] == [carta["agua"].id]
+
+    assert client.get("/api/catalogo/", params={"since": "x"}, headers=headers).status_code == 400
+
+
+def test_deleted_list_item_reaches_tablets_through_since(client, db, make_user, carta) -> None:
+    headers = make_user()
+    version = client.get("/api/catalogo/", headers=headers).json()["version"]
+
+    db.delete(db.query(ListaPrecioItem).one())
+    db.commit()
+
+    completo = client.get("/api/catalogo/", headers=headers).json()
+    assert {p["sku"]: p["precio"] for p in completo["productos"]}["CER"] == "1000.00"
+    delta = client.get("/api/catalogo/", params={"since": version}, headers=headers).json()
+    assert delta["version"] == completo["version"] != version
+    assert [(p["sku"], p["precio"]) for p in delta["productos"]] == [("CER", "1000.00")]
+
+    # Una versión que la base no conoce (otra base, o anterior a este esquema) recibe el catálogo completo.
+    assert client.get("/api/catalogo/", params={"since": "999999999.1"}, headers=headers).json()["completo"] is True
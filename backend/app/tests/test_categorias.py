@@ -0,0 +1,75 @@
+from decimal import Decimal
+
+from sqlalchemy import event, select
+
+from app.db.session import async_engine
+from app.models.models import CategoriaArbol, CategoriaProducto, Ingrediente, Producto
+
+
+def _caminos(db) -> set[tuple[int, int, int]]:
+    db.expire_all()
+    filas = db.execute(select(CategoriaArbol.ancestro_id, CategoriaArbol.descendiente_id, CategoriaArbol.profundidad))
+    return set(filas)
+
+
+def test_closure_is_maintained_on_create_and_move(client, db, make_user) -> None:
+    headers = make_user()
+
+    def crear(nombre: str, parent_id=None) -> int:
+        response = client.post("/api/categorias/", json={"nombre": nombre, "parent_id": parent_id}, headers=headers)
+        assert response.status_code == 201
+        return response.json()["id"]
+
+    bebidas = crear("Bebidas")
+    calientes = crear("Calientes", bebidas)
+    cafes = crear("Cafés", calientes)
+    comidas = crear("Comidas")
+    assert {(a, d) for a, d, p in _caminos(db) if d == cafes} == {(cafes, cafes), (calientes, cafes), (bebidas, cafes)}
+    assert client.post("/api/categorias/", json={"nombre": "Cafés"}, headers=headers).status_code == 409
+
+    response = client.put(f"/api/categorias/{calientes}/padre", json={"parent_id": comidas}, headers=headers)
+    assert response.json()["parent_id"] == comidas
+    assert {(a, d, p) for a, d, p in _caminos(db) if d == cafes} == {
+        (cafes, cafes, 0),
+        (calientes, cafes, 1),
+        (comidas, cafes, 2),
+    }
+    assert not any(a == bebidas and d != bebidas for a, d, p in _caminos(db))
+
+    ciclo = client.put(f"/api/categorias/{comidas}/padre", json={"parent_id": cafes}, headers=headers)
+    assert ciclo.status_code == 400
+
+    client.put(f"/api/categorias/{calientes}/padre", json={"parent_id": None}, headers=headers)
+    assert {(a, d) for a, d, p in _caminos(db) if d == cafes} == {(cafes, cafes), (calientes, cafes)}
+
+
+def test_subtree_is_read_in_one_query(client, db, make_user) -> None:
+    headers = make_user()
+    bebidas = CategoriaProducto(nombre="Bebidas")
+    calientes = CategoriaProducto(nombre="Calientes", parent=bebidas)
+    otra = CategoriaProducto(nombre="Comidas")
+    db.add_all([bebidas, calientes, otra])
+    db.flush()
+    db.add_all(
+        [
+            Producto(nombre="Agua", sku="AGU", categoria_id=bebidas.id, precio_lista=Decimal("500")),
+            Producto(nombre="Café", sku="CAF", categoria_id=calientes.id, precio_lista=Decimal("900")),
+            Producto(nombre="Tostado", sku="TOS", categoria_id=otra.id, precio_lista=Decimal("1500")),
+            Ingrediente(nombre="Café en grano", unidad="kg", categoria_id=calientes.id),
+        ]
+    )
+    db.commit()
+
+    statements: list[str] = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        body = client.get(f"/api/categorias/{bebidas.id}/arbol", headers=headers).json()
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+
+    assert len([s for s in statements if "categorias_productos_arbol" in s]) == 1
+    assert [(c["nombre"], c["profundidad"]) for c in body["categorias"]] == [("Bebidas", 0), ("Calientes", 1)]
+    assert [p["nombre"] for p in body["productos"]] == ["Agua", "Café"]
+    assert [i["nombre"] for i in body["ingredientes"]] == ["Café en grano"]
+    assert client.get("/api/categorias/999/arbol", headers=headers).status_code == 404
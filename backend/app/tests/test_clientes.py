@@ -0,0 +1,105 @@
+from io import BytesIO
+
+from openpyxl import Workbook
+
+from app.core.config import settings
+from app.models.models import Cliente
+
+
+def test_cursor_pagination_walks_every_cliente_once(client, make_user, db) -> None:
+    headers = make_user()
+    db.add_all([Cliente(nombre=f"Cliente {i:03d}") for i in range(25)])
+    db.commit()
+
+    first = client.get("/api/clientes/", params={"size": 10}, headers=headers).json()
+    assert first["total"] == 25
+    assert first["page"] == 1
+
+    seen = [c["id"] for c in first["items"]]
+    cursor = first["next_cursor"]
+    while cursor:
+        body = client.get("/api/clientes/", params={"size": 10, "cursor": cursor}, headers=headers).json()
+        assert body["total"] is None
+        seen.extend(c["id"] for c in body["items"])
+        cursor = body["next_cursor"]
+
+    assert seen == sorted(seen)
+    assert len(set(seen)) == 25
+
+
+def test_invalid_cursor_is_rejected(client, make_user) -> None:
+    headers = make_user()
+    response = client.get("/api/clientes/", params={"cursor": "no-es-un-cursor"}, headers=headers)
+    assert response.status_code == 400
+
+
+def test_import_csv_inserts_valid_rows_and_reports_rejects(client, make_user, db, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "import_batch_size", 2)
+    headers = make_user()
+    contenido = "nombre,telefono,email,descuento_pct\nAna,111,,\nBeto,,beto@x.com,5\n,222,,\nCarla,,,no-numero\nDani,,,\n"
+
+    response = client.post(
+        "/api/clientes/import", files={"archivo": ("clientes.csv", contenido, "text/csv")}, headers=headers
+    )
+    assert response.status_code == 202
+
+    job = client.get(f"/api/clientes/import/{response.json()['id']}", headers=headers).json()
+    assert job["estado"] == "completado"
+    assert (job["procesadas"], job["insertadas"], job["rechazadas_total"]) == (5, 3, 2)
+    assert [r["fila"] for r in job["rechazadas"]] == [4, 5]
+    assert sorted(n for (n,) in db.query(Cliente.nombre)) == ["Ana", "Beto", "Dani"]
+
+
+def test_import_xlsx_accepts_numeric_cells_and_refreshes_total(client, make_user, db) -> None:
+    headers = make_user()
+    db.add(Cliente(nombre="Previo"))
+    db.commit()
+    assert client.get("/api/clientes/", headers=headers).json()["total"] == 1
+
+    workbook = Workbook()
+    hoja = workbook.active
+    hoja.append(["nombre", "telefono", "email", "descuento_pct"])
+    hoja.append(["Ana", 1155550000, None, 10])
+    hoja.append(["Beto", 1144440000.0, "beto@x.com", 2.5])
+    hoja.append([None, 222, None, None])
+    contenido = BytesIO()
+    workbook.save(contenido)
+
+    response = client.post(
+        "/api/clientes/import", files={"archivo": ("clientes.xlsx", contenido.getvalue())}, headers=headers
+    )
+    job = client.get(f"/api/clientes/import/{response.json()['id']}", headers=headers).json()
+    assert (job["procesadas"], job["insertadas"], job["rechazadas_total"]) == (3, 2, 1)
+    importados = {c.nombre: (c.telefono, c.descuento_pct) for c in db.query(Cliente).filter(Cliente.nombre != "Previo")}
+    assert importados == {"Ana": ("1155550000", 10), "Beto": ("1144440000", 2.5)}
+    assert client.get("/api/clientes/", headers=headers).json()["total"] == 3
+
+
+def test_search_tracks_creates_updates_and_deletes(client, make_user, db) -> None:
+    headers = make_user()
+    db.add_all(
+        [
+            Cliente(nombre="Ana García", telefono="11-4455-0001", email="ana@mail.com"),
+            Cliente(nombre="Anabel Ruiz", telefono="11-9999-0002"),
+            Cliente(nombre="Bruno Díaz", email="bruno@cafe.com"),
+        ]
+    )
+    db.commit()
+
+    def buscar(q: str) -> list[str]:
+        response = client.get("/api/clientes/search", params={"q": q}, headers=headers)
+        assert response.status_code == 200
+        return sorted(c["nombre"] for c in response.json())
+
+    assert buscar("ana") == ["Ana García", "Anabel Ruiz"]
+    assert buscar("garcia") == ["Ana García"]
+    assert buscar("4455") == ["Ana García"]
+    assert buscar("bruno@cafe") == ["Bruno Díaz"]
+
+    bruno = db.query(Cliente).filter(Cliente.nombre == "Bruno Díaz").one()
+    client.put(f"/api/clientes/{bruno.id}", json={"nombre": "Bruno Anaya"}, headers=headers)
+    assert buscar("anaya") == ["Bruno Anaya"]
+    assert buscar("diaz") == []
+
+    client.delete(f"/api/clientes/{bruno.id}", headers=headers)
+    assert buscar("bruno") == []
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.main import app
+from app.models.models import RoleEnum, Usuario, Venta, VentaTipo
+from app.services.realtime import RESYNC, EventHub
+
+
+def test_hub_disconnects_slow_subscribers_and_replays_from_last_id() -> None:
+    async def scenario() -> None:
+        hub = EventHub(buffer_size=3, queue_size=2)
+        lenta = hub.subscribe()
+        barra = hub.subscribe(estacion="barra")
+        for i in range(3):
+            hub.publish("pedido_creado", {"n": i}, estacion="cocina")
+
+        assert lenta.cerrada and hub.suscriptores == 1
+        assert [e async for e in hub.eventos(lenta)] == []
+
+        repetidos = hub.subscribe(last_event_id=1)
+        assert [e.id for e in repetidos.pendientes] == [2, 3]
+        assert not hub.subscribe(estacion="barra", last_event_id=1).pendientes
+        assert [e.tipo for e in hub.subscribe(last_event_id=99).pendientes] == [RESYNC]
+        assert barra.queue.empty()
+
+    asyncio.run(scenario())
+
+
+def test_websocket_feed_pushes_creation_and_transitions(make_user, db) -> None:
+    mozo = make_user("mozo1", RoleEnum.MOZO)
+    cocina = make_user("cocina1", RoleEnum.COCINA)
+    token = cocina["Authorization"].split()[1]
+    venta = Venta(tipo=VentaTipo.MESA, mozo_id=db.query(Usuario.id).filter_by(username_lower="mozo1").scalar())
+    db.add(venta)
+    db.commit()
+    venta_id = venta.id
+
+    # Un único portal/event loop para que requests y websocket compartan el hub.
+    with TestClient(app) as client:
+        with client.websocket_connect(f"/api/cocina/ws?token={token}&estacion=barra") as ws:
+            client.post("/api/cocina/pedidos", json={"venta_id": venta_id, "estacion": "cocina"}, headers=mozo)
+            creado = client.post("/api/cocina/pedidos", json={"venta_id": venta_id, "estacion": "barra"}, headers=mozo)
+            pedido_id = creado.json()["id"]
+            client.patch(f"/api/cocina/pedidos/{pedido_id}/estado", json={"estado": "en_curso"}, headers=cocina)
+
+            primero = ws.receive_json()
+            assert (primero["tipo"], primero["data"]["id"]) == ("pedido_creado", pedido_id)
+            segundo = ws.receive_json()
+            assert (segundo["tipo"], segundo["data"]["estado"]) == ("pedido_actualizado", "en_curso")
+
+        invalida = client.patch(f"/api/cocina/pedidos/{pedido_id}/estado", json={"estado": "pendiente"}, headers=cocina)
+        assert invalida.status_code == 409
+
+        with client.websocket_connect(f"/api/cocina/ws?token={token}&estacion=barra&desde={primero['id']}") as ws:
+            assert ws.receive_json()["id"] == segundo["id"]
+
+        tablero = client.get("/api/cocina/pedidos", params={"estacion": "barra"}, headers=cocina).json()
+        assert [p["id"] for p in tablero["pedidos"]] == [pedido_id]
+
+
+def test_invalid_token_is_rejected_on_every_transport(client) -> None:
+    with pytest.raises(WebSocketDisconnect) as cierre:
+        with client.websocket_connect("/api/cocina/ws?token=basura"):
+            pass
+    assert cierre.value.code == status.WS_1008_POLICY_VIOLATION
+
+    assert client.get("/api/cocina/stream", params={"token": "basura"}).status_code == 401
+    assert client.get("/api/cocina/pedidos", headers={"Authorization": "Bearer basura"}).status_code == 401
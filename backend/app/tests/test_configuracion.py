@@ -0,0 +1,93 @@
+from sqlalchemy import event
+
+from app.api.pagination import count_cache
+from app.db.session import async_engine
+from app.models.models import Cliente, Config
+from app.services.configuracion import config_store
+
+
+def _consultas_config(client, headers) -> tuple[dict, list[str]]:
+    statements: list[str] = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        valores = client.get("/api/configuracion/", headers=headers).json()["valores"]
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+    return valores, [s for s in statements if "FROM config" in s]
+
+
+def test_values_are_typed_merged_with_settings_and_served_from_memory(client, make_user) -> None:
+    headers = make_user()
+    valores, consultas = _consultas_config(client, headers)
+    assert valores["count_cache_ttl_seconds"] == 30
+    assert "secret_key" not in valores
+    assert len(consultas) == 1
+
+    assert _consultas_config(client, headers)[1] == []
+
+    response = client.put("/api/configuracion/count_cache_ttl_seconds", json={"valor": "12.5"}, headers=headers)
+    assert response.json() == {"clave": "count_cache_ttl_seconds", "valor": 12.5}
+    client.put("/api/configuracion/nombre_local", json={"valor": "La Esquina"}, headers=headers)
+
+    valores, consultas = _consultas_config(client, headers)
+    assert valores["count_cache_ttl_seconds"] == 12.5
+    assert valores["nombre_local"] == "La Esquina"
+    assert len(consultas) == 1
+    assert config_store.get("count_cache_ttl_seconds") == 12.5
+    assert config_store.get("inexistente", "x") == "x"
+
+    assert client.delete("/api/configuracion/count_cache_ttl_seconds", headers=headers).status_code == 200
+    assert _consultas_config(client, headers)[0]["count_cache_ttl_seconds"] == 30
+
+
+def test_invalid_or_protected_values_are_rejected(client, make_user) -> None:
+    headers = make_user()
+    assert client.put("/api/configuracion/import_batch_size", json={"valor": "mil"}, headers=headers).status_code == 400
+    for clave, valor in (("export_batch_size", "0"), ("export_batch_size", "-5"), ("count_cache_ttl_seconds", "-1")):
+        assert client.put(f"/api/configuracion/{clave}", json={"valor": valor}, headers=headers).status_code == 400
+    assert client.put("/api/configuracion/secret_key", json={"valor": "x"}, headers=headers).status_code == 400
+    # Se lee una sola vez al iniciar: aceptarla no cambiaría nada.
+    assert client.put("/api/configuracion/metrics_enabled", json={"valor": "false"}, headers=headers).status_code == 400
+    assert client.delete("/api/configuracion/nada", headers=headers).status_code == 404
+
+
+def test_changes_from_other_workers_are_seen_after_poll_interval(client, db, make_user, monkeypatch) -> None:
+    headers = make_user()
+    client.get("/api/configuracion/", headers=headers)
+    # Otro worker escribe la fila: este proceso no recibe el evento de commit.
+    db.execute(Config.__table__.insert().values(k="import_batch_size", v="250"))
+    db.commit()
+    assert client.get("/api/configuracion/", headers=headers).json()["valores"]["import_batch_size"] == 1000
+
+    monkeypatch.setattr(config_store, "poll_seconds", 0)
+    assert client.get("/api/configuracion/", headers=headers).json()["valores"]["import_batch_size"] == 250
+
+    # Filas que no pasan por `guardar`: una clave fija o un lote inválido no se informan ni se aplican.
+    db.execute(Config.__table__.insert().values(k="hash_max_workers", v="64"))
+    db.execute(Config.__table__.update().where(Config.k == "import_batch_size").values(v="0"))
+    db.commit()
+    valores = client.get("/api/configuracion/", headers=headers).json()["valores"]
+    assert valores["hash_max_workers"] == 2 and valores["import_batch_size"] == 1000
+    assert config_store.get("hash_max_workers") == 2
+
+
+def test_count_cache_ttl_override_takes_effect_without_restart(client, db, make_user) -> None:
+    headers = make_user()
+
+    def total() -> int:
+        return client.get("/api/clientes/", headers=headers).json()["total"]
+
+    assert total() == 0
+    # Inserción por fuera de la API: el total cacheado no se entera.
+    db.add(Cliente(nombre="Ana"))
+    db.commit()
+    assert total() == 0
+
+    response = client.put("/api/configuracion/count_cache_ttl_seconds", json={"valor": "0"}, headers=headers)
+    assert response.status_code == 200
+    count_cache.clear()
+    assert total() == 1
+    db.add(Cliente(nombre="Beto"))
+    db.commit()
+    assert total() == 2
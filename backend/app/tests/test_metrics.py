@@ -0,0 +1,74 @@
+import re
+
+from sqlalchemy import create_engine
+
+from app.core import metrics
+from app.core.config import Settings, settings
+from app.core.metrics import Histograma, bcrypt_duracion, db_checkouts, http_duracion, http_requests
+from app.models.models import RoleEnum
+
+
+def test_middleware_labels_by_route_template(client, make_user) -> None:
+    headers = make_user("admin", RoleEnum.ADMIN)
+    ruta = "/api/clientes/{cliente_id}"
+    antes = http_duracion.conteo("GET", ruta)
+    checkouts = db_checkouts.valor("async")
+
+    assert client.get("/api/clientes/999999", headers=headers).status_code == 404
+    assert client.get("/api/clientes/999998", headers=headers).status_code == 404
+
+    assert http_duracion.conteo("GET", ruta) == antes + 2
+    assert http_requests.valor("GET", ruta, "404") >= 2
+    assert db_checkouts.valor("async") > checkouts
+
+    texto = client.get("/metrics").text
+    assert f'cafeteria_http_requests_total{{method="GET",route="{ruta}",status="404"}}' in texto
+    assert 'cafeteria_db_pool_connections{engine="async",estado="checkedout"} 0' in texto
+    assert "999999" not in texto
+
+
+def test_pool_gauge_skips_pools_without_counters(client, monkeypatch) -> None:
+    # SQLite en memoria usa SingletonThreadPool: `size` es un entero y no hay checkedout/overflow.
+    monkeypatch.setitem(metrics._ENGINES, "memoria", create_engine("sqlite://"))
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert 'engine="memoria"' not in response.text
+    assert 'cafeteria_db_pool_connections{engine="async",estado="size"}' in response.text
+
+
+def test_metrics_are_off_by_default_and_token_protected_when_configured(client, monkeypatch) -> None:
+    assert Settings.model_fields["metrics_enabled"].default is False
+
+    monkeypatch.setattr(settings, "metrics_token", "s3creto")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer otro"}).status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer s3creto"})
+    assert response.status_code == 200 and "cafeteria_http_requests_total" in response.text
+
+
+def test_login_records_bcrypt_timings(client, make_user) -> None:
+    make_user("mozo1", RoleEnum.MOZO, pin="5678")
+    antes = bcrypt_duracion.conteo("verificacion")
+
+    assert client.post("/api/auth/pin-login", json={"username": "mozo1", "pin": "5678"}).status_code == 200
+
+    assert bcrypt_duracion.conteo("verificacion") == antes + 1
+    assert bcrypt_duracion.conteo("espera") == bcrypt_duracion.conteo("verificacion")
+
+
+def test_histogram_accumulates_buckets() -> None:
+    histograma = Histograma("prueba_segundos", "Prueba", ("ruta",), buckets=(0.1, 1.0))
+    for valor in (0.05, 0.1, 0.5, 3.0):
+        histograma.observe(valor, 'a"b')
+
+    lineas = histograma.exponer()
+    assert lineas[:2] == ["# HELP prueba_segundos Prueba", "# TYPE prueba_segundos histogram"]
+    assert lineas[2:] == [
+        'prueba_segundos_bucket{ruta="a\\"b",le="0.1"} 2',
+        'prueba_segundos_bucket{ruta="a\\"b",le="1.0"} 3',
+        'prueba_segundos_bucket{ruta="a\\"b",le="+Inf"} 4',
+        'prueba_segundos_sum{ruta="a\\"b"} 3.65',
+        'prueba_segundos_count{ruta="a\\"b"} 4',
+    ]
+    assert all(re.fullmatch(r"[a-z_]+(\{.*\})? \S+", linea) for linea in lineas[2:])
@@ -0,0 +1,68 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+from app.db.session import async_engine
+from app.models.models import CategoriaProducto, ListaPrecio, ListaPrecioItem, Producto
+
+
+@pytest.fixture
+def carta(db) -> dict:
+    categoria = CategoriaProducto(nombre="Bar")
+    db.add(categoria)
+    db.flush()
+    cerveza = Producto(nombre="Cerveza", sku="CER", categoria_id=categoria.id, precio_lista=Decimal("1000"))
+    agua = Producto(nombre="Agua", sku="AGU", categoria_id=categoria.id, precio_lista=Decimal("500"))
+    db.add_all([cerveza, agua])
+    db.flush()
+    salon = ListaPrecio(nombre="Salón", activa=True, items=[ListaPrecioItem(producto_id=cerveza.id, precio=1200)])
+    happy = ListaPrecio(nombre="Happy hour", items=[ListaPrecioItem(producto_id=cerveza.id, precio=800)])
+    db.add_all([salon, happy])
+    db.commit()
+    return {"cerveza": cerveza.id, "agua": agua.id, "salon": salon.id, "happy": happy.id}
+
+
+def _precios(client, headers, carta, momento: str) -> dict[int, str]:
+    body = client.get(
+        "/api/precios/", params={"producto_id": [carta["cerveza"], carta["agua"]], "momento": momento}, headers=headers
+    ).json()
+    return {p["producto_id"]: p["precio"] for p in body["precios"]}
+
+
+def test_active_list_and_happy_hour_are_resolved_from_memory(client, make_user, carta) -> None:
+    headers = make_user()
+    mediodia = "2026-10-16T12:00:00-03:00"
+    assert _precios(client, headers, carta, mediodia) == {carta["cerveza"]: "1200.00", carta["agua"]: "500.00"}
+
+    programacion = {"lista_id": carta["happy"], "dias": [4], "hora_desde": "18:00", "hora_hasta": "20:00"}
+    assert client.post("/api/precios/programaciones", json=programacion, headers=headers).status_code == 201
+    assert _precios(client, headers, carta, "2026-10-16T19:30:00-03:00")[carta["cerveza"]] == "800.00"  # viernes
+    assert _precios(client, headers, carta, "2026-10-17T19:30:00-03:00")[carta["cerveza"]] == "1200.00"  # sábado
+
+    statements: list[str] = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        _precios(client, headers, carta, mediodia)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+    assert not any("listas_precio" in s or "productos" in s for s in statements)
+
+    assert client.post(f"/api/precios/listas/{carta['happy']}/activar", headers=headers).status_code == 200
+    assert _precios(client, headers, carta, mediodia)[carta["cerveza"]] == "800.00"
+
+
+def test_order_engine_prices_items_with_resolver_and_sees_item_changes(client, make_user, db, carta) -> None:
+    headers = make_user()
+    venta = client.post("/api/ventas/", json={"tipo": "mostrador"}, headers=headers).json()
+    url = f"/api/ventas/{venta['id']}/items"
+
+    body = client.post(url, json={"agregar": [{"producto_id": carta["cerveza"]}]}, headers=headers).json()
+    assert Decimal(body["agregados"][0]["precio_unitario"]) == Decimal("1200")
+
+    item = db.query(ListaPrecioItem).filter_by(lista_id=carta["salon"]).one()
+    item.precio = 1300
+    db.commit()
+    body = client.post(url, json={"agregar": [{"producto_id": carta["cerveza"]}]}, headers=headers).json()
+    assert Decimal(body["agregados"][0]["precio_unitario"]) == Decimal("1300")
@@ -0,0 +1,73 @@
+import asyncio
+import logging
+
+import pytest
+from sqlalchemy import text
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core.metrics import QueryCountMiddleware
+from app.db.profiling import contar, forma
+from app.db.session import AsyncSessionLocal
+
+
+async def _n_mas_uno(request) -> JSONResponse:
+    async with AsyncSessionLocal() as db:
+        for i in range(int(request.query_params["n"])):
+            await db.execute(text("SELECT :i"), {"i": i})
+    return JSONResponse({"ok": True})
+
+
+def _cliente(**opciones) -> TestClient:
+    app = Starlette(routes=[Route("/consultas", _n_mas_uno)])
+    return TestClient(QueryCountMiddleware(app, **opciones))
+
+
+def test_shape_unifies_parameters_and_in_lists() -> None:
+    assert forma("SELECT * FROM t WHERE id IN (?, ?, ?) AND x = ?") == "SELECT * FROM t WHERE id IN (?) AND x = ?"
+    assert forma("SELECT *\n  FROM t WHERE id IN (%(id_1)s, %(id_2)s)") == "SELECT * FROM t WHERE id IN (?)"
+    assert forma("SELECT $1::text") == "SELECT ?::text"
+
+
+def test_counter_includes_async_engine_statements() -> None:
+    async def scenario() -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(text("SELECT 1"))
+            await db.execute(text("SELECT 2"))
+
+    with contar() as conteo:
+        asyncio.run(scenario())
+
+    assert conteo.sentencias == 2
+    assert conteo.segundos > 0
+
+
+def test_server_timing_reports_queries() -> None:
+    response = _cliente(server_timing=True).get("/consultas", params={"n": 3})
+
+    assert response.headers["server-timing"].startswith('db;dur=')
+    assert 'desc="3 consultas"' in response.headers["server-timing"]
+    assert "server-timing" not in _cliente().get("/consultas", params={"n": 3}).headers
+
+
+def test_repeated_query_is_logged(caplog) -> None:
+    cliente = _cliente(repeticiones=5)
+    with caplog.at_level(logging.WARNING, logger="app.core.metrics"):
+        cliente.get("/consultas", params={"n": 5})
+        assert not caplog.records
+        cliente.get("/consultas", params={"n": 6})
+
+    assert "Posible N+1 en GET /consultas: 6 sentencias, una repetida 6 veces: SELECT ?" in caplog.text
+
+
+def test_query_budget_fails_when_exceeded(db, query_budget) -> None:
+    with query_budget(1) as consultas:
+        db.execute(text("SELECT 1"))
+    assert consultas.sentencias == 1
+
+    with pytest.raises(pytest.fail.Exception, match="2 sentencias SQL"):
+        with query_budget(1):
+            db.execute(text("SELECT 1"))
+            db.execute(text("SELECT 2"))
@@ -0,0 +1,147 @@
+"""Planes de las consultas que la aplicación ejecuta: ninguna debe recorrer una tabla que crece.
+
+Se recorren por la API los flujos calientes (venta completa con cocina, caja, stock, reportes
+y catálogo) capturando con `before_cursor_execute` lo que llega a la base, y se corre
+`EXPLAIN QUERY PLAN` sobre cada sentencia. Si un cambio de índices o de consulta vuelve a un
+`SCAN` de una de esas tablas, el test lo señala junto con la sentencia.
+"""
+import re
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, insert
+
+from app.db.session import async_engine
+from app.models.models import (
+    Caja,
+    CategoriaProducto,
+    Ingrediente,
+    Mesa,
+    Pago,
+    PedidoCocina,
+    Producto,
+    Receta,
+    RecetaItem,
+    StockMovimiento,
+    Turno,
+    Usuario,
+    Venta,
+    VentaItem,
+)
+
+DESDE = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+# Tablas que crecen con cada venta; las de catálogo son chicas y el snapshot completo las recorre a propósito.
+TABLAS_QUE_CRECEN = {
+    "ventas",
+    "ventas_items",
+    "pagos",
+    "descuentos",
+    "pedidos_cocina",
+    "stock_movimientos",
+    "movimientos_caja",
+    "turnos",
+    "catalogo_cambios",
+    "ventas_hora_producto",
+    "ventas_hora_medio",
+    "ventas_hora_mozo",
+    "ventas_hora_caja",
+}
+
+# SQLite muestra el alias de la tabla; los de SQLAlchemy son `<tabla>_<n>`.
+SCAN_DE_TABLA = re.compile(r"^SCAN (TABLE )?(?P<tabla>\w+?)(_\d+)?( |$)")
+TABLA_DE_SENTENCIA = re.compile(r"\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)", re.IGNORECASE)
+
+
+@pytest.fixture
+def cargada(db) -> None:
+    """Algunos cientos de filas: sin ANALYZE el plan no depende del volumen, pero no corre sobre tablas vacías."""
+    db.add_all([Caja(nombre="Barra"), Caja(nombre="Salón"), CategoriaProducto(nombre="Bebidas")])
+    db.add(Usuario(username_lower="mozo", nombre="Mozo", rol="MOZO", password_hash="x", pin_hash="x"))
+    db.flush()
+    db.add(Mesa(sala="Salón", numero="1"))
+    db.add(Ingrediente(nombre="Café", unidad="g", stock_actual=1000, stock_minimo=10))
+    filas = {
+        Producto: [{"nombre": f"P{i}", "sku": f"P{i}", "categoria_id": 1, "precio_lista": 100} for i in range(50)],
+        Turno: [{"caja_id": 1, "usuario_id": 1, "abierto_at": DESDE, "cerrado_at": DESDE} for _ in range(10)],
+        Venta: [
+            {"tipo": "MESA", "mozo_id": 1, "turno_id": i % 10 + 1, "estado": "CERRADA", "cerrada_at": DESDE}
+            for i in range(300)
+        ],
+        VentaItem: [
+            {"venta_id": i % 300 + 1, "producto_id": i % 50 + 1, "cantidad": 1, "precio_unitario": 100}
+            for i in range(900)
+        ],
+        Pago: [{"venta_id": i + 1, "medio": "EFECTIVO", "monto": 100} for i in range(300)],
+        PedidoCocina: [{"venta_id": i + 1, "estado": "LISTO"} for i in range(300)],
+        StockMovimiento: [{"tipo": "RECETA", "ingrediente_id": 1, "delta": -1, "fecha": DESDE} for _ in range(300)],
+    }
+    for modelo, valores in filas.items():
+        db.execute(insert(modelo), valores)
+    db.add(Receta(producto_id=1, items=[RecetaItem(ingrediente_id=1, cantidad=10)]))
+    db.commit()
+
+
+def _recorrer_flujos(client, headers) -> None:
+    def ok(response) -> dict:
+        assert response.status_code < 300, response.text
+        return response.json()
+
+    turno = ok(client.post("/api/caja/turnos", json={"caja_id": 2, "saldo_inicial": "1000"}, headers=headers))
+    caja = f"/api/caja/turnos/{turno['id']}"
+    ok(client.post(f"{caja}/movimientos", json={"tipo": "egreso", "origen": "gasto", "monto": "10"}, headers=headers))
+
+    venta = ok(
+        client.post("/api/ventas/", json={"tipo": "mesa", "mesa_id": 1, "turno_id": turno["id"]}, headers=headers)
+    )
+    url = f"/api/ventas/{venta['id']}"
+    ok(client.post(f"{url}/items", json={"agregar": [{"producto_id": 1}, {"producto_id": 2}]}, headers=headers))
+    ok(client.post(f"{url}/descuentos", json={"tipo": "porcentual", "valor": 10}, headers=headers))
+    pedido = ok(client.post("/api/cocina/pedidos", json={"venta_id": venta["id"]}, headers=headers))
+    ok(client.get("/api/cocina/pedidos", headers=headers))
+    for estado in ("en_curso", "listo"):
+        ok(client.patch(f"/api/cocina/pedidos/{pedido['id']}/estado", json={"estado": estado}, headers=headers))
+    total = ok(client.get(url, headers=headers))["total_neto"]
+    ok(client.post(f"{url}/pagos", json={"medio": "efectivo", "monto": total}, headers=headers))
+    ok(client.post(f"{url}/cerrar", headers=headers))
+    ok(client.get(f"{caja}/saldo", headers=headers))
+
+    rango = {"desde": DESDE.isoformat(), "hasta": (datetime.now(timezone.utc) + timedelta(days=1)).isoformat()}
+    for tipo in ("ventas", "stock", "caja"):
+        ok(client.get(f"/api/reportes/{tipo}", params=rango, headers=headers))
+    ok(client.get("/api/reportes/rollups/producto", params=rango, headers=headers))
+    assert client.get("/api/reportes/exportar/ventas", params=rango, headers=headers).status_code == 200
+    ok(client.get("/api/stock/a-fecha", params={"momento": DESDE.isoformat()}, headers=headers))
+    ok(client.get("/api/stock/bajo-minimo", headers=headers))
+
+    version = ok(client.get("/api/catalogo/", headers=headers))["version"]
+    ok(client.get("/api/catalogo/", params={"since": version}, headers=headers))
+    ok(client.get("/api/categorias/1/arbol", headers=headers))
+    ok(client.get("/api/precios/", params={"producto_id": [1, 2]}, headers=headers))
+
+
+def test_statements_of_hot_paths_do_not_scan_growing_tables(client, make_user, db, cargada) -> None:
+    headers = make_user()
+    sentencias: dict[str, tuple] = {}
+
+    def capturar(conn, cursor, statement, parameters, context, executemany) -> None:
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")):
+            sentencias.setdefault(statement, parameters)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capturar)
+    try:
+        _recorrer_flujos(client, headers)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", capturar)
+
+    tocadas = {t.lower() for s in sentencias for t in TABLA_DE_SENTENCIA.findall(s)}
+    # Si un flujo deja de pasar por una tabla, el test dejaría de cubrirla sin avisar.
+    assert TABLAS_QUE_CRECEN <= tocadas, TABLAS_QUE_CRECEN - tocadas
+
+    conexion = db.connection()
+    escaneos = []
+    for sentencia, parametros in sentencias.items():
+        plan = [fila[-1] for fila in conexion.exec_driver_sql(f"EXPLAIN QUERY PLAN {sentencia}", parametros)]
+        if any((m := SCAN_DE_TABLA.match(paso)) and m["tabla"] in TABLAS_QUE_CRECEN for paso in plan):
+            escaneos.append(f"{sentencia}\n  -> {plan}")
+    assert not escaneos, "\n\n".join(escaneos)
@@ -0,0 +1,143 @@
+import csv
+import io
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from openpyxl import load_workbook
+
+from app.core.config import settings
+from app.models.models import (
+    Caja,
+    CategoriaProducto,
+    Gasto,
+    Ingrediente,
+    Producto,
+    ReporteCache,
+    RoleEnum,
+    StockMovimiento,
+    StockMovimientoTipo,
+)
+
+
+@pytest.fixture
+def producto(db) -> int:
+    categoria = CategoriaProducto(nombre="Cafetería")
+    db.add(categoria)
+    db.flush()
+    cafe = Producto(nombre="Café", sku="CAF", categoria_id=categoria.id, precio_lista=Decimal("1500.00"))
+    db.add(cafe)
+    db.commit()
+    return cafe.id
+
+
+def _cerrar_venta(client, headers, producto_id: int, cantidad: int) -> None:
+    venta = client.post("/api/ventas/", json={"tipo": "mostrador"}, headers=headers).json()
+    url = f"/api/ventas/{venta['id']}"
+    body = client.post(
+        f"{url}/items", json={"agregar": [{"producto_id": producto_id, "cantidad": cantidad}]}, headers=headers
+    ).json()
+    client.post(f"{url}/pagos", json={"medio": "efectivo", "monto": body["venta"]["total_neto"]}, headers=headers)
+    assert client.post(f"{url}/cerrar", headers=headers).status_code == 200
+
+
+def test_report_is_served_from_cache_until_an_overlapping_sale_closes(client, make_user, db, producto) -> None:
+    headers = make_user()
+    ahora = datetime.now(timezone.utc)
+    actual = {"desde": (ahora - timedelta(days=1)).isoformat(), "hasta": (ahora + timedelta(days=1)).isoformat()}
+    pasado = {"desde": (ahora - timedelta(days=40)).isoformat(), "hasta": (ahora - timedelta(days=10)).isoformat()}
+    _cerrar_venta(client, headers, producto, 2)
+
+    primero = client.get("/api/reportes/ventas", params=actual, headers=headers).json()
+    assert (primero["cacheado"], primero["datos"]["ventas"], primero["datos"]["total_neto"]) == (False, 1, "3000.00")
+    assert client.get("/api/reportes/ventas", params=actual, headers=headers).json()["cacheado"] is True
+    assert client.get("/api/reportes/ventas", params=pasado, headers=headers).json()["cacheado"] is False
+    assert client.get("/api/reportes/stock", params=actual, headers=headers).json()["cacheado"] is False
+
+    _cerrar_venta(client, headers, producto, 1)
+
+    # Sólo se borran las entradas cuyo rango contiene el cierre.
+    assert client.get("/api/reportes/ventas", params=pasado, headers=headers).json()["cacheado"] is True
+    nuevo = client.get("/api/reportes/ventas", params=actual, headers=headers).json()
+    assert (nuevo["cacheado"], nuevo["datos"]["ventas"], nuevo["datos"]["total_neto"]) == (False, 2, "4500.00")
+    assert nuevo["datos"]["por_producto"][0]["cantidad"] == 3
+
+
+def test_gasto_invalidates_overlapping_cash_reports(client, make_user, db) -> None:
+    headers = make_user()
+    rango = {"desde": "2026-09-01T00:00:00+00:00", "hasta": "2026-10-01T00:00:00+00:00"}
+    assert client.get("/api/reportes/caja", params=rango, headers=headers).json()["datos"]["gastos"] == []
+
+    db.add(Gasto(monto=Decimal("1200"), fecha=datetime(2026, 10, 5, tzinfo=timezone.utc), medio_pago="efectivo"))
+    db.commit()
+    assert client.get("/api/reportes/caja", params=rango, headers=headers).json()["cacheado"] is True
+
+    db.add(Gasto(monto=Decimal("800"), fecha=datetime(2026, 9, 15, tzinfo=timezone.utc), medio_pago="efectivo"))
+    db.commit()
+    assert db.query(ReporteCache).count() == 0
+    body = client.get("/api/reportes/caja", params=rango, headers=headers).json()
+    assert body["datos"]["gastos"] == [{"medio_pago": "efectivo", "cantidad": 1, "total": "800.00"}]
+
+
+def test_empty_range_is_rejected(client, make_user) -> None:
+    headers = make_user()
+    rango = {"desde": "2026-10-01T00:00:00+00:00", "hasta": "2026-10-01T00:00:00+00:00"}
+    assert client.get("/api/reportes/ventas", params=rango, headers=headers).status_code == 400
+
+
+def test_sales_export_streams_items_and_payments_as_csv_and_xlsx(client, make_user, producto, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "export_batch_size", 1)
+    headers = make_user()
+    ahora = datetime.now(timezone.utc)
+    rango = {"desde": (ahora - timedelta(days=1)).isoformat(), "hasta": (ahora + timedelta(days=1)).isoformat()}
+    _cerrar_venta(client, headers, producto, 2)
+    _cerrar_venta(client, headers, producto, 1)
+
+    response = client.get("/api/reportes/exportar/ventas", params=rango, headers=headers)
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"].startswith('attachment; filename="ventas_')
+    filas = list(csv.DictReader(io.StringIO(response.content.decode("utf-8-sig"))))
+    assert [(f["linea"], f["producto"], f["medio"]) for f in filas] == [
+        ("item", "Café", ""),
+        ("pago", "", "efectivo"),
+        ("item", "Café", ""),
+        ("pago", "", "efectivo"),
+    ]
+
+    response = client.get("/api/reportes/exportar/ventas", params={**rango, "formato": "xlsx"}, headers=headers)
+    hoja = load_workbook(io.BytesIO(response.content), read_only=True).active
+    encabezados, *datos = [list(fila) for fila in hoja.iter_rows(values_only=True)]
+    assert encabezados[:3] == ["venta_id", "cerrada_at", "mozo_id"]
+    assert [fila[encabezados.index("cantidad")] for fila in datos] == [2, None, 1, None]
+    assert [fila[encabezados.index("monto")] for fila in datos] == [None, 3000, None, 1500]
+
+    assert client.get("/api/reportes/exportar/caja", params=rango, headers=headers).content.decode(
+        "utf-8-sig"
+    ).splitlines() == ["id,fecha,caja_id,turno_id,tipo,origen,medio_pago,monto,descripcion"]
+
+
+def test_csv_export_neutralizes_formula_like_text(client, make_user, db) -> None:
+    headers = make_user("caja1", RoleEnum.CAJA)
+    admin = make_user()
+    caja = Caja(nombre="Caja 1")
+    cafe = Ingrediente(nombre="=Café", unidad="g")
+    db.add_all([caja, cafe])
+    db.commit()
+    turno = client.post("/api/caja/turnos", json={"caja_id": caja.id}, headers=headers).json()
+    for descripcion in ('=HYPERLINK("http://x")', "@SUM(A1)", "-2+3", "vuelto"):
+        movimiento = {"tipo": "ingreso", "monto": "10", "descripcion": descripcion}
+        client.post(f"/api/caja/turnos/{turno['id']}/movimientos", json=movimiento, headers=headers)
+    db.add(StockMovimiento(tipo=StockMovimientoTipo.AJUSTE, ingrediente_id=cafe.id, delta=-2, motivo="+rotura"))
+    db.commit()
+
+    ahora = datetime.now(timezone.utc)
+    rango = {"desde": (ahora - timedelta(days=1)).isoformat(), "hasta": (ahora + timedelta(days=1)).isoformat()}
+
+    def exportar(tipo: str) -> list[dict]:
+        response = client.get(f"/api/reportes/exportar/{tipo}", params=rango, headers=admin)
+        return list(csv.DictReader(io.StringIO(response.content.decode("utf-8-sig"))))
+
+    assert [f["descripcion"] for f in exportar("caja")] == ["'=HYPERLINK(\"http://x\")", "'@SUM(A1)", "'-2+3", "vuelto"]
+    [stock] = exportar("stock")
+    # Los números negativos no son texto libre: siguen siendo números.
+    assert (stock["ingrediente"], stock["motivo"], float(stock["delta"])) == ("'=Café", "'+rotura", -2)
@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.models.models import CategoriaProducto, Producto, VentasHoraMedio, VentasHoraMozo, VentasHoraProducto
+from app.tasks.rollups import main as backfill
+
+
+@pytest.fixture
+def productos(db) -> list[int]:
+    categoria = CategoriaProducto(nombre="Cafetería")
+    db.add(categoria)
+    db.flush()
+    items = [
+        Producto(nombre="Café", sku="CAF", categoria_id=categoria.id, precio_lista=Decimal("1500.00")),
+        Producto(nombre="Medialuna", sku="MED", categoria_id=categoria.id, precio_lista=Decimal("800.00")),
+    ]
+    db.add_all(items)
+    db.commit()
+    return [p.id for p in items]
+
+
+def _cerrar_venta(client, headers, items: list[tuple[int, int]], medio: str = "efectivo") -> None:
+    venta = client.post("/api/ventas/", json={"tipo": "mostrador"}, headers=headers).json()
+    url = f"/api/ventas/{venta['id']}"
+    body = client.post(
+        f"{url}/items", json={"agregar": [{"producto_id": p, "cantidad": c} for p, c in items]}, headers=headers
+    ).json()
+    client.post(f"{url}/pagos", json={"medio": medio, "monto": body["venta"]["total_neto"]}, headers=headers)
+    assert client.post(f"{url}/cerrar", headers=headers).status_code == 200
+
+
+def _productos(db) -> dict[int, tuple[float, Decimal]]:
+    db.expire_all()
+    return {r.producto_id: (r.cantidad, Decimal(str(r.importe))) for r in db.query(VentasHoraProducto)}
+
+
+def test_closing_ventas_accumulates_hourly_rollups_and_backfill_rebuilds_them(client, make_user, db, productos) -> None:
+    headers = make_user()
+    cafe, medialuna = productos
+    _cerrar_venta(client, headers, [(cafe, 2), (medialuna, 1)])
+    _cerrar_venta(client, headers, [(cafe, 1)], medio="debito")
+
+    esperado = {cafe: (3.0, Decimal("4500.00")), medialuna: (1.0, Decimal("800.00"))}
+    assert _productos(db) == esperado
+    assert sorted((r.medio.lower(), r.pagos) for r in db.query(VentasHoraMedio)) == [("debito", 1), ("efectivo", 1)]
+    assert [(r.ventas, Decimal(str(r.total_neto))) for r in db.query(VentasHoraMozo)] == [(2, Decimal("5300.00"))]
+
+    ahora = datetime.now(timezone.utc)
+    params = {"desde": (ahora - timedelta(days=1)).isoformat(), "hasta": (ahora + timedelta(days=1)).isoformat()}
+    filas = client.get("/api/reportes/rollups/producto", params=params, headers=headers).json()["filas"]
+    assert {f["clave"]: f["cantidad"] for f in filas} == {cafe: 3, medialuna: 1}
+    assert client.get("/api/reportes/rollups/mesa", params=params, headers=headers).status_code == 404
+
+    # El backfill borra y recalcula por tramos: repetirlo no duplica.
+    assert backfill(["--horas", "1"]) == 0
+    assert backfill([]) == 0
+    assert _productos(db) == esperado
+
+
+def test_series_buckets_days_in_local_timezone_and_normalizes_bounds(client, make_user, db, productos) -> None:
+    headers = make_user()
+    cafe, _ = productos
+    # 02:00 UTC es el 9 a las 23:00 en Buenos Aires; 04:00 UTC ya es el 10.
+    for hora, cantidad in ((2, 1), (4, 2), (5, 3)):
+        hora_utc = datetime(2026, 3, 10, hora, tzinfo=timezone.utc)
+        db.add(VentasHoraProducto(hora=hora_utc, producto_id=cafe, cantidad=cantidad, importe=1500 * cantidad))
+    db.commit()
+
+    params = {"desde": "2026-03-09T00:00:00-03:00", "hasta": "2026-03-11T00:00:00-03:00"}
+    filas = client.get("/api/reportes/rollups/producto", params=params, headers=headers).json()["filas"]
+    assert [(datetime.fromisoformat(f["periodo"]).date().day, f["cantidad"]) for f in filas] == [(9, 1), (10, 5)]
+
+    # 2026-03-10T00:00-03:00 son las 03:00 UTC: la fila de las 02:00 UTC queda afuera.
+    params = {"desde": "2026-03-10T00:00:00-03:00", "hasta": "2026-03-10T02:00:00-03:00", "granularidad": "hora"}
+    filas = client.get("/api/reportes/rollups/producto", params=params, headers=headers).json()["filas"]
+    assert [f["cantidad"] for f in filas] == [2]
@@ -0,0 +1,30 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.models import CategoriaArbol, Pago, StockMovimiento, TurnoSaldo, Venta, VentasHoraCaja
+from app.services.stock import reconciliar
+from app.tasks.seed import Volumen, generar
+
+
+def test_generator_produces_consistent_history(db) -> None:
+    volumen = Volumen(clientes=50, ventas=300, dias=3, productos=20, ingredientes=15, mozos=3, lote=100)
+    conteos = generar(db, volumen, hasta=date(2024, 6, 1), progreso=lambda _: None)
+
+    assert conteos["ventas"] == 300
+    assert conteos["clientes"] == 50
+    assert db.scalar(select(func.count()).select_from(Venta)) == 300
+    cobrado = db.scalar(select(func.sum(Venta.total_neto + Venta.propina)))
+    assert db.scalar(select(func.sum(Pago.monto))) == cobrado
+    assert db.scalar(select(func.sum(TurnoSaldo.ingresos))) == cobrado
+    # Los acumulados horarios y la clausura de categorías quedan al día sin pasar por el ORM.
+    assert db.scalar(select(func.sum(VentasHoraCaja.ventas))) == 300
+    assert db.scalar(select(func.count()).select_from(CategoriaArbol)) > 0
+    assert db.scalar(select(func.min(Venta.cerrada_at))).date() >= date(2024, 5, 29)
+    # stock_actual coincide con el libro de movimientos.
+    assert db.scalar(select(func.count()).select_from(StockMovimiento)) > 0
+    assert reconciliar(db) == []
+
+    with pytest.raises(ValueError):
+        generar(db, volumen, hasta=date(2024, 6, 1), progreso=lambda _: None)
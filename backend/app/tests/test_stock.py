@@ -0,0 +1,204 @@
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from app.models.models import (
+    CategoriaProducto,
+    Ingrediente,
+    Producto,
+    Receta,
+    RecetaItem,
+    RoleEnum,
+    StockMovimiento,
+    StockMovimientoTipo,
+    StockSnapshot,
+)
+from app.services.realtime import stock_hub
+from app.services.stock import STOCK_BAJO, bom_cache, corte_diario, crear_snapshots, reconciliar
+
+
+@pytest.fixture
+def carta(db) -> dict:
+    categoria = CategoriaProducto(nombre="Cafetería")
+    cafe = Ingrediente(nombre="Café en grano", unidad="g", stock_actual=1000, stock_minimo=100)
+    leche = Ingrediente(nombre="Leche", unidad="ml", stock_actual=5000, stock_minimo=500)
+    db.add_all([categoria, cafe, leche])
+    db.flush()
+    cortado = Producto(nombre="Cortado", sku="COR", categoria_id=categoria.id, precio_lista=Decimal("1800"))
+    latte = Producto(nombre="Latte", sku="LAT", categoria_id=categoria.id, precio_lista=Decimal("2200"))
+    alfajor = Producto(nombre="Alfajor", sku="ALF", categoria_id=categoria.id, precio_lista=Decimal("900"))
+    db.add_all([cortado, latte, alfajor])
+    db.flush()
+    db.add_all(
+        [
+            Receta(producto_id=cortado.id, items=[RecetaItem(ingrediente_id=cafe.id, cantidad=18), RecetaItem(ingrediente_id=leche.id, cantidad=40)]),
+            Receta(producto_id=latte.id, items=[RecetaItem(ingrediente_id=cafe.id, cantidad=18), RecetaItem(ingrediente_id=leche.id, cantidad=200)]),
+        ]
+    )
+    db.commit()
+    return {"cafe": cafe.id, "leche": leche.id, "cortado": cortado.id, "latte": latte.id, "alfajor": alfajor.id}
+
+
+def _venta_cerrada(client, headers, items: list[tuple[int, int]]) -> int:
+    venta = client.post("/api/ventas/", json={"tipo": "mostrador"}, headers=headers).json()
+    url = f"/api/ventas/{venta['id']}"
+    body = client.post(
+        f"{url}/items", json={"agregar": [{"producto_id": p, "cantidad": c} for p, c in items]}, headers=headers
+    ).json()
+    client.post(f"{url}/pagos", json={"medio": "efectivo", "monto": body["venta"]["total_neto"]}, headers=headers)
+    assert client.post(f"{url}/cerrar", headers=headers).status_code == 200
+    return venta["id"]
+
+
+def test_closing_venta_explodes_recipes_into_one_movement_per_ingredient(client, make_user, db, carta) -> None:
+    headers = make_user("caja1", RoleEnum.CAJA)
+    venta_id = _venta_cerrada(
+        client, headers, [(carta["cortado"], 2), (carta["latte"], 1), (carta["cortado"], 1), (carta["alfajor"], 3)]
+    )
+
+    movimientos = {
+        (m.tipo, m.ingrediente_id or m.producto_id): m.delta
+        for m in db.query(StockMovimiento).filter(StockMovimiento.ref_id == venta_id)
+    }
+    assert movimientos == {
+        (StockMovimientoTipo.RECETA, carta["cafe"]): -72,
+        (StockMovimientoTipo.RECETA, carta["leche"]): -320,
+        (StockMovimientoTipo.VENTA, carta["alfajor"]): -3,
+    }
+    db.expire_all()
+    assert db.get(Ingrediente, carta["cafe"]).stock_actual == 928
+    assert db.get(Ingrediente, carta["leche"]).stock_actual == 4680
+
+
+def test_recipe_change_invalidates_cached_explosion(client, make_user, db, carta) -> None:
+    headers = make_user("caja1", RoleEnum.CAJA)
+    _venta_cerrada(client, headers, [(carta["cortado"], 1)])
+    assert bom_cache.get(carta["cortado"]) is not None
+
+    item = db.query(RecetaItem).filter_by(ingrediente_id=carta["leche"]).join(Receta).filter(Receta.producto_id == carta["cortado"]).one()
+    item.cantidad = 60
+    db.commit()
+    assert bom_cache.get(carta["cortado"]) is None
+
+    venta_id = _venta_cerrada(client, headers, [(carta["cortado"], 1)])
+    leche = db.query(StockMovimiento.delta).filter_by(ref_id=venta_id, ingrediente_id=carta["leche"]).scalar()
+    assert leche == -60
+
+
+def test_toggling_controla_stock_invalidates_cached_explosion(client, make_user, db, carta) -> None:
+    headers = make_user("caja1", RoleEnum.CAJA)
+    _venta_cerrada(client, headers, [(carta["cortado"], 1)])
+    assert bom_cache.get(carta["cortado"]) is not None
+
+    db.get(Producto, carta["cortado"]).controla_stock = False
+    db.commit()
+    assert bom_cache.get(carta["cortado"]) is None
+
+    venta_id = _venta_cerrada(client, headers, [(carta["cortado"], 1)])
+    assert db.query(StockMovimiento).filter_by(ref_id=venta_id).count() == 0
+
+
+def _movimiento(db, ingrediente_id: int, delta: float, fecha: datetime) -> None:
+    db.add(StockMovimiento(tipo=StockMovimientoTipo.AJUSTE, ingrediente_id=ingrediente_id, delta=delta, fecha=fecha))
+
+
+def test_stock_at_date_replays_only_movements_after_the_snapshot(client, make_user, db, carta) -> None:
+    headers = make_user()
+    cafe = carta["cafe"]
+    _movimiento(db, cafe, 1000, datetime(2026, 10, 1, 9, tzinfo=timezone.utc))
+    _movimiento(db, cafe, -100, datetime(2026, 10, 1, 18, tzinfo=timezone.utc))
+    _movimiento(db, cafe, -50, datetime(2026, 10, 2, 10, tzinfo=timezone.utc))
+    db.commit()
+
+    crear_snapshots(db, corte_diario(date(2026, 10, 2)))
+    db.commit()
+    snapshot = db.query(StockSnapshot).filter_by(ingrediente_id=cafe).one()
+    assert snapshot.saldo == 900
+    # El saldo posterior al corte sale del snapshot: alterarlo demuestra que no se relee el historial.
+    snapshot.saldo = 800
+    db.commit()
+
+    def stock(momento: datetime) -> float:
+        response = client.get(
+            "/api/stock/a-fecha", params={"momento": momento.isoformat(), "ingrediente_id": cafe}, headers=headers
+        )
+        assert response.status_code == 200
+        return response.json()["saldos"][0]["stock"]
+
+    assert stock(datetime(2026, 10, 1, 12, tzinfo=timezone.utc)) == 1000
+    # 16:00 en Buenos Aires son las 19:00 UTC, después de la salida de las 18:00.
+    assert stock(datetime(2026, 10, 1, 16, tzinfo=timezone(timedelta(hours=-3)))) == 900
+    assert stock(datetime(2026, 10, 2, 0, tzinfo=timezone.utc)) == 800
+    assert stock(datetime(2026, 10, 3, tzinfo=timezone.utc)) == 750
+
+
+def test_reconcile_reports_and_fixes_drift(client, make_user, db, carta) -> None:
+    headers = make_user()
+    _movimiento(db, carta["cafe"], 1000, datetime(2026, 10, 1, tzinfo=timezone.utc))
+    _movimiento(db, carta["leche"], 4000, datetime(2026, 10, 1, tzinfo=timezone.utc))
+    db.commit()
+    crear_snapshots(db, corte_diario(date(2026, 10, 2)))
+    _movimiento(db, carta["leche"], 1000, datetime(2026, 10, 2, 8, tzinfo=timezone.utc))
+    db.commit()
+
+    assert client.get("/api/stock/reconciliacion", headers=headers).json() == []
+
+    db.get(Ingrediente, carta["cafe"]).stock_actual = 990
+    db.commit()
+    reporte = client.get("/api/stock/reconciliacion", headers=headers).json()
+    assert reporte == [
+        {"ingrediente_id": carta["cafe"], "nombre": "Café en grano", "stock_actual": 990, "stock_libro": 1000, "diferencia": 10}
+    ]
+
+    encontradas = reconciliar(db, corregir=True)
+    db.commit()
+    assert [(d.ingrediente_id, d.diferencia) for d in encontradas] == [(carta["cafe"], 10)]
+    db.expire_all()
+    assert db.get(Ingrediente, carta["cafe"]).stock_actual == 1000
+    assert client.get("/api/stock/reconciliacion", headers=headers).json() == []
+
+    # Una merma cargada sólo en el libro: la corrección deja el café por debajo del mínimo.
+    _movimiento(db, carta["cafe"], -950, datetime(2026, 10, 2, 9, tzinfo=timezone.utc))
+    db.commit()
+    desde = stock_hub.ultimo_id
+    corregidas = client.post("/api/stock/reconciliacion", headers=headers).json()
+    assert [(d["ingrediente_id"], d["diferencia"]) for d in corregidas] == [(carta["cafe"], -950)]
+    eventos = stock_hub.subscribe(last_event_id=desde).pendientes
+    assert [(e.tipo, e.data["nombre"], e.data["stock_actual"]) for e in eventos] == [(STOCK_BAJO, "Café en grano", 50)]
+
+
+def test_low_stock_set_follows_updates_and_sale_crossings_are_published(client, make_user, db, carta) -> None:
+    headers = make_user()
+    cafe = db.get(Ingrediente, carta["cafe"])
+    cafe.stock_actual = 50
+    db.commit()
+
+    def bajo_minimo() -> list[str]:
+        body = client.get("/api/stock/bajo-minimo", headers=headers).json()
+        return [i["nombre"] for i in body["ingredientes"]]
+
+    assert bajo_minimo() == ["Café en grano"]
+
+    desde = stock_hub.ultimo_id
+    caja = make_user("caja1", RoleEnum.CAJA)
+    # 12 latte consumen 2400 ml de leche (5000 -> 2600) y 13 más la dejan en 0 < 500.
+    _venta_cerrada(client, caja, [(carta["latte"], 12)])
+    assert bajo_minimo() == ["Café en grano"]
+    _venta_cerrada(client, caja, [(carta["latte"], 13)])
+    assert bajo_minimo() == ["Café en grano", "Leche"]
+
+    eventos = stock_hub.subscribe(last_event_id=desde).pendientes
+    assert [(e.tipo, e.data["nombre"]) for e in eventos] == [(STOCK_BAJO, "Leche")]
+
+    cafe.stock_actual = 500
+    db.get(Ingrediente, carta["leche"]).activo = False
+    db.commit()
+    assert bajo_minimo() == []
+
+    # Subir el mínimo por encima del saldo también es un cruce.
+    desde = stock_hub.ultimo_id
+    cafe.stock_minimo = 600
+    db.commit()
+    eventos = stock_hub.subscribe(last_event_id=desde).pendientes
+    assert [(e.tipo, e.data["stock_minimo"]) for e in eventos] == [(STOCK_BAJO, 600)]
@@ -0,0 +1,46 @@
+from app.models.models import Caja, RoleEnum, Usuario
+
+
+def test_list_usuarios_runs_constant_number_of_queries(client, make_user, db, query_budget) -> None:
+    headers = make_user()
+    cajas = [Caja(nombre=f"Caja {i}") for i in range(3)]
+    db.add_all(cajas)
+    for i in range(30):
+        db.add(
+            Usuario(
+                username_lower=f"mozo{i}",
+                nombre=f"Mozo {i}",
+                rol=RoleEnum.MOZO,
+                password_hash="x",
+                pin_hash="x",
+                cajas_asignadas=cajas[: i % 3],
+            )
+        )
+    db.commit()
+    client.get("/api/usuarios/", params={"size": 1}, headers=headers)  # calienta caché de principal y total
+
+    # Página y cajas asignadas: dos sentencias sin importar el tamaño de la página.
+    for size in (5, 25):
+        with query_budget(2) as consultas:
+            response = client.get("/api/usuarios/", params={"size": size}, headers=headers)
+        assert response.status_code == 200
+        assert len(response.json()["items"]) == size
+        assert consultas.sentencias == 2
+
+
+def test_create_and_update_usuario_return_cajas(client, make_user, db) -> None:
+    headers = make_user()
+    db.add_all([Caja(nombre="Salón"), Caja(nombre="Barra")])
+    db.commit()
+
+    created = client.post(
+        "/api/usuarios/",
+        json={"username": "Caja1", "nombre": "Caja", "rol": "caja", "password": "secreto", "pin": "1111", "cajas_ids": [2, 99]},
+        headers=headers,
+    )
+    assert created.status_code == 201
+    assert created.json()["cajas_asignadas"] == [2]
+
+    updated = client.put(f"/api/usuarios/{created.json()['id']}", json={"cajas_ids": [1, 2]}, headers=headers)
+    assert updated.json()["cajas_asignadas"] == [1, 2]
+    assert client.get("/api/usuarios/me", headers=headers).json()["cajas_asignadas"] == []
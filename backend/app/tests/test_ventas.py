@@ -0,0 +1,85 @@
+from decimal import Decimal
+
+import pytest
+
+from app.models.models import CategoriaProducto, Producto, RoleEnum, Venta
+
+
+@pytest.fixture
+def productos(db) -> list[int]:
+    categoria = CategoriaProducto(nombre="Cafetería")
+    db.add(categoria)
+    db.flush()
+    items = [
+        Producto(nombre="Café", sku="CAF", categoria_id=categoria.id, precio_lista=Decimal("1500.00")),
+        Producto(nombre="Medialuna", sku="MED", categoria_id=categoria.id, precio_lista=Decimal("800.50")),
+    ]
+    db.add_all(items)
+    db.commit()
+    return [p.id for p in items]
+
+
+def test_venta_flow_keeps_totals_incrementally(client, make_user, db, productos) -> None:
+    headers = make_user("caja1")
+    cafe, medialuna = productos
+
+    venta = client.post("/api/ventas/", json={"tipo": "mostrador"}, headers=headers).json()
+    url = f"/api/ventas/{venta['id']}"
+
+    body = client.post(
+        f"{url}/items",
+        json={"agregar": [{"producto_id": cafe, "cantidad": 2}, {"producto_id": medialuna, "cantidad": 3}]},
+        headers=headers,
+    ).json()
+    assert Decimal(body["venta"]["total_bruto"]) == Decimal("5401.50")
+    medialunas = next(i["id"] for i in body["agregados"] if i["producto_id"] == medialuna)
+
+    assert client.post(f"{url}/descuentos", json={"tipo": "porcentual", "valor": 10}, headers=headers).status_code == 201
+    body = client.post(f"{url}/items", json={"quitar": [medialunas]}, headers=headers).json()
+    assert Decimal(body["venta"]["total_bruto"]) == Decimal("3000.00")
+    assert Decimal(body["venta"]["total_descuento"]) == Decimal("300.00")
+    assert Decimal(body["venta"]["total_neto"]) == Decimal("2700.00")
+
+    assert client.post(f"{url}/cerrar", headers=headers).status_code == 409
+    pago = client.post(f"{url}/pagos", json={"medio": "efectivo", "monto": "2700"}, headers=headers)
+    assert pago.status_code == 201
+    cerrada = client.post(f"{url}/cerrar", headers=headers).json()
+    assert cerrada["estado"] == "cerrada"
+    assert client.post(f"{url}/items", json={"agregar": [{"producto_id": cafe}]}, headers=headers).status_code == 409
+
+    detalle = client.get(url, headers=headers).json()
+    assert len(detalle["items"]) == 1 and len(detalle["pagos"]) == 1
+    assert db.get(Venta, venta["id"]).total_neto == Decimal("2700.00")
+
+
+def test_explicit_price_still_requires_an_active_product(client, make_user, db, productos) -> None:
+    headers = make_user("caja1")
+    cafe, medialuna = productos
+    db.get(Producto, medialuna).activo = False
+    db.commit()
+
+    venta = client.post("/api/ventas/", json={"tipo": "mostrador"}, headers=headers).json()
+    url = f"/api/ventas/{venta['id']}/items"
+    for producto_id in (medialuna, 9999):
+        agregar = [{"producto_id": producto_id, "cantidad": 1, "precio_unitario": "100"}]
+        assert client.post(url, json={"agregar": agregar}, headers=headers).status_code == 404
+
+    body = client.post(
+        url, json={"agregar": [{"producto_id": cafe, "cantidad": 2, "precio_unitario": "1200"}]}, headers=headers
+    ).json()
+    assert [i["producto_id"] for i in body["agregados"]] == [cafe]
+    assert Decimal(body["venta"]["total_bruto"]) == Decimal("2400.00")
+
+
+def test_only_caja_and_admin_can_set_an_explicit_price(client, make_user, productos) -> None:
+    cafe, _ = productos
+    agregar = {"agregar": [{"producto_id": cafe, "precio_unitario": "0"}]}
+    for usuario, rol, esperado in (("mozo1", RoleEnum.MOZO, 403), ("caja1", RoleEnum.CAJA, 200)):
+        headers = make_user(usuario, rol)
+        venta = client.post("/api/ventas/", json={"tipo": "mostrador"}, headers=headers).json()
+        assert client.post(f"/api/ventas/{venta['id']}/items", json=agregar, headers=headers).status_code == esperado
+
+    mozo = make_user("mozo2", RoleEnum.MOZO)
+    venta = client.post("/api/ventas/", json={"tipo": "mostrador"}, headers=mozo).json()
+    body = client.post(f"/api/ventas/{venta['id']}/items", json={"agregar": [{"producto_id": cafe}]}, headers=mozo)
+    assert Decimal(body.json()["venta"]["total_bruto"]) == Decimal("1500.00")